@@ -0,0 +1,127 @@
+"""On-disk cache of parsed clippings, keyed by file identity."""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from ..core.models import Clipping
+
+# Bump when the parser output changes, to invalidate existing caches
+CACHE_VERSION = 1
+
+
+@dataclass
+class CacheEntry:
+    """Identity of the file the cached clippings were parsed from."""
+
+    version: int
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+
+class ClippingCache:
+    """
+    Pickle snapshot of the clippings parsed from each file.
+
+    A snapshot holds a small header (path, size, mtime and content hash)
+    followed by the clippings, so a stale snapshot is detected without
+    loading them.
+    """
+
+    def __init__(self, cache_dir: str):
+        """Initialize the cache in the given directory."""
+        self.cache_dir = Path(cache_dir)
+
+    def load(
+        self, path: Path, stat: os.stat_result, content_hash: Optional[str] = None
+    ) -> Optional[List[Clipping]]:
+        """
+        Load the clippings cached for a file, or None if the cache is stale.
+
+        The cache is fresh when the size and mtime of the file stat are
+        unchanged, or when the given content hash matches (e.g. the file was
+        only touched).
+        """
+        try:
+            with open(self._snapshot_path(path), "rb") as f:
+                entry = pickle.load(f)
+                if not isinstance(entry, CacheEntry) or entry.version != CACHE_VERSION:
+                    return None
+                if entry.path != str(path.resolve()):
+                    return None
+
+                unchanged = (entry.size, entry.mtime_ns) == (
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                )
+                if not unchanged and entry.content_hash != content_hash:
+                    return None
+
+                clippings = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A corrupted or incompatible snapshot is just a cache miss
+            return None
+
+        if not unchanged:
+            # Same content with a new mtime, refresh the header
+            self.store(path, stat, content_hash, clippings)
+        return clippings
+
+    def store(
+        self,
+        path: Path,
+        stat: os.stat_result,
+        content_hash: str,
+        clippings: List[Clipping],
+    ) -> None:
+        """
+        Write the clippings parsed from a file, atomically.
+
+        stat must be taken before the file was read: if the file grows in the
+        meantime, the snapshot is then stale rather than wrongly fresh. The
+        cache is disposable: when it cannot be written (read-only or full
+        disk, missing permissions), the snapshot is skipped.
+        """
+        entry = CacheEntry(
+            version=CACHE_VERSION,
+            path=str(path.resolve()),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            content_hash=content_hash,
+        )
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(clippings, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._snapshot_path(path))
+        except BaseException as e:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            if not isinstance(e, OSError):
+                raise
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        """Hash the content of a clippings file."""
+        return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+    def _snapshot_path(self, path: Path) -> Path:
+        """Path of the snapshot of a file."""
+        key = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.pickle"
@@ -1,16 +1,25 @@
 """File-based clipping adapter implementation."""
 
+import glob
 import re
+import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
-from ..core.interfaces import ClippingRepository
+from ..core.interfaces import IncrementalClippingRepository
 from ..core.models import Clipping
+from .clipping_cache import ClippingCache
 
+SEPARATOR = "=========="
 
-class FileClippingAdapter(ClippingRepository):
+
+class FileClippingAdapter(IncrementalClippingRepository):
     """File-based implementation of ClippingRepository."""
 
+    def __init__(self, cache_dir: Optional[str] = None):
+        """Initialize the adapter, with a parse cache when cache_dir is given."""
+        self.cache = ClippingCache(cache_dir) if cache_dir else None
+
     def get_clippings(self, source: str) -> List[Clipping]:
         """Get clippings from a file."""
         path = Path(source)
@@ -18,15 +27,111 @@ class FileClippingAdapter(ClippingRepository):
         if not path.exists():
             raise FileNotFoundError(f"File not found: {source}")
 
+        if self.cache is None:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+
+            return self._parse_content(content)
+
+        # Unchanged size and mtime: no need to even read the file. The file is
+        # stat'ed before it is read, so clippings appended meanwhile are not
+        # cached as fresh
+        stat = path.stat()
+        clippings = self.cache.load(path, stat)
+        if clippings is not None:
+            return clippings
+
+        # Touched but identical content: no need to parse it
+        data = path.read_bytes()
+        content_hash = ClippingCache.content_hash(data)
+        clippings = self.cache.load(path, stat, content_hash)
+        if clippings is not None:
+            return clippings
+
+        clippings = self._parse_content(data.decode("utf-8"))
+        self.cache.store(path, stat, content_hash, clippings)
+        return clippings
+
+    def iter_clippings(self, source: str) -> Iterator[Clipping]:
+        """Yield clippings from a file as they are parsed, reading it line by line."""
+        path = Path(source)
+
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {source}")
+
+        # A fresh cache beats streaming
+        if self.cache is not None:
+            yield from self.get_clippings(source)
+            return
+
         with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
+            block_lines: List[str] = []
+            for line in f:
+                if line.strip() == SEPARATOR:
+                    yield from self._parse_content("".join(block_lines))
+                    block_lines = []
+                else:
+                    block_lines.append(line)
+
+            yield from self._parse_content("".join(block_lines))
+
+    def get_new_clippings(self, source: str, offset: int) -> Tuple[List[Clipping], int]:
+        """
+        Get the clippings appended to a file after a byte offset.
+
+        Only complete clippings, up to the last separator, are parsed; the
+        returned offset points right after it. A file shorter than the offset
+        was truncated or replaced and is read from the start again.
+        """
+        path = Path(source)
+
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {source}")
 
-        return self._parse_content(content)
+        with open(path, "rb") as f:
+            if f.seek(0, 2) < offset:
+                offset = 0
+            f.seek(offset)
+            data = f.read()
+
+        end = data.rfind(SEPARATOR.encode("ascii"))
+        if end == -1:
+            return [], offset
+
+        end += len(SEPARATOR)
+        content = data[:end].decode("utf-8")
+        return self._parse_content(content), offset + end
+
+    def expand_sources(self, sources: List[str]) -> List[str]:
+        """
+        Expand file paths, directories and glob patterns into clippings files.
+
+        Directories are searched recursively for .txt files. Each file is listed
+        once, in the order given.
+        """
+        files: List[str] = []
+        for source in sources:
+            path = Path(source)
+            if path.is_dir():
+                matches = sorted(str(p) for p in path.rglob("*.txt") if p.is_file())
+            elif glob.has_magic(source):
+                matches = sorted(p for p in glob.glob(source, recursive=True))
+                matches = [p for p in matches if Path(p).is_file()]
+            elif path.exists():
+                matches = [source]
+            else:
+                raise FileNotFoundError(f"File not found: {source}")
+
+            for match in matches:
+                if match not in files:
+                    files.append(match)
+
+        return files
 
     def _parse_content(self, content: str) -> List[Clipping]:
         """Parse clippings from a string content."""
         # Split by the separator
-        clipping_blocks = content.split("==========")
+        clipping_blocks = content.split(SEPARATOR)
 
         clippings = []
         for block in clipping_blocks:
@@ -39,8 +144,9 @@ class FileClippingAdapter(ClippingRepository):
                 if clipping:
                     clippings.append(clipping)
             except Exception as e:
-                # Log error but continue parsing other clippings
-                print(f"Error parsing clipping block: {e}")
+                # Log error but continue parsing other clippings, on stderr to
+                # keep machine-readable output on stdout intact
+                print(f"Error parsing clipping block: {e}", file=sys.stderr)
                 continue
 
         return clippings
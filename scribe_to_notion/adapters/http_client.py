@@ -0,0 +1,111 @@
+"""Pooled HTTP transport shared by every Notion adapter of the process."""
+
+import gzip
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+from notion_client import Client
+
+
+@dataclass(frozen=True)
+class HttpClientConfig:
+    """Tuning of the connections to the Notion API."""
+
+    max_connections: int = 10
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept open
+    http2: bool = True  # Needs the http2 extra, HTTP/1.1 is used otherwise
+    timeout: float = 60.0  # Seconds to wait for a response
+    connect_timeout: float = 10.0
+    compress_requests: bool = False  # Gzip request bodies of compress_min_bytes+
+    compress_min_bytes: int = 1024
+
+
+class GzipRequestTransport(httpx.BaseTransport):
+    """Transport compressing large request bodies before sending them."""
+
+    def __init__(self, transport: httpx.BaseTransport, min_bytes: int = 1024):
+        """Wrap a transport."""
+        self.transport = transport
+        self.min_bytes = min_bytes
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send the request, with a gzip body when it is large enough."""
+        body = request.read()
+        if len(body) >= self.min_bytes and "content-encoding" not in request.headers:
+            headers = request.headers.copy()
+            headers["Content-Encoding"] = "gzip"
+            headers.pop("Content-Length", None)
+            request = httpx.Request(
+                request.method,
+                request.url,
+                headers=headers,
+                content=gzip.compress(body, compresslevel=5),
+                extensions=request.extensions,
+            )
+        return self.transport.handle_request(request)
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+_transports: Dict[HttpClientConfig, httpx.BaseTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def shared_transport(config: Optional[HttpClientConfig] = None) -> httpx.BaseTransport:
+    """
+    The connection pool of the process for a configuration.
+
+    The pool is created on first use and then shared, so connections (and
+    their TLS sessions) are reused across adapters, workers and imports.
+    """
+    config = config or HttpClientConfig()
+    with _transports_lock:
+        transport = _transports.get(config)
+        if transport is None:
+            limits = httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            )
+            try:
+                transport = httpx.HTTPTransport(http2=config.http2, limits=limits)
+            except ImportError:
+                # h2 is not installed
+                transport = httpx.HTTPTransport(limits=limits)
+            if config.compress_requests:
+                transport = GzipRequestTransport(transport, config.compress_min_bytes)
+            _transports[config] = transport
+        return transport
+
+
+def create_http_client(config: Optional[HttpClientConfig] = None) -> httpx.Client:
+    """
+    Create an HTTP client sending its requests through the shared pool.
+
+    notion_client sets the authentication header on the client it is given,
+    so each Notion client needs its own httpx client; the connections are
+    shared through the transport.
+    """
+    config = config or HttpClientConfig()
+    return httpx.Client(
+        transport=shared_transport(config),
+        timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+    )
+
+
+def create_notion_client(
+    api_token: str, http_client: Optional[httpx.Client] = None
+) -> Client:
+    """Create a Notion client on top of a pooled HTTP client."""
+    http_client = http_client or create_http_client()
+
+    # notion_client replaces the client timeout with its own, restore it
+    timeout = http_client.timeout
+    client = Client(auth=api_token, client=http_client)
+    http_client.timeout = timeout
+    return client
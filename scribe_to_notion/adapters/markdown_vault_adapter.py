@@ -0,0 +1,231 @@
+"""Markdown vault (e.g. Obsidian) page adapter implementation."""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..core.interfaces import PagePublisherRepository
+
+# Marks the pages written by this adapter
+SOURCE = "scribe-to-notion"
+
+# Characters not allowed in file names on common filesystems
+UNSAFE_CHARACTERS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+MAX_NAME_LENGTH = 120
+
+
+@dataclass
+class _Page:
+    """In-memory state of a page of the vault."""
+
+    title: str
+    content: str
+    created: str
+    file_hash: Optional[str]  # Hash of the file on disk, None if not written
+    version: int = 0
+
+
+class MarkdownVaultAdapter(PagePublisherRepository):
+    """
+    Markdown implementation of PagePublisherRepository, one file per page.
+
+    Page IDs are file paths relative to the vault, and parent IDs folders of
+    the vault ("" for its root). Each file has a YAML front-matter holding the
+    page title and creation date. The vault is indexed once when the adapter
+    is created, so reads and existence checks never touch the disk.
+
+    Writes run on a thread pool: create_page and append_content update the
+    index and return at once, and flush waits for the files to be written.
+    Each file is replaced atomically, and only when its content changed.
+    """
+
+    def __init__(self, vault_dir: str, max_workers: int = 8):
+        """Index the Markdown files of the vault."""
+        self.vault_dir = Path(vault_dir)
+        self.vault_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._pages: Dict[str, _Page] = {}
+        self._page_locks: Dict[str, threading.Lock] = {}
+        self._pending: List[Future] = []
+        self.files_written = 0
+        self.files_skipped = 0
+
+        paths = list(self.vault_dir.rglob("*.md"))
+        for path, page in zip(paths, self._executor.map(self._read_page, paths)):
+            if page is not None:
+                self._pages[path.relative_to(self.vault_dir).as_posix()] = page
+
+    def create_page(self, parent_id: str, title: str, content: str = "") -> str:
+        """Create (or replace) the page of a title in a folder of the vault."""
+        with self._lock:
+            page_id = self._page_id(parent_id, title)
+            page = self._pages.get(page_id)
+            if page is None:
+                created = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+                page = self._pages[page_id] = _Page(title, content, created, None)
+            else:
+                page.content = content
+            self._schedule_write(page_id, page)
+        return page_id
+
+    def append_content(self, page_id: str, content: str) -> None:
+        """Append content at the end of a page of the vault."""
+        with self._lock:
+            page = self._pages.get(page_id)
+            if page is None:
+                raise Exception(f"Failed to append to page: {page_id} not found")
+            page.content = f"{page.content}\n\n{content}" if page.content else content
+            self._schedule_write(page_id, page)
+
+    def get_page_content(self, page_id: str) -> Optional[str]:
+        """Get the content of a page as a string."""
+        with self._lock:
+            page = self._pages.get(page_id)
+            return page.content if page is not None else None
+
+    def page_exists(self, page_id: str) -> bool:
+        """Check if a page exists."""
+        with self._lock:
+            return page_id in self._pages
+
+    def delete_page(self, page_id: str) -> bool:
+        """Delete the file of a page."""
+        with self._lock:
+            page = self._pages.pop(page_id, None)
+            if page is None:
+                return False
+            page.version += 1  # Cancels pending writes
+            page_lock = self._page_locks.setdefault(page_id, threading.Lock())
+
+        try:
+            with page_lock:
+                (self.vault_dir / page_id).unlink(missing_ok=True)
+            return True
+        except Exception as e:
+            raise Exception(f"Failed to delete page: {e}")
+
+    def flush(self) -> None:
+        """Wait for pending writes, raising the first failure."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        errors = [f.exception() for f in pending if f.exception() is not None]
+        if errors:
+            raise Exception(f"Failed to write page: {errors[0]}")
+
+    def close(self) -> None:
+        """Write pending pages and stop the thread pool."""
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown()
+
+    def _page_id(self, parent_id: str, title: str) -> str:
+        """Page ID of a title in a folder, reusing the page of the same title."""
+        folder = Path(parent_id.strip("/")) if parent_id else Path()
+        name = UNSAFE_CHARACTERS.sub("-", title).strip(" .")[:MAX_NAME_LENGTH]
+        name = name or "Untitled"
+
+        # Titles sanitized to the same name get numbered files
+        suffix = 1
+        while True:
+            page_id = folder / f"{name}{f' ({suffix})' if suffix > 1 else ''}.md"
+            page_id = page_id.as_posix()
+            page = self._pages.get(page_id)
+            if page is not None and page.title == title:
+                return page_id
+            # Never overwrite files of other pages, or not written by us
+            if page is None and not (self.vault_dir / page_id).exists():
+                return page_id
+            suffix += 1
+
+    def _schedule_write(self, page_id: str, page: _Page) -> None:
+        """Queue the write of the current state of a page."""
+        page.version += 1
+        page_lock = self._page_locks.setdefault(page_id, threading.Lock())
+        self._pending.append(
+            self._executor.submit(self._write, page_id, page, page.version, page_lock)
+        )
+
+    def _write(
+        self, page_id: str, page: _Page, version: int, page_lock: threading.Lock
+    ) -> None:
+        """Write a page, unless a newer version of it is queued."""
+        with page_lock:
+            with self._lock:
+                if page.version != version:
+                    return
+                text = self._render(page)
+
+            file_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
+            if file_hash == page.file_hash:
+                with self._lock:
+                    self.files_skipped += 1
+                return
+
+            path = self.vault_dir / page_id
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            with self._lock:
+                page.file_hash = file_hash
+                self.files_written += 1
+
+    def _render(self, page: _Page) -> str:
+        """Markdown text of a page, with its front-matter."""
+        return (
+            "---\n"
+            f"title: {json.dumps(page.title, ensure_ascii=False)}\n"
+            f"created: {page.created}\n"
+            f"source: {SOURCE}\n"
+            "---\n\n"
+            f"# {page.title}\n\n"
+            f"{page.content}\n"
+        )
+
+    def _read_page(self, path: Path) -> Optional[_Page]:
+        """Parse a Markdown file written by this adapter, None for other files."""
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+        if not text.startswith("---\n"):
+            return None
+
+        front_matter, separator, body = text[4:].partition("\n---\n\n")
+        if not separator:
+            return None
+        fields = {}
+        for line in front_matter.splitlines():
+            key, _, value = line.partition(": ")
+            fields[key] = value
+        if fields.get("source") != SOURCE:
+            return None
+
+        try:
+            title = json.loads(fields["title"])
+        except (KeyError, ValueError):
+            return None
+        heading = f"# {title}\n\n"
+        content = body[len(heading) :] if body.startswith(heading) else body
+        return _Page(
+            title=title,
+            content=content[:-1] if content.endswith("\n") else content,
+            created=fields.get("created", ""),
+            file_hash=hashlib.sha1(text.encode("utf-8")).hexdigest(),
+        )
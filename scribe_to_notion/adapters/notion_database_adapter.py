@@ -0,0 +1,251 @@
+"""Notion database adapter implementation."""
+
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+import httpx
+from notion_client import APIErrorCode, APIResponseError
+
+from ..core.interfaces import RowPublisherRepository
+from ..core.models import Book, Clipping
+from .http_client import create_notion_client
+
+if TYPE_CHECKING:
+    from ..services.rate_limiter import RateLimiter
+
+# Notion has a 2000 character limit per rich text object
+MAX_CHARACTERS = 2000
+
+
+class IdMap:
+    """Local, JSON-backed map of row keys to Notion page IDs, per database."""
+
+    def __init__(self, path: Optional[str] = None):
+        """Load the map from disk; an in-memory map is used without a path."""
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._ids: Dict[str, Dict[str, str]] = {}
+
+        if self.path and self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._ids = json.load(f)
+
+    def get(self, database_id: str, key: str) -> Optional[str]:
+        """Get the page ID recorded for a row key."""
+        with self._lock:
+            return self._ids.get(database_id, {}).get(key)
+
+    def set(self, database_id: str, key: str, page_id: str) -> None:
+        """Record the page ID of a row key."""
+        with self._lock:
+            self._ids.setdefault(database_id, {})[key] = page_id
+
+    def save(self) -> None:
+        """Write the map to disk atomically."""
+        if not self.path:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._ids, f)
+        os.replace(tmp_path, self.path)
+
+
+class NotionDatabaseAdapter(RowPublisherRepository):
+    """
+    Notion implementation of RowPublisherRepository.
+
+    Books are upserted as rows of a database with the properties below. When a
+    highlights database is given, each highlight also becomes a row of it,
+    related to its book row.
+    """
+
+    # Book database properties
+    TITLE_PROPERTY = "Name"
+    AUTHOR_PROPERTY = "Author"
+    COUNT_PROPERTY = "Highlights"
+    LAST_HIGHLIGHT_PROPERTY = "Last Highlight"
+
+    # Highlight database properties
+    HIGHLIGHT_PROPERTY = "Highlight"
+    BOOK_PROPERTY = "Book"
+    PAGE_PROPERTY = "Page"
+    LOCATION_PROPERTY = "Location"
+    ADDED_PROPERTY = "Added"
+    NOTE_PROPERTY = "Note"
+
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        highlights_database_id: Optional[str] = None,
+        id_map_path: Optional[str] = None,
+        max_workers: int = 3,
+        http_client: Optional[httpx.Client] = None,
+        rate_limiter: Optional["RateLimiter"] = None,
+    ):
+        """
+        Initialize the Notion client and the local ID map.
+
+        Requests go through http_client, by default a client of the connection
+        pool shared by the whole process. Rows are written by max_workers
+        workers, and every request waits for the rate limiter, if any.
+        """
+        self.api_token = api_token or os.getenv("NOTION_API_TOKEN")
+
+        if not self.api_token:
+            raise ValueError(
+                "Notion API token is required. Set NOTION_API_TOKEN environment variable."
+            )
+
+        self.client = create_notion_client(self.api_token, http_client)
+        self.highlights_database_id = highlights_database_id
+        self.id_map = IdMap(id_map_path)
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+
+    def upsert_books(self, database_id: str, books: List[Book]) -> Dict[str, str]:
+        """Create or update one row per book, and per highlight if enabled."""
+        results: Dict[str, str] = {}
+
+        try:
+            book_rows = self._run_bounded(
+                [
+                    lambda book=book: self._upsert_row(
+                        database_id, book.title, self._book_properties(book)
+                    )
+                    for book in books
+                ]
+            )
+            for book, page_id in zip(books, book_rows):
+                results[book.title] = page_id
+
+            if self.highlights_database_id:
+                highlights_database_id = self.highlights_database_id
+                self._run_bounded(
+                    [
+                        lambda book=book, highlight=highlight: self._upsert_row(
+                            highlights_database_id,
+                            f"{book.title}\x1f{highlight.fingerprint}",
+                            self._highlight_properties(highlight, results[book.title]),
+                        )
+                        for book in books
+                        for highlight in book.highlights
+                    ]
+                )
+        except Exception as e:
+            raise Exception(f"Failed to upsert rows: {e}")
+        finally:
+            # Keep the rows created so far, a rerun will update them
+            self.id_map.save()
+
+        return results
+
+    def count_requests(self, book: Book) -> int:
+        """One request for the book row, and one per highlight row if enabled."""
+        if self.highlights_database_id:
+            return 1 + len(book.highlights)
+        return 1
+
+    def _run_bounded(self, tasks: List[Callable[[], str]]) -> List[str]:
+        """
+        Run tasks on a worker pool, with at most twice as many queued as workers.
+
+        Bounding the queue keeps memory flat for thousands of rows, and lets the
+        first error stop the submission of new requests.
+        """
+        slots = threading.BoundedSemaphore(self.max_workers * 2)
+        failed = threading.Event()
+        futures: List[Future] = []
+
+        def on_done(future: Future) -> None:
+            if future.exception():
+                failed.set()
+            slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for task in tasks:
+                slots.acquire()
+                if failed.is_set():
+                    slots.release()
+                    break
+                future = executor.submit(task)
+                future.add_done_callback(on_done)
+                futures.append(future)
+
+        return [future.result() for future in futures]
+
+    def _upsert_row(
+        self, database_id: str, key: str, properties: Dict[str, Any]
+    ) -> str:
+        """Update the row recorded in the ID map, or create it."""
+        page_id = self.id_map.get(database_id, key)
+
+        if page_id:
+            try:
+                self._wait_for_rate_limit()
+                self.client.pages.update(page_id, properties=properties)
+                return page_id
+            except APIResponseError as e:
+                # The row was deleted in Notion, create it again
+                if e.code != APIErrorCode.ObjectNotFound:
+                    raise
+
+        self._wait_for_rate_limit()
+        response = self.client.pages.create(
+            parent={"database_id": database_id}, properties=properties
+        )
+        self.id_map.set(database_id, key, response["id"])
+        return response["id"]
+
+    def _wait_for_rate_limit(self) -> None:
+        """Wait until the next request is allowed by the rate limiter."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+    def _book_properties(self, book: Book) -> Dict[str, Any]:
+        """Build the properties of a book row."""
+        last_highlight_at = book.last_highlight_at
+        return {
+            self.TITLE_PROPERTY: {"title": self._rich_text(book.title)},
+            self.AUTHOR_PROPERTY: {"rich_text": self._rich_text(book.author or "")},
+            self.COUNT_PROPERTY: {"number": book.highlight_count},
+            self.LAST_HIGHLIGHT_PROPERTY: {
+                "date": (
+                    {"start": last_highlight_at.isoformat()}
+                    if last_highlight_at
+                    else None
+                )
+            },
+        }
+
+    def _highlight_properties(
+        self, highlight: Clipping, book_page_id: str
+    ) -> Dict[str, Any]:
+        """Build the properties of a highlight row."""
+        added_at = highlight.added_at
+        notes = "\n".join(note.content for note in highlight.notes)
+        return {
+            self.HIGHLIGHT_PROPERTY: {"title": self._rich_text(highlight.content)},
+            self.BOOK_PROPERTY: {"relation": [{"id": book_page_id}]},
+            self.PAGE_PROPERTY: {"rich_text": self._rich_text(highlight.page or "")},
+            self.LOCATION_PROPERTY: {
+                "rich_text": self._rich_text(highlight.location or "")
+            },
+            self.ADDED_PROPERTY: {
+                "date": {"start": added_at.isoformat()} if added_at else None
+            },
+            self.NOTE_PROPERTY: {"rich_text": self._rich_text(notes)},
+        }
+
+    def _rich_text(self, text: str) -> List[Dict[str, Any]]:
+        """Split text into rich text objects that fit Notion's character limits."""
+        return [
+            {"type": "text", "text": {"content": text[i : i + MAX_CHARACTERS]}}
+            for i in range(0, len(text), MAX_CHARACTERS)
+        ]
@@ -1,17 +1,58 @@
 """Notion page adapter implementation."""
 
 import os
-from typing import Optional, Dict, Any, List
-from notion_client import Client
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterable, List
+
+import httpx
+from notion_client import APIResponseError
+from notion_client.errors import RequestTimeoutError
 
 from ..core.interfaces import PagePublisherRepository
+from .http_client import create_notion_client
+from .page_state_cache import PageStateCache
+
+# Notion accepts at most 100 children blocks per request
+MAX_BLOCKS_PER_REQUEST = 100
+
+# Notion error code meaning the page does not exist (or is not shared with
+# the integration); other errors, e.g. a malformed request, are raised
+NOT_FOUND_CODE = "object_not_found"
+
+# Page IDs are UUIDs, with or without dashes
+PAGE_ID = re.compile(r"[0-9a-f]{32}", re.IGNORECASE)
+
+# Notion error codes worth retrying, they say nothing about the page
+TRANSIENT_CODES = (
+    "rate_limited",
+    "conflict_error",
+    "internal_server_error",
+    "service_unavailable",
+    "gateway_timeout",
+)
+LOOKUP_ATTEMPTS = 3
 
 
 class NotionPageAdapter(PagePublisherRepository):
     """Notion implementation of PagePublisherRepository."""
 
-    def __init__(self, api_token: Optional[str] = None):
-        """Initialize the Notion client."""
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        http_client: Optional[httpx.Client] = None,
+        cache_ttl: float = 300.0,
+        lookup_workers: int = 3,
+    ):
+        """
+        Initialize the Notion client.
+
+        Requests go through http_client, by default a client of the connection
+        pool shared by the whole process (see http_client.py). Page states are
+        cached for cache_ttl seconds, and pages_exist runs up to lookup_workers
+        lookups at once.
+        """
         self.api_token = api_token or os.getenv("NOTION_API_TOKEN")
 
         if not self.api_token:
@@ -19,7 +60,9 @@ class NotionPageAdapter(PagePublisherRepository):
                 "Notion API token is required. Set NOTION_API_TOKEN environment variable."
             )
 
-        self.client = Client(auth=self.api_token)
+        self.client = create_notion_client(self.api_token, http_client)
+        self.page_states = PageStateCache(cache_ttl)
+        self.lookup_workers = lookup_workers
 
     def create_page(self, parent_id: str, title: str, content: str = "") -> str:
         """Create a new page in Notion."""
@@ -27,15 +70,40 @@ class NotionPageAdapter(PagePublisherRepository):
             # Split content into chunks if it's too long
             content_blocks = self._split_content_into_blocks(content)
 
+            # Notion accepts at most 100 blocks per request, append the rest
             response = self.client.pages.create(
                 parent={"page_id": parent_id},
                 properties={"title": {"title": [{"text": {"content": title}}]}},
-                children=content_blocks,
+                children=content_blocks[:MAX_BLOCKS_PER_REQUEST],
             )
+            for i in range(
+                MAX_BLOCKS_PER_REQUEST, len(content_blocks), MAX_BLOCKS_PER_REQUEST
+            ):
+                self.client.blocks.children.append(
+                    block_id=response["id"],
+                    children=content_blocks[i : i + MAX_BLOCKS_PER_REQUEST],
+                )
+            self.page_states.set(response["id"], True)
             return response["id"]
         except Exception as e:
             raise Exception(f"Failed to create page: {e}")
 
+    def append_content(self, page_id: str, content: str) -> None:
+        """Append content at the end of a page in Notion."""
+        try:
+            content_blocks = self._split_content_into_blocks(content)
+
+            # Notion accepts at most 100 blocks per request
+            for i in range(0, len(content_blocks), MAX_BLOCKS_PER_REQUEST):
+                self.client.blocks.children.append(
+                    block_id=page_id,
+                    children=content_blocks[i : i + MAX_BLOCKS_PER_REQUEST],
+                )
+            self.page_states.set(page_id, True)
+        except Exception as e:
+            self.page_states.invalidate(page_id)
+            raise Exception(f"Failed to append to page: {e}")
+
     def _split_content_into_blocks(self, content: str) -> List[Dict[str, Any]]:
         """Split content into blocks that fit Notion's character limits."""
         if not content:
@@ -78,11 +146,16 @@ class NotionPageAdapter(PagePublisherRepository):
         }
 
     def get_page(self, page_id: str) -> Optional[Dict[str, Any]]:
-        """Get a page by ID. Returns None if page doesn't exist."""
+        """
+        Get a page by ID. Returns None if page doesn't exist.
+
+        Other errors (timeouts, rate limiting, server errors) are raised: they
+        say nothing about the page.
+        """
         try:
-            return self.client.pages.retrieve(page_id)
-        except Exception:
-            return None
+            return self._retrieve_page(page_id)
+        except Exception as e:
+            raise Exception(f"Failed to get page: {e}")
 
     def get_page_content(self, page_id: str) -> Optional[str]:
         """Get the content of a page as a string."""
@@ -109,11 +182,67 @@ class NotionPageAdapter(PagePublisherRepository):
         """Delete a page in Notion."""
         try:
             self.client.pages.update(page_id, archived=True)
+            self.page_states.set(page_id, False)
             return True
         except Exception as e:
+            self.page_states.invalidate(page_id)
             raise Exception(f"Failed to delete page: {e}")
 
     def page_exists(self, page_id: str) -> bool:
-        """Check if a page exists (not archived)."""
-        page = self.get_page(page_id)
-        return page is not None and not page.get("archived", False)
+        """Check if a page exists (not archived), from the cache if known."""
+        exists = self.page_states.get(page_id)
+        if exists is None:
+            exists = self._lookup_page(page_id)
+        return exists
+
+    def pages_exist(self, page_ids: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check which pages exist, looking up the pages not cached concurrently.
+
+        Transient errors are retried; a page still failing raises, rather than
+        being reported as missing.
+        """
+        results: Dict[str, bool] = {}
+        unknown = []
+        for page_id in dict.fromkeys(page_ids):
+            exists = self.page_states.get(page_id)
+            if exists is None:
+                unknown.append(page_id)
+            else:
+                results[page_id] = exists
+
+        if unknown:
+            workers = max(1, min(self.lookup_workers, len(unknown)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results.update(zip(unknown, executor.map(self._lookup_page, unknown)))
+        return results
+
+    def _retrieve_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a page, None if it does not exist."""
+        # A malformed ID names no page, no need to ask Notion
+        if not PAGE_ID.fullmatch(page_id.replace("-", "")):
+            return None
+        try:
+            return self.client.pages.retrieve(page_id)
+        except APIResponseError as e:
+            if e.code == NOT_FOUND_CODE:
+                return None
+            raise
+
+    def _lookup_page(self, page_id: str) -> bool:
+        """Retrieve whether a page exists, retrying transient errors, and cache it."""
+        for attempt in range(LOOKUP_ATTEMPTS):
+            try:
+                page = self._retrieve_page(page_id)
+                break
+            except Exception as e:
+                transient = isinstance(
+                    e, (RequestTimeoutError, httpx.TransportError)
+                ) or (isinstance(e, APIResponseError) and e.code in TRANSIENT_CODES)
+                if not transient or attempt == LOOKUP_ATTEMPTS - 1:
+                    raise Exception(f"Failed to check page {page_id}: {e}")
+                time.sleep(0.5 * 2**attempt)
+
+        exists = page is not None and not page.get("archived", False)
+        self.page_states.set(page_id, exists)
+        return exists
@@ -0,0 +1,43 @@
+"""In-memory cache of known page states, with a time to live."""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+class PageStateCache:
+    """
+    Remember whether pages exist, for ttl seconds.
+
+    States learnt from the publisher's own writes (a page created, deleted)
+    are as good as a lookup, so they are cached too.
+    """
+
+    def __init__(self, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        """Initialize an empty cache."""
+        self.ttl = ttl
+        self.clock = clock
+        self._states: Dict[str, Tuple[bool, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, page_id: str) -> Optional[bool]:
+        """Whether the page exists, or None if unknown or expired."""
+        with self._lock:
+            state = self._states.get(page_id)
+            if state is None:
+                return None
+            exists, expires_at = state
+            if self.clock() >= expires_at:
+                del self._states[page_id]
+                return None
+            return exists
+
+    def set(self, page_id: str, exists: bool) -> None:
+        """Remember the state of a page."""
+        with self._lock:
+            self._states[page_id] = (exists, self.clock() + self.ttl)
+
+    def invalidate(self, page_id: str) -> None:
+        """Forget the state of a page."""
+        with self._lock:
+            self._states.pop(page_id, None)
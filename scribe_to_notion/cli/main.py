@@ -1,14 +1,31 @@
-"""Command-line interface for Scribe to Notion import."""
+"""
+Command-line interface for Scribe to Notion import.
+
+Adapters and services are imported where they are used: `--help`, argument
+errors and a missing file must not pay for loading the Notion HTTP stack.
+"""
 
 import argparse
 import os
 import sys
+import time
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import TYPE_CHECKING, Optional, Dict, List, Union
+
+if TYPE_CHECKING:
+    from .ndjson_output import NdjsonOutput
+
+
+def default_data_dir() -> Path:
+    """Directory where local state (ID maps, indexes) is kept."""
+    data_home = os.getenv("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "scribe-to-notion"
 
-from ..adapters.file_clipping_adapter import FileClippingAdapter
-from ..adapters.notion_page_adapter import NotionPageAdapter
-from ..services.import_service import ImportService
+
+def default_cache_dir() -> Path:
+    """Directory where disposable data (parse cache) is kept."""
+    cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "scribe-to-notion"
 
 
 def create_parser():
@@ -21,11 +38,170 @@ Examples:
   # Import clippings to Notion
   scribe-to-notion /path/to/My\ Clippings.txt --parent-page-id YOUR_PAGE_ID
 
+  # Merge the clippings of several devices, from files, directories or globs
+  scribe-to-notion kindle/My\ Clippings.txt scribe/ "backups/*.txt" --parent-page-id YOUR_PAGE_ID
+
+  # Keep running and publish new highlights as they are added
+  scribe-to-notion watch /path/to/My\ Clippings.txt --parent-page-id YOUR_PAGE_ID
+
+  # Import the clippings of several accounts listed in a manifest, concurrently
+  scribe-to-notion batch accounts.json --max-jobs 8
+
   # Import with custom API token
   NOTION_API_TOKEN=your_token scribe-to-notion clippings.txt --parent-page-id YOUR_PAGE_ID
+
+  # Upsert one row per book, and per highlight, into Notion databases
+  scribe-to-notion clippings.txt --database-id BOOKS_DB_ID --highlights-database-id HIGHLIGHTS_DB_ID
+
+  # Export one Markdown file per book to an Obsidian vault, offline
+  scribe-to-notion clippings.txt --vault ~/Obsidian/Highlights
         """,
     )
 
+    parser.add_argument(
+        "clippings_files",
+        type=str,
+        nargs="+",
+        help="Paths, directories or glob patterns of My Clippings.txt files",
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "--parent-page-id",
+        help="Notion parent page ID where book pages will be created",
+    )
+    target.add_argument(
+        "--database-id",
+        help="Notion database ID where one row per book will be upserted",
+    )
+    target.add_argument(
+        "--vault",
+        help="Directory (e.g. an Obsidian vault) where one Markdown file per "
+        "book will be written, offline",
+    )
+    parser.add_argument(
+        "--highlights-database-id",
+        help="Notion database ID where one row per highlight will be upserted "
+        "(requires --database-id)",
+    )
+    parser.add_argument(
+        "--id-map",
+        help="Local file mapping rows to Notion page IDs for upserts "
+        "(default: %(default)s)",
+        default=str(default_data_dir() / "notion_ids.json"),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of the parsed clippings cache (default: %(default)s)",
+        default=str(default_cache_dir()),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always parse the clippings files, without reading or writing the cache",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=3,
+        help="Books published concurrently, largest first (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=3.0,
+        help="Maximum Notion requests per second, across workers "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--journal",
+        help="Journal of the requests sent, to resume an interrupted import "
+        "(default: one per parent page under %s)" % (default_data_dir() / "journals"),
+    )
+    parser.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="Do not record the requests sent; an interrupted import starts over",
+    )
+    parser.add_argument(
+        "--index",
+        help="Local search index updated with the parsed clippings "
+        "(default: %(default)s)",
+        default=str(default_data_dir() / "search.sqlite3"),
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Do not update the local search index",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=10,
+        help="Connections kept open to Notion, shared by all workers "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--http-timeout",
+        type=float,
+        default=60.0,
+        help="Seconds to wait for a Notion response (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-http2",
+        action="store_true",
+        help="Use HTTP/1.1 even when HTTP/2 is available",
+    )
+    parser.add_argument(
+        "--compress-requests",
+        action="store_true",
+        help="Gzip large request bodies sent to Notion",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=("cpu", "mem"),
+        help="Profile the import: CPU time with cProfile, or memory with "
+        "tracemalloc",
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Path of the profile files, without extension "
+        "(default: a timestamped file under %s)" % (default_data_dir() / "profiles"),
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=25,
+        help="Number of functions or allocation sites shown (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Publish while parsing, with bounded memory, for very large files "
+        "(pages only, not journaled)",
+    )
+    parser.add_argument(
+        "--output",
+        choices=("text", "ndjson"),
+        default="text",
+        help="text for humans, or ndjson to stream one JSON event per line; "
+        "ndjson attempts every book and exits with 2 when only some failed "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--api-token",
+        help="Notion API token (or set NOTION_API_TOKEN environment variable)",
+    )
+
+    return parser
+
+
+def create_watch_parser():
+    """Create and configure the argument parser of the watch command."""
+    parser = argparse.ArgumentParser(
+        prog="scribe-to-notion watch",
+        description="Watch a clippings file and publish new highlights to Notion",
+    )
+
     parser.add_argument(
         "clippings_file", type=str, help="Path to the My Clippings.txt file"
     )
@@ -38,17 +214,63 @@ Examples:
         "--api-token",
         help="Notion API token (or set NOTION_API_TOKEN environment variable)",
     )
+    parser.add_argument(
+        "--state",
+        help="File keeping the read offset and book pages (default: %(default)s)",
+        default=str(default_data_dir() / "watch_state.json"),
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=2.0,
+        help="Seconds without changes before publishing (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checks when inotify is unavailable "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--from-end",
+        action="store_true",
+        help="On the first run, only publish highlights added from now on",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=3.0,
+        help="Maximum Notion requests per second (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--index",
+        help="Local search index updated with new clippings (default: %(default)s)",
+        default=str(default_data_dir() / "search.sqlite3"),
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Do not update the local search index",
+    )
 
     return parser
 
 
-def run_import(
-    clippings_file: str, parent_page_id: str, api_token: Optional[str] = None
+def run_watch(
+    clippings_file: str,
+    parent_page_id: str,
+    api_token: Optional[str] = None,
+    state: Optional[str] = None,
+    debounce: float = 2.0,
+    poll_interval: float = 1.0,
+    from_end: bool = False,
+    index: Optional[str] = None,
+    rate_limit: float = 3.0,
 ):
-    """Run the import process with the given parameters."""
+    """Watch a clippings file and publish new highlights until interrupted."""
     # Validate clippings file
-    clippings_path = Path(clippings_file)
-    if not clippings_path.exists():
+    if not Path(clippings_file).exists():
         print(f"❌ Error: Clippings file not found: {clippings_file}")
         sys.exit(1)
 
@@ -59,22 +281,458 @@ def run_import(
         print("   Set NOTION_API_TOKEN environment variable or use --api-token")
         sys.exit(1)
 
+    def on_sync(result: Dict[str, List[str]]) -> None:
+        for book_title, page_ids in result.items():
+            print(f"✅ Published new highlights of {book_title} ({page_ids[0]})")
+
+    def on_error(error: Exception) -> None:
+        print(f"❌ Sync failed, will retry on next change: {error}")
+
     try:
-        # Create adapters
+        from ..adapters.file_clipping_adapter import FileClippingAdapter
+        from ..adapters.notion_page_adapter import NotionPageAdapter
+        from ..services.import_service import ImportService
+        from ..services.rate_limiter import RateLimiter
+        from ..services.search_index import SearchIndex
+        from ..services.watch_service import WatchService
+
+        # Create adapters and services once, the client stays warm
         clipping_adapter = FileClippingAdapter()
         page_publisher = NotionPageAdapter(api_token=api_token)
+        service = ImportService(
+            page_publisher,
+            clipping_adapter,
+            rate_limiter=RateLimiter(rate_limit),
+            search_index=SearchIndex(index) if index else None,
+        )
+        watch_service = WatchService(
+            service,
+            clipping_adapter,
+            state_path=state or str(default_data_dir() / "watch_state.json"),
+            debounce=debounce,
+            poll_interval=poll_interval,
+        )
+
+        print(f"👀 Watching clippings from: {clippings_file}")
+        watch_service.run(
+            clippings_file,
+            parent_page_id,
+            from_end=from_end,
+            on_sync=on_sync,
+            on_error=on_error,
+        )
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.")
+    except ValueError as e:
+        print(f"❌ Configuration error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Watch failed: {e}")
+        sys.exit(1)
+
+
+def create_search_parser():
+    """Create and configure the argument parser of the search command."""
+    parser = argparse.ArgumentParser(
+        prog="scribe-to-notion search",
+        description="Search the imported highlights offline",
+    )
+
+    parser.add_argument(
+        "query",
+        type=str,
+        help="Words to search, or an FTS5 query (e.g. '\"exact phrase\" OR word*')",
+    )
+    parser.add_argument("--book", help="Only search the highlights of this book")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum number of results (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--index",
+        help="Local search index (default: %(default)s)",
+        default=str(default_data_dir() / "search.sqlite3"),
+    )
+
+    return parser
+
+
+def run_search(query: str, index: str, book: Optional[str] = None, limit: int = 20):
+    """Print the indexed clippings matching a query, best matches first."""
+    if not Path(index).exists():
+        print(f"❌ Error: Search index not found: {index}")
+        print("   Import clippings first to build it.")
+        sys.exit(1)
+
+    from ..services.search_index import SearchIndex
+
+    search_index = SearchIndex(index)
+    try:
+        results = search_index.search(query, limit=limit, book=book)
+    finally:
+        search_index.close()
+
+    if not results:
+        print(f"🔍 No highlights match: {query}")
+        return
+
+    print(f"🔍 {len(results)} highlights match: {query}")
+    for result in results:
+        clipping = result.clipping
+        location = f"p.{clipping.page}" if clipping.page else clipping.location or ""
+        kind = "Note" if clipping.clipping_type == "note" else "Highlight"
+        author = f" ({clipping.author})" if clipping.author else ""
+        print(f"\n📖 {clipping.book_title}{author} · {kind} {location}")
+        print(f"   {result.snippet}")
+
+
+def create_batch_parser():
+    """Create and configure the argument parser of the batch command."""
+    parser = argparse.ArgumentParser(
+        prog="scribe-to-notion batch",
+        description="Import the clippings of several Notion accounts concurrently",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Manifest:
+  {"jobs": [
+    {"name": "alice", "clippings": ["alice/My Clippings.txt"],
+     "parent_page_id": "ALICE_PAGE_ID", "token_env": "ALICE_NOTION_TOKEN"},
+    {"name": "bob", "clippings": "bob/", "parent_page_id": "BOB_PAGE_ID",
+     "token": "secret_..."}
+  ]}
+
+Clippings paths are relative to the manifest. Jobs without a token use
+NOTION_API_TOKEN.
+        """,
+    )
+
+    parser.add_argument("manifest", type=str, help="Path to the JSON manifest")
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=4,
+        help="Jobs run concurrently, across all accounts (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=3,
+        help="Books published concurrently by each job (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=3.0,
+        help="Maximum Notion requests per second for each token "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of the parsed clippings cache (default: %(default)s)",
+        default=str(default_cache_dir()),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always parse the clippings files, without reading or writing the cache",
+    )
+    parser.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="Do not record the requests sent; interrupted jobs start over",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        help="Connections kept open to Notion, shared by all jobs "
+        "(default: max jobs × workers)",
+    )
+    parser.add_argument(
+        "--http-timeout",
+        type=float,
+        default=60.0,
+        help="Seconds to wait for a Notion response (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-http2",
+        action="store_true",
+        help="Use HTTP/1.1 even when HTTP/2 is available",
+    )
+
+    return parser
+
+
+def run_batch(
+    manifest: str,
+    max_jobs: int = 4,
+    workers: int = 3,
+    rate_limit: float = 3.0,
+    cache_dir: Optional[str] = None,
+    journal_dir: Optional[str] = None,
+    max_connections: Optional[int] = None,
+    http_timeout: float = 60.0,
+    http2: bool = True,
+):
+    """
+    Run the import jobs of a manifest concurrently.
+
+    Exits with 2 when only some jobs failed, and 1 when all of them did.
+    """
+    from ..services.batch_import import load_manifest
 
-        # Create service
-        service = ImportService(page_publisher, clipping_adapter)
+    try:
+        jobs = load_manifest(manifest, default_token=os.getenv("NOTION_API_TOKEN"))
+    except FileNotFoundError:
+        print(f"❌ Error: Manifest not found: {manifest}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"❌ Configuration error: {e}")
+        sys.exit(1)
 
-        print(f"📖 Parsing clippings from: {clippings_file}")
+    from ..adapters.file_clipping_adapter import FileClippingAdapter
+    from ..adapters.http_client import HttpClientConfig, create_http_client
+    from ..adapters.notion_page_adapter import NotionPageAdapter
+    from ..services.batch_import import BatchImportRunner, BatchJob, BatchJobResult
+    from ..services.import_journal import ImportJournal
+    from ..services.import_service import ImportService
+    from ..services.rate_limiter import RateLimiter
+    from .ndjson_output import EXIT_FAILURE, EXIT_PARTIAL
 
-        # Parse clippings first
-        clippings = clipping_adapter.get_clippings(clippings_file)
+    # One pool for all jobs; each token still gets its own Notion client
+    max_connections = max_connections or max_jobs * workers
+    http_config = HttpClientConfig(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        http2=http2,
+        timeout=http_timeout,
+    )
+
+    def create_service(job: BatchJob, rate_limiter: RateLimiter) -> ImportService:
+        import_journal = None
+        if journal_dir:
+            import_journal = ImportJournal(
+                str(Path(journal_dir) / f"{job.parent_page_id}.jsonl")
+            )
+            if import_journal.resuming:
+                print(f"♻️  {job.name}: resuming interrupted import")
+        return ImportService(
+            NotionPageAdapter(
+                api_token=job.api_token, http_client=create_http_client(http_config)
+            ),
+            FileClippingAdapter(cache_dir=cache_dir),
+            journal=import_journal,
+            max_workers=workers,
+            rate_limiter=rate_limiter,
+        )
+
+    def on_result(result: BatchJobResult) -> None:
+        if result.succeeded:
+            print(
+                f"✅ {result.job.name}: {len(result.pages)} book pages, "
+                f"{result.requests} requests in {result.seconds:.1f}s"
+            )
+        else:
+            print(f"❌ {result.job.name}: {result.error}")
+
+    tokens = len({job.api_token for job in jobs})
+    print(
+        f"📦 Running {len(jobs)} import jobs for {tokens} tokens, "
+        f"{max_jobs} at a time"
+    )
+    started = time.monotonic()
+    runner = BatchImportRunner(
+        create_service,
+        max_jobs=max_jobs,
+        rate_limit=rate_limit,
+        expand_sources=FileClippingAdapter().expand_sources,
+    )
+    results = runner.run(jobs, on_result=on_result)
+    seconds = time.monotonic() - started
+
+    succeeded = sum(1 for result in results if result.succeeded)
+    requests = sum(result.requests for result in results)
+    print(
+        f"\n📊 {succeeded} of {len(results)} jobs succeeded: {requests} requests "
+        f"in {seconds:.1f}s ({requests / seconds if seconds else 0:.1f} requests/s)"
+    )
+    if succeeded < len(results):
+        if journal_dir:
+            print("   Run the same command again to resume the failed jobs.")
+        sys.exit(EXIT_PARTIAL if succeeded else EXIT_FAILURE)
+
+
+def run_import(
+    clippings_files: Union[str, List[str]],
+    parent_page_id: Optional[str],
+    api_token: Optional[str] = None,
+    database_id: Optional[str] = None,
+    highlights_database_id: Optional[str] = None,
+    id_map: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    journal: Optional[str] = None,
+    workers: int = 3,
+    rate_limit: float = 3.0,
+    pipeline: bool = False,
+    index: Optional[str] = None,
+    max_connections: int = 10,
+    http_timeout: float = 60.0,
+    http2: bool = True,
+    compress_requests: bool = False,
+    vault: Optional[str] = None,
+    output: str = "text",
+):
+    """
+    Run the import process with the given parameters.
+
+    With the ndjson output, progress events are written instead of the human
+    output, every book is attempted even when others fail, and the exit code
+    tells a partial failure from a total one.
+    """
+    from ..adapters.file_clipping_adapter import FileClippingAdapter
+
+    events = None
+    say = print
+    if output == "ndjson":
+        from .ndjson_output import NdjsonOutput
+
+        events = NdjsonOutput()
+        say = _silent
+
+    # Validate clippings files
+    if isinstance(clippings_files, str):
+        clippings_files = [clippings_files]
+    try:
+        sources = FileClippingAdapter().expand_sources(clippings_files)
+    except FileNotFoundError as e:
+        say(f"❌ Error: {e}")
+        _abort(events, e)
+    if not sources:
+        error = f"No clippings file found in: {', '.join(clippings_files)}"
+        say(f"❌ Error: {error}")
+        _abort(events, error)
+
+    # Set up API token
+    api_token = api_token or os.getenv("NOTION_API_TOKEN")
+    if not api_token and not vault:
+        say("❌ Error: Notion API token is required.")
+        say("   Set NOTION_API_TOKEN environment variable or use --api-token")
+        _abort(events, "Notion API token is required")
+
+    from .profiling import stage
+
+    import_journal = None
+    page_publisher = None
+    try:
+        from ..services.import_journal import ImportJournal
+        from ..services.import_service import ImportService
+        from ..services.rate_limiter import RateLimiter
+        from ..services.search_index import SearchIndex
+
+        # Create adapters, Notion ones on a connection pool sized for the workers
+        # and sharing the rate limit of the service
+        rate_limiter = None if vault else RateLimiter(rate_limit)
+        clipping_adapter = FileClippingAdapter(
+            cache_dir=None if pipeline else cache_dir
+        )
+        if vault:
+            from ..adapters.markdown_vault_adapter import MarkdownVaultAdapter
+
+            page_publisher = MarkdownVaultAdapter(vault)
+        else:
+            from ..adapters.http_client import HttpClientConfig, create_http_client
+
+            http_client = create_http_client(
+                HttpClientConfig(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    http2=http2,
+                    timeout=http_timeout,
+                    compress_requests=compress_requests,
+                )
+            )
+            if database_id:
+                from ..adapters.notion_database_adapter import NotionDatabaseAdapter
+
+                page_publisher = NotionDatabaseAdapter(
+                    api_token=api_token,
+                    highlights_database_id=highlights_database_id,
+                    id_map_path=id_map,
+                    max_workers=workers,
+                    http_client=http_client,
+                    rate_limiter=rate_limiter,
+                )
+            else:
+                from ..adapters.notion_page_adapter import NotionPageAdapter
+
+                page_publisher = NotionPageAdapter(
+                    api_token=api_token, http_client=http_client
+                )
+
+        # Create service, recording each request sent when importing pages
+        if journal and not database_id and not vault:
+            import_journal = ImportJournal(journal)
+            if import_journal.resuming:
+                say(f"♻️  Resuming interrupted import from journal: {journal}")
+        service = ImportService(
+            page_publisher,
+            clipping_adapter,
+            journal=import_journal,
+            max_workers=workers,
+            rate_limiter=rate_limiter,
+            search_index=SearchIndex(index) if index else None,
+            on_event=events,
+            fail_fast=events is None,
+        )
+
+        for source in sources:
+            say(f"📖 Parsing clippings from: {source}")
+
+        target_id = "" if vault else database_id or parent_page_id
+        if events is not None:
+            events.write(
+                "import_started",
+                sources=sources,
+                target=vault or target_id,
+                workers=workers,
+                pipeline=pipeline,
+            )
+        if pipeline:
+            # Publish each batch as soon as it is parsed
+            if vault:
+                say(f"\n🚀 Exporting to Markdown vault: {vault}")
+            else:
+                say(f"\n🚀 Importing to Notion parent page: {parent_page_id}")
+            with stage("pipeline"):
+                result = service.import_clippings_pipelined(sources, target_id)
+            say(f"\n✅ Import completed successfully!")
+            say(f"📄 Created {len(result)} book pages:")
+            for book_title, page_ids in result.items():
+                say(f"   • {book_title}")
+                say(f"     {_page_location(page_ids[0], vault)}")
+            say(f"\n🎉 All done! Your highlights are now in {vault or 'Notion'}.")
+            _finish(events)
+            return
+
+        # Parse clippings first, merging duplicates across devices
+        parse_started = time.monotonic()
+        with stage("parse"):
+            clippings = service.load_clippings(sources)
         highlights = [c for c in clippings if c.clipping_type == "surlignement"]
+        notes = [c for c in clippings if c.clipping_type == "note"]
+        if events is not None:
+            events.write(
+                "parse_completed",
+                clippings=len(clippings),
+                highlights=len(highlights),
+                notes=len(notes),
+                seconds=time.monotonic() - parse_started,
+            )
 
-        print(f"✅ Found {len(clippings)} total clippings")
-        print(f"✅ Found {len(highlights)} highlights")
+        say(f"✅ Found {len(clippings)} total clippings")
+        say(f"✅ Found {len(highlights)} highlights")
+        say(f"✅ Found {len(notes)} notes")
 
         # Group by book
         books: Dict[str, List] = {}
@@ -83,44 +741,190 @@ def run_import(
                 books[highlight.book_title] = []
             books[highlight.book_title].append(highlight)
 
-        print(f"📚 Found {len(books)} books with highlights:")
+        say(f"📚 Found {len(books)} books with highlights:")
         for book_title, book_highlights in books.items():
-            print(f"   • {book_title}: {len(book_highlights)} highlights")
+            say(f"   • {book_title}: {len(book_highlights)} highlights")
 
-        print(f"\n🚀 Importing to Notion parent page: {parent_page_id}")
+        if vault:
+            say(f"\n🚀 Exporting to Markdown vault: {vault}")
+        elif database_id:
+            say(f"\n🚀 Importing to Notion database: {database_id}")
+        else:
+            say(f"\n🚀 Importing to Notion parent page: {parent_page_id}")
 
         # Import to Notion
-        result = service.import_clippings(clippings_file, parent_page_id)
+        with stage("publish"):
+            result = service.publish_clippings(clippings, target_id)
+        if import_journal is not None:
+            # Still open when books failed, to resume them
+            import_journal.close()
 
-        print("\n✅ Import completed successfully!")
-        print(f"📄 Created {len(result)} book pages:")
+        say("\n✅ Import completed successfully!")
+        if database_id:
+            say(f"📄 Upserted {len(result)} book rows:")
+        else:
+            say(f"📄 Created {len(result)} book pages:")
 
         for book_title, page_ids in result.items():
             page_id = page_ids[0]  # We only create one page per book
-            notion_url = f"https://notion.so/{page_id.replace('-', '')}"
-            print(f"   • {book_title}")
-            print(f"     📄 Page ID: {page_id}")
-            print(f"     🔗 URL: {notion_url}")
+            say(f"   • {book_title}")
+            if not vault:
+                say(f"     📄 Page ID: {page_id}")
+            say(f"     {_page_location(page_id, vault)}")
+
+        schedule = service.last_schedule
+        if schedule is not None:
+            say(
+                f"\n⏱️  Sent {schedule.requests} requests with {schedule.workers} "
+                f"workers in {schedule.actual_seconds:.1f}s "
+                f"(estimated {schedule.estimated_seconds:.1f}s)"
+            )
 
-        print(f"\n🎉 All done! Your highlights are now in Notion.")
+        if vault:
+            say(
+                f"\n💾 Wrote {page_publisher.files_written} files, "
+                f"{page_publisher.files_skipped} unchanged"
+            )
+
+        say(f"\n🎉 All done! Your highlights are now in {vault or 'Notion'}.")
+        _finish(events)
 
     except FileNotFoundError as e:
-        print(f"❌ File not found: {e}")
-        sys.exit(1)
+        say(f"❌ File not found: {e}")
+        _abort(events, e)
     except ValueError as e:
-        print(f"❌ Configuration error: {e}")
-        sys.exit(1)
+        say(f"❌ Configuration error: {e}")
+        _abort(events, e)
     except Exception as e:
-        print(f"❌ Import failed: {e}")
-        sys.exit(1)
+        say(f"❌ Import failed: {e}")
+        if import_journal is not None and import_journal.resuming:
+            import_journal.close()
+            say("   Run the same command again to resume where it stopped.")
+        _abort(events, e)
+    finally:
+        if vault and page_publisher is not None:
+            page_publisher.close()
+
+
+def _silent(*args, **kwargs) -> None:
+    """Drop the human output, replaced by events."""
+
+
+def _finish(events: Optional["NdjsonOutput"]) -> None:
+    """End the event stream with its summary, exiting unless all succeeded."""
+    if events is not None:
+        exit_code = events.summary()
+        if exit_code:
+            sys.exit(exit_code)
+
+
+def _abort(events: Optional["NdjsonOutput"], error: Union[str, Exception]) -> None:
+    """Exit after an error stopping the import."""
+    if events is not None:
+        events.write("error", error=str(error))
+        sys.exit(events.summary(error=str(error)))
+    sys.exit(1)
 
 
-def main():
+def _page_location(page_id: str, vault: Optional[str]) -> str:
+    """Where a created page can be opened."""
+    if vault:
+        return f"📝 File: {Path(vault) / page_id}"
+    return f"🔗 URL: https://notion.so/{page_id.replace('-', '')}"
+
+
+def main(argv: Optional[List[str]] = None):
     """Main CLI entry point."""
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv and argv[0] == "watch":
+        args = create_watch_parser().parse_args(argv[1:])
+        run_watch(
+            args.clippings_file,
+            args.parent_page_id,
+            args.api_token,
+            state=args.state,
+            debounce=args.debounce,
+            poll_interval=args.poll_interval,
+            from_end=args.from_end,
+            index=None if args.no_index else args.index,
+            rate_limit=args.rate_limit,
+        )
+        return
+
+    if argv and argv[0] == "batch":
+        args = create_batch_parser().parse_args(argv[1:])
+        run_batch(
+            args.manifest,
+            max_jobs=args.max_jobs,
+            workers=args.workers,
+            rate_limit=args.rate_limit,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            journal_dir=(
+                None if args.no_journal else str(default_data_dir() / "journals")
+            ),
+            max_connections=args.max_connections,
+            http_timeout=args.http_timeout,
+            http2=not args.no_http2,
+        )
+        return
+
+    if argv and argv[0] == "search":
+        args = create_search_parser().parse_args(argv[1:])
+        run_search(args.query, args.index, book=args.book, limit=args.limit)
+        return
+
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    run_import(args.clippings_file, args.parent_page_id, args.api_token)
+    if args.highlights_database_id and not args.database_id:
+        parser.error("--highlights-database-id requires --database-id")
+    if args.pipeline and args.database_id:
+        parser.error("--pipeline requires --parent-page-id or --vault")
+
+    journal = None
+    if args.parent_page_id and not args.no_journal and not args.pipeline:
+        journal = args.journal or str(
+            default_data_dir() / "journals" / f"{args.parent_page_id}.jsonl"
+        )
+
+    def run() -> None:
+        run_import(
+            args.clippings_files,
+            args.parent_page_id,
+            args.api_token,
+            database_id=args.database_id,
+            highlights_database_id=args.highlights_database_id,
+            id_map=args.id_map,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            journal=journal,
+            workers=args.workers,
+            rate_limit=args.rate_limit,
+            pipeline=args.pipeline,
+            index=None if args.no_index else args.index,
+            max_connections=args.max_connections,
+            http_timeout=args.http_timeout,
+            http2=not args.no_http2,
+            compress_requests=args.compress_requests,
+            vault=args.vault,
+            output=args.output,
+        )
+
+    if not args.profile:
+        run()
+        return
+
+    from .profiling import profile_run
+
+    output = args.profile_output or str(
+        default_data_dir()
+        / "profiles"
+        / f"import-{time.strftime('%Y%m%d-%H%M%S')}-{args.profile}"
+    )
+    # Keep the event stream parseable
+    stream = sys.stderr if args.output == "ndjson" else None
+    with profile_run(args.profile, output, top=args.profile_top, stream=stream):
+        run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+"""
+Machine-readable progress of an import, one JSON event per line.
+
+Each line is a JSON object with the name of the event, the seconds elapsed
+since the import started and the fields of the event. The stream ends with a
+summary record telling whether the import succeeded, partially failed or
+failed, with the matching exit code.
+"""
+
+import json
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+# Exit codes of an import
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1  # Nothing was published, or the import stopped on an error
+EXIT_PARTIAL = 2  # Some books were published, others failed
+
+
+class NdjsonOutput:
+    """
+    Write import events to a stream and keep the totals of the summary.
+
+    An instance can be passed as the on_event callback of ImportService;
+    events may be written by several threads at once.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Start timing the import."""
+        self.stream = stream or sys.stdout
+        self.clock = clock
+        self.started = clock()
+        self.books = 0
+        self.requests = 0
+        self.pages_created = 0
+        self.failed_books: List[str] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event: str, fields: Dict[str, Any]) -> None:
+        """Write an event reported by the import service."""
+        self.write(event, **fields)
+
+    def write(self, event: str, **fields: Any) -> None:
+        """Write an event, counting books, requests and pages."""
+        with self._lock:
+            if event == "book_planned":
+                self.books += 1
+            elif event == "request_sent":
+                self.requests += 1
+            elif event == "page_created":
+                self.pages_created += 1
+            elif event == "page_failed" and fields["book"] not in self.failed_books:
+                self.failed_books.append(fields["book"])
+
+            record = {"event": event, "elapsed": round(self.clock() - self.started, 3)}
+            for key, value in fields.items():
+                record[key] = round(value, 3) if isinstance(value, float) else value
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.flush()
+
+    def summary(self, error: Optional[str] = None) -> int:
+        """Write the summary record of the import; return its exit code."""
+        if error is not None or (self.failed_books and not self.pages_created):
+            status, exit_code = "failed", EXIT_FAILURE
+        elif self.failed_books:
+            status, exit_code = "partial", EXIT_PARTIAL
+        else:
+            status, exit_code = "succeeded", EXIT_SUCCESS
+
+        seconds = self.clock() - self.started
+        self.write(
+            "summary",
+            status=status,
+            exit_code=exit_code,
+            # Pipelined imports do not plan books ahead
+            books=self.books or self.pages_created + len(self.failed_books),
+            pages_created=self.pages_created,
+            pages_failed=len(self.failed_books),
+            failed_books=list(self.failed_books),
+            requests=self.requests,
+            seconds=seconds,
+            requests_per_second=self.requests / seconds if seconds > 0 else 0.0,
+            error=error,
+        )
+        return exit_code
@@ -0,0 +1,271 @@
+"""
+CPU and memory profiling of a CLI run.
+
+The profile of a slow run can be shipped back and read without reproducing
+the run. cProfile and tracemalloc are only imported when profiling.
+"""
+
+import contextlib
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, TextIO
+
+# Profiler of the current run, if any
+_active: Optional["Profiler"] = None
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Mark a stage of the run, measured when a profiler is active."""
+    if _active is None:
+        yield
+    else:
+        with _active.stage(name):
+            yield
+
+
+@contextlib.contextmanager
+def profile_run(
+    kind: str, output: str, top: int = 25, stream: Optional[TextIO] = None
+) -> Iterator[None]:
+    """
+    Profile the enclosed run, then save and print the report.
+
+    kind is "cpu" or "mem"; output is the path of the report without its
+    extension. The report is also saved when the run exits with an error.
+    It is printed to stream, standard output by default.
+    """
+    global _active
+    profiler = CpuProfiler(top) if kind == "cpu" else MemoryProfiler(top)
+    _active = profiler
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        _active = None
+        paths = profiler.save(Path(output))
+        stream = stream or sys.stdout
+        print(f"\n{profiler.report()}", file=stream)
+        for path in paths:
+            print(f"📊 Profile written to: {path}", file=stream)
+
+
+@dataclass
+class StageReport:
+    """What a stage of the run cost."""
+
+    name: str
+    seconds: float
+    peak_bytes: int = 0
+    held_bytes: int = 0
+    top_allocations: List[Any] = field(default_factory=list)
+
+
+class Profiler(ABC):
+    """Base of the profilers, timing the stages of the run."""
+
+    def __init__(self, top: int):
+        """Initialize the profiler, showing the top entries of each ranking."""
+        self.top = top
+        self.stages: List[StageReport] = []
+        self.started = 0.0
+        self.seconds = 0.0
+
+    def start(self) -> None:
+        """Start profiling."""
+        self.started = time.perf_counter()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        self.seconds = time.perf_counter() - self.started
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage of the run."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append(StageReport(name, time.perf_counter() - started))
+
+    def save(self, output: Path) -> List[Path]:
+        """Write the profile files; return their paths."""
+        output.parent.mkdir(parents=True, exist_ok=True)
+        report_path = output.with_suffix(".txt")
+        report_path.write_text(self.report() + "\n", encoding="utf-8")
+        return [report_path]
+
+    @abstractmethod
+    def report(self) -> str:
+        """Human-readable summary of the profile."""
+        pass
+
+
+class CpuProfiler(Profiler):
+    """
+    cProfile of the run, including the worker threads it starts.
+
+    Each thread gets its own profiler, merged into a single pstats dump.
+    """
+
+    def __init__(self, top: int):
+        """Initialize the profiler."""
+        super().__init__(top)
+        self._profiles: List[Any] = []
+        self._lock = threading.Lock()
+        self._stats: Any = None
+
+    def start(self) -> None:
+        """Profile the current thread and the threads started from now on."""
+        import cProfile
+
+        super().start()
+        threading.setprofile(self._profile_thread)
+        profile = cProfile.Profile()
+        self._profiles.append(profile)
+        profile.enable()
+
+    def stop(self) -> None:
+        """Stop profiling and merge the profiles of every thread."""
+        import pstats
+
+        threading.setprofile(None)
+        main_profile = self._profiles[0]
+        main_profile.disable()
+        super().stop()
+
+        self._stats = pstats.Stats(main_profile)
+        for profile in self._profiles[1:]:
+            self._stats.add(profile)
+
+    def save(self, output: Path) -> List[Path]:
+        """Write the pstats dump and the summary."""
+        paths = super().save(output)
+        dump_path = output.with_suffix(".prof")
+        self._stats.dump_stats(str(dump_path))
+        return [dump_path] + paths
+
+    def report(self) -> str:
+        """Stage timings and the functions with the highest own time."""
+        import io
+
+        lines = [f"🔥 CPU profile ({self.seconds:.2f}s)"]
+        lines.extend(f"   {s.name}: {s.seconds:.2f}s" for s in self.stages)
+
+        stream = io.StringIO()
+        self._stats.stream = stream
+        self._stats.sort_stats("tottime").print_stats(self.top)
+        self._stats.stream = sys.stdout
+        summary = stream.getvalue()
+        # Skip the header naming the temporary profile files
+        summary = summary[summary.find("   ncalls") :]
+        lines.append(f"\nTop {self.top} functions by own time:\n{summary.rstrip()}")
+        return "\n".join(lines)
+
+    def _profile_thread(self, frame: Any, event: str, arg: Any) -> None:
+        """Start a profiler in a new thread, on its first profiling event."""
+        import cProfile
+
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+: the profiler of the main thread sees every thread
+            return
+        with self._lock:
+            self._profiles.append(profile)
+
+
+class MemoryProfiler(Profiler):
+    """tracemalloc of the run: peak memory and top allocation sites per stage."""
+
+    def __init__(self, top: int):
+        """Initialize the profiler."""
+        super().__init__(top)
+        self.peak_bytes = 0
+
+    def start(self) -> None:
+        """Start tracing allocations."""
+        import tracemalloc
+
+        super().start()
+        tracemalloc.start()
+
+    def stop(self) -> None:
+        """Stop tracing allocations."""
+        import tracemalloc
+
+        # Stages reset the peak, keep the highest one
+        self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        super().stop()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure the peak of a stage and the allocations it still holds."""
+        import tracemalloc
+
+        tracemalloc.reset_peak()
+        before = self._snapshot()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            self.peak_bytes = max(self.peak_bytes, peak)
+            after = self._snapshot()
+            allocations = [
+                stat for stat in after.compare_to(before, "lineno") if stat.size_diff
+            ]
+            self.stages.append(
+                StageReport(
+                    name,
+                    seconds,
+                    peak_bytes=peak,
+                    held_bytes=sum(stat.size_diff for stat in allocations),
+                    top_allocations=allocations[: self.top],
+                )
+            )
+
+    def report(self) -> str:
+        """Peak memory, then each stage with its top allocation sites."""
+        lines = [f"🧠 Memory profile: peak {_format_size(self.peak_bytes)}"]
+        for report in self.stages:
+            lines.append(
+                f"\n   {report.name}: {report.seconds:.2f}s, "
+                f"peak {_format_size(report.peak_bytes)}, "
+                f"{_format_size(report.held_bytes, sign=True)} held at the end"
+            )
+            for stat in report.top_allocations:
+                frame = stat.traceback[0]
+                lines.append(
+                    f"      {_format_size(stat.size_diff, sign=True):>12}"
+                    f"  {stat.count_diff:>+9} blocks  {frame.filename}:{frame.lineno}"
+                )
+        return "\n".join(lines)
+
+    def _snapshot(self) -> Any:
+        """Snapshot of the traced allocations, without tracemalloc's own."""
+        import tracemalloc
+
+        return tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+
+
+def _format_size(size: int, sign: bool = False) -> str:
+    """Format a size in bytes for humans."""
+    prefix = ("+" if size >= 0 else "-") if sign else ""
+    size = abs(size)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{prefix}{size:.1f} {unit}"
+        size /= 1024
+    return f"{prefix}{size:.1f} GiB"
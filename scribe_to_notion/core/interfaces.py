@@ -1,9 +1,9 @@
 """Core interfaces for external dependencies."""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from .models import Clipping
+from .models import Book, Clipping
 
 
 class ClippingRepository(ABC):
@@ -14,6 +14,19 @@ class ClippingRepository(ABC):
         """Get clippings from a source (file path, URL, etc.)."""
         pass
 
+    def iter_clippings(self, source: str) -> Iterator[Clipping]:
+        """Yield clippings from a source as they are parsed."""
+        yield from self.get_clippings(source)
+
+
+class IncrementalClippingRepository(ClippingRepository):
+    """Interface for sources that can be read from where the last read stopped."""
+
+    @abstractmethod
+    def get_new_clippings(self, source: str, offset: int) -> Tuple[List[Clipping], int]:
+        """Get the clippings added after offset, and the offset to resume from."""
+        pass
+
 
 class PagePublisherRepository(ABC):
     """Interface for publishing pages to any system (Notion, Obsidian, etc.)."""
@@ -23,6 +36,11 @@ class PagePublisherRepository(ABC):
         """Create a new page and return its ID."""
         pass
 
+    @abstractmethod
+    def append_content(self, page_id: str, content: str) -> None:
+        """Append content at the end of an existing page."""
+        pass
+
     @abstractmethod
     def get_page_content(self, page_id: str) -> Optional[str]:
         """Get the content of a page as a string."""
@@ -33,7 +51,27 @@ class PagePublisherRepository(ABC):
         """Check if a page exists."""
         pass
 
+    def pages_exist(self, page_ids: Iterable[str]) -> Dict[str, bool]:
+        """Check which of several pages exist, by page ID."""
+        return {page_id: self.page_exists(page_id) for page_id in page_ids}
+
     @abstractmethod
     def delete_page(self, page_id: str) -> bool:
         """Delete a page."""
         pass
+
+    def flush(self) -> None:
+        """Wait until the pages created or appended to are stored."""
+
+
+class RowPublisherRepository(ABC):
+    """Interface for publishing books as rows of a database (Notion, etc.)."""
+
+    @abstractmethod
+    def upsert_books(self, database_id: str, books: List[Book]) -> Dict[str, str]:
+        """Create or update one row per book and return row IDs by book title."""
+        pass
+
+    def count_requests(self, book: Book) -> int:
+        """Number of requests upserting the rows of a book."""
+        return 1
@@ -1,7 +1,26 @@
 """Core domain models for Scribe clippings."""
 
-from dataclasses import dataclass
-from typing import Optional
+import hashlib
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+# Month names used in French clipping dates ("dimanche 18 mai 2025 12:34:30")
+FRENCH_MONTHS = {
+    "janvier": 1,
+    "février": 2,
+    "mars": 3,
+    "avril": 4,
+    "mai": 5,
+    "juin": 6,
+    "juillet": 7,
+    "août": 8,
+    "septembre": 9,
+    "octobre": 10,
+    "novembre": 11,
+    "décembre": 12,
+}
 
 
 @dataclass
@@ -15,6 +34,7 @@ class Clipping:
     location: Optional[str]
     date: str  # Keep the original French date string
     content: str
+    notes: List["Clipping"] = field(default_factory=list, repr=False)
 
     def __post_init__(self):
         """Clean up the data after initialization."""
@@ -29,3 +49,60 @@ class Clipping:
             self.page = self.page.strip()
         if self.location:
             self.location = self.location.strip()
+
+    @property
+    def added_at(self) -> Optional[datetime]:
+        """Parse the French date string, or None if it cannot be parsed."""
+        match = re.search(
+            r"(\d{1,2}) (\w+) (\d{4}) (\d{1,2}):(\d{2}):(\d{2})", self.date
+        )
+        if not match:
+            return None
+
+        day, month_name, year, hour, minute, second = match.groups()
+        month = FRENCH_MONTHS.get(month_name.lower())
+        if month is None:
+            return None
+
+        try:
+            return datetime(
+                int(year), month, int(day), int(hour), int(minute), int(second)
+            )
+        except ValueError:
+            return None
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable identity of the clipping within its book, whatever the device."""
+        content = " ".join(self.content.split())
+        if content:
+            parts = [self.clipping_type, content]
+        else:
+            # Bookmarks have no content, their position is their identity
+            parts = [self.clipping_type, self.page or "", self.location or ""]
+        return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Book:
+    """A book with its highlights, in reading order."""
+
+    title: str
+    author: Optional[str]
+    clippings: List[Clipping]  # Highlights with their notes, and orphan notes
+
+    @property
+    def highlights(self) -> List[Clipping]:
+        """Highlights of the book."""
+        return [c for c in self.clippings if c.clipping_type == "surlignement"]
+
+    @property
+    def highlight_count(self) -> int:
+        """Number of highlights in the book."""
+        return len(self.highlights)
+
+    @property
+    def last_highlight_at(self) -> Optional[datetime]:
+        """Date of the most recent highlight, if any date could be parsed."""
+        dates = [d for d in (h.added_at for h in self.highlights) if d is not None]
+        return max(dates) if dates else None
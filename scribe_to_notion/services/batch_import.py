@@ -0,0 +1,174 @@
+"""Concurrent imports of several accounts, read from a manifest."""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .import_service import ImportService
+from .rate_limiter import RateLimiter
+
+
+@dataclass
+class BatchJob:
+    """The import of the clippings of one account to one parent page."""
+
+    name: str
+    sources: List[str]
+    # Kept out of the repr, which ends up in logs and tracebacks
+    api_token: str = field(repr=False)
+    parent_page_id: str
+
+
+@dataclass
+class BatchJobResult:
+    """Outcome of a job: the pages it created, or why it failed."""
+
+    job: BatchJob
+    pages: Dict[str, List[str]] = field(default_factory=dict)
+    requests: int = 0
+    seconds: float = 0.0
+    error: Optional[Exception] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether every book of the job was published."""
+        return self.error is None
+
+
+def load_manifest(path: str, default_token: Optional[str] = None) -> List[BatchJob]:
+    """
+    Read the jobs of a JSON manifest.
+
+    The manifest holds a "jobs" list; each job has a "parent_page_id", one
+    or several "clippings" paths (relative to the manifest) and either a
+    "token", or a "token_env" variable holding it. Jobs without either use
+    default_token. Raises ValueError for an invalid manifest.
+    """
+    manifest_path = Path(path)
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except ValueError as e:
+        raise ValueError(f"Invalid manifest {path}: {e}")
+
+    entries = manifest.get("jobs") if isinstance(manifest, dict) else None
+    if not entries:
+        raise ValueError(f"Manifest {path} has no jobs")
+
+    jobs: List[BatchJob] = []
+    for number, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Job {number} must be an object")
+        parent_page_id = entry.get("parent_page_id")
+        clippings = entry.get("clippings")
+        if not parent_page_id or not clippings:
+            raise ValueError(f"Job {number} needs a parent_page_id and clippings")
+        name = entry.get("name") or parent_page_id
+
+        api_token = entry.get("token")
+        if not api_token and entry.get("token_env"):
+            api_token = os.getenv(entry["token_env"])
+        api_token = api_token or default_token
+        if not api_token:
+            raise ValueError(f"Job {name} has no Notion API token")
+
+        if isinstance(clippings, str):
+            clippings = [clippings]
+        sources = [str(manifest_path.parent / source) for source in clippings]
+        jobs.append(BatchJob(name, sources, api_token, parent_page_id))
+
+    # Two concurrent imports to the same page would duplicate its books
+    for attribute in ("name", "parent_page_id"):
+        values = [getattr(job, attribute) for job in jobs]
+        duplicates = sorted({value for value in values if values.count(value) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate {attribute} in manifest: {duplicates[0]}")
+    return jobs
+
+
+class BatchImportRunner:
+    """
+    Run the imports of several accounts concurrently, in one process.
+
+    Up to max_jobs jobs run at once, each publishing with its own import
+    service. The Notion rate limit applies per integration token, so each
+    token gets its own bucket of rate_limit requests per second, shared by
+    the jobs using it: throughput grows with the number of accounts. A
+    failing job does not stop the others.
+    """
+
+    def __init__(
+        self,
+        create_service: Callable[[BatchJob, RateLimiter], ImportService],
+        max_jobs: int = 4,
+        rate_limit: float = 3.0,
+        expand_sources: Optional[Callable[[List[str]], List[str]]] = None,
+    ):
+        """
+        Initialize the runner.
+
+        create_service builds the import service of a job, publishing with
+        its token and waiting for the given rate limiter. expand_sources, if
+        any, turns the sources of a job into clippings files.
+        """
+        self.create_service = create_service
+        self.max_jobs = max_jobs
+        self.rate_limit = rate_limit
+        self.expand_sources = expand_sources
+
+    def run(
+        self,
+        jobs: List[BatchJob],
+        on_result: Optional[Callable[[BatchJobResult], None]] = None,
+    ) -> List[BatchJobResult]:
+        """
+        Run the jobs and return their results, in the order of the jobs.
+
+        on_result, if any, is called with each result as its job finishes.
+        """
+        limiters: Dict[str, RateLimiter] = {}
+        for job in jobs:
+            if job.api_token not in limiters:
+                limiters[job.api_token] = RateLimiter(self.rate_limit)
+
+        results: Dict[int, BatchJobResult] = {}
+        with ThreadPoolExecutor(max_workers=max(1, self.max_jobs)) as executor:
+            futures = {
+                executor.submit(self._run_job, job, limiters[job.api_token]): index
+                for index, job in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if on_result is not None:
+                    on_result(result)
+
+        return [results[index] for index in range(len(jobs))]
+
+    def _run_job(self, job: BatchJob, rate_limiter: RateLimiter) -> BatchJobResult:
+        """Import the clippings of a job, capturing its failure."""
+        result = BatchJobResult(job)
+        started = time.monotonic()
+        service = None
+        try:
+            sources = job.sources
+            if self.expand_sources is not None:
+                sources = self.expand_sources(sources)
+                if not sources:
+                    raise FileNotFoundError(
+                        f"No clippings file found in: {', '.join(job.sources)}"
+                    )
+            service = self.create_service(job, rate_limiter)
+            result.pages = service.import_clippings(sources, job.parent_page_id)
+        except Exception as e:
+            result.error = e
+            # An interrupted journal is kept to resume the job
+            if service is not None and service.journal is not None:
+                service.journal.close()
+        if service is not None and service.last_schedule is not None:
+            result.requests = service.last_schedule.requests
+        result.seconds = time.monotonic() - started
+        return result
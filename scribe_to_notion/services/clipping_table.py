@@ -0,0 +1,231 @@
+"""Columnar container of clippings, for planning very large archives."""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..core.models import Clipping
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, ImportService falls back to lists
+    np = None
+
+CLIPPING_TYPES = ("surlignement", "note", "signet", "unknown")
+
+
+class ClippingTable:
+    """
+    Clippings stored as NumPy columns.
+
+    Book titles are interned into integer IDs, pages, locations and dates are
+    parsed once per distinct string, and the Clipping objects are kept in a
+    side list. Filtering, joining, grouping and sorting then run as vectorized
+    array operations and return indices into that list.
+    """
+
+    def __init__(
+        self,
+        clippings: List[Clipping],
+        page_key: Callable[[str], int],
+        range_key: Optional[
+            Callable[[Optional[str]], Optional[Tuple[int, int]]]
+        ] = None,
+    ):
+        """
+        Build the columns.
+
+        page_key turns a page string into its sort key, range_key turns a page
+        or location string into a (start, end) range, used to join notes.
+        """
+        if np is None:
+            raise ImportError("ClippingTable requires NumPy (pip install numpy)")
+
+        self.clippings = clippings
+        self.book_titles: List[str] = []
+
+        book_ids: Dict[str, int] = {}
+        page_keys: Dict[str, int] = {}
+        type_codes = {name: code for code, name in enumerate(CLIPPING_TYPES)}
+        unknown = type_codes["unknown"]
+
+        def intern_book(title: str) -> int:
+            book_id = book_ids.get(title)
+            if book_id is None:
+                book_id = book_ids[title] = len(self.book_titles)
+                self.book_titles.append(title)
+            return book_id
+
+        def parse_page(page: Optional[str]) -> int:
+            page = page or ""
+            key = page_keys.get(page)
+            if key is None:
+                key = page_keys[page] = page_key(page)
+            return key
+
+        count = len(clippings)
+        self.book_ids = np.fromiter(
+            (intern_book(c.book_title) for c in clippings), dtype=np.int64, count=count
+        )
+        self.type_codes = np.fromiter(
+            (type_codes.get(c.clipping_type, unknown) for c in clippings),
+            dtype=np.int8,
+            count=count,
+        )
+        self.page_keys = np.fromiter(
+            (parse_page(c.page) for c in clippings), dtype=np.int64, count=count
+        )
+        self.range_key = range_key
+        self._ranges: Dict[str, Tuple["np.ndarray", "np.ndarray"]] = {}
+
+    @staticmethod
+    def is_available() -> bool:
+        """Whether NumPy is installed."""
+        return np is not None
+
+    def __len__(self) -> int:
+        """Number of clippings in the table."""
+        return len(self.clippings)
+
+    def indices_of_type(self, clipping_type: str) -> "np.ndarray":
+        """Indices of the clippings of a type, in table order."""
+        code = CLIPPING_TYPES.index(clipping_type)
+        return np.flatnonzero(self.type_codes == code)
+
+    def take(self, indices: Sequence[int]) -> List[Clipping]:
+        """Clippings at the given indices."""
+        clippings = self.clippings
+        return [clippings[i] for i in np.asarray(indices).tolist()]
+
+    def ranges(self, field_name: str) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(starts, ends) columns of the page or location field, -1 when missing."""
+        if field_name not in self._ranges:
+            if self.range_key is None:
+                raise ValueError("ClippingTable needs a range_key to parse ranges")
+
+            parsed: Dict[Optional[str], Tuple[int, int]] = {}
+
+            def parse_range(value: Optional[str]) -> Tuple[int, int]:
+                bounds = parsed.get(value)
+                if bounds is None:
+                    bounds = parsed[value] = self.range_key(value) or (-1, -1)
+                return bounds
+
+            bounds = [parse_range(getattr(c, field_name)) for c in self.clippings]
+            columns = np.array(bounds, dtype=np.int64).reshape(-1, 2)
+            self._ranges[field_name] = (columns[:, 0], columns[:, 1])
+        return self._ranges[field_name]
+
+    def attach_notes(
+        self, highlight_indices: Sequence[int], note_indices: Sequence[int]
+    ) -> "np.ndarray":
+        """
+        Attach each note to the highlight it annotates; return orphan note indices.
+
+        Same rule as ImportService._attach_notes: the last highlight of the book,
+        in (start, table order), covering the note location, or its page when
+        the note has no location. Highlights are sorted once on a (book, start)
+        key and notes are resolved with a single vectorized binary search per
+        field, then a vectorized descent of a sparse table of highlight ends:
+        logarithmic per note, however long the highlights before it.
+        """
+        highlight_indices = np.asarray(highlight_indices, dtype=np.int64)
+        note_indices = np.asarray(note_indices, dtype=np.int64)
+        matches = np.full(len(note_indices), -1, dtype=np.int64)
+
+        # Notes with a location are only matched by location
+        note_locations = self.ranges("location")[0][note_indices]
+        for field_name, selected in (
+            ("location", note_locations >= 0),
+            ("page", note_locations < 0),
+        ):
+            starts, ends = self.ranges(field_name)
+            highlights = highlight_indices[starts[highlight_indices] >= 0]
+            pending = np.flatnonzero(selected & (starts[note_indices] >= 0))
+            notes = note_indices[pending]
+            if not len(highlights) or not len(notes):
+                continue
+
+            # Highlights sorted on a (book, start) composite key; ends use the
+            # same scale, so their running max never crosses a book
+            scale = int(max(ends[highlights].max(), starts[notes].max())) + 1
+            keys = self.book_ids[highlights] * scale + starts[highlights]
+            order = np.argsort(keys, kind="stable")
+            keys, highlights = keys[order], highlights[order]
+            end_keys = self.book_ids[highlights] * scale + ends[highlights]
+            maxima = _window_maxima(end_keys)
+
+            targets = self.book_ids[notes] * scale + starts[notes]
+            candidates = np.searchsorted(keys, targets, "right") - 1
+            found = candidates >= 0
+            candidates = np.where(found, candidates, 0)
+            found &= maxima[-1][candidates] >= targets
+            pending, targets, candidates = (
+                pending[found],
+                targets[found],
+                candidates[found],
+            )
+
+            # Skip back over highlights ending before the note, in windows of
+            # halving widths: a covering highlight exists before them
+            for level in range(len(maxima) - 1, -1, -1):
+                before = maxima[level][candidates] < targets
+                candidates -= before * (1 << level)
+            matches[pending] = highlights[candidates]
+
+        clippings = self.clippings
+        for note, highlight in zip(note_indices.tolist(), matches.tolist()):
+            if highlight >= 0:
+                clippings[highlight].notes.append(clippings[note])
+        return note_indices[matches < 0]
+
+    def group_by_book(self, *index_arrays: Sequence[int]) -> Dict[str, List[Clipping]]:
+        """
+        Group the selected clippings by book, each group sorted by page.
+
+        Books come in the order of their first selected clipping, and clippings
+        on the same page keep their selection order, exactly like grouping
+        lists and sorting them with a stable sort.
+        """
+        if not index_arrays:
+            return {}
+        indices = np.concatenate([np.asarray(a, dtype=np.int64) for a in index_arrays])
+        if not len(indices):
+            return {}
+
+        # Rank books by their first selected clipping
+        books = self.book_ids[indices]
+        book_ids, first_seen = np.unique(books, return_index=True)
+        rank = np.empty(len(self.book_titles), dtype=np.int64)
+        rank[book_ids] = np.argsort(np.argsort(first_seen, kind="stable"))
+        book_ranks = rank[books]
+
+        # One stable sort on a (book rank, page) composite key
+        pages = self.page_keys[indices]
+        pages = pages - pages.min()
+        order = np.argsort(book_ranks * (int(pages.max()) + 1) + pages, kind="stable")
+        sorted_indices = indices[order]
+        boundaries = np.flatnonzero(np.diff(book_ranks[order])) + 1
+
+        return {
+            self.book_titles[self.book_ids[group[0]]]: self.take(group)
+            for group in np.split(sorted_indices, boundaries)
+        }
+
+
+def _window_maxima(values: "np.ndarray") -> List["np.ndarray"]:
+    """
+    Sparse table of the maxima of values, like ImportService's.
+
+    Level k holds, at each index, the max of the 2**k values ending there
+    (fewer at the start), so the last level is the running max.
+    """
+    levels = [values]
+    width = 1
+    while width < len(values):
+        previous = levels[-1]
+        levels.append(
+            np.concatenate(
+                (previous[:width], np.maximum(previous[width:], previous[:-width]))
+            )
+        )
+        width *= 2
+    return levels
@@ -0,0 +1,133 @@
+"""Write-ahead journal making multi-request page imports resumable."""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class BookProgress:
+    """What was already sent for a book."""
+
+    page_id: str
+    plan: str  # Digest of the batches planned for the book
+    batches_done: int  # Batch 0 is sent with the page creation
+    completed: bool = False
+
+
+class ImportJournal:
+    """
+    Append-only JSON lines journal of the requests completed during an import.
+
+    Each record is flushed and fsynced once its request succeeded, so after a
+    crash or a fatal error a new run with the same journal skips the pages and
+    batches already sent. The journal is removed once the import completes.
+    Records may be written by concurrent publishing workers, one book each.
+    """
+
+    def __init__(self, path: str):
+        """Open the journal, replaying the records of an interrupted import."""
+        self.path = Path(path)
+        self.parent_page_id: Optional[str] = None
+        self.books: Dict[str, BookProgress] = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            self._replay()
+
+    @property
+    def resuming(self) -> bool:
+        """Whether an interrupted import was found in the journal."""
+        return self.parent_page_id is not None
+
+    def start(self, parent_page_id: str) -> None:
+        """Start or resume an import to the given parent page."""
+        if self.parent_page_id is None:
+            self._write({"event": "started", "parent_page_id": parent_page_id})
+            self.parent_page_id = parent_page_id
+        elif self.parent_page_id != parent_page_id:
+            raise ValueError(
+                f"Journal {self.path} belongs to an import to parent page "
+                f"{self.parent_page_id}; delete it to start a new import"
+            )
+
+    def progress(self, book_title: str, plan: str) -> Optional[BookProgress]:
+        """Progress of a book, checking that its planned batches did not change."""
+        progress = self.books.get(book_title)
+        if progress is not None and progress.plan != plan:
+            raise ValueError(
+                f"Clippings of '{book_title}' changed since the interrupted import; "
+                f"delete {self.path} to start a new import"
+            )
+        return progress
+
+    def record_page_created(self, book_title: str, page_id: str, plan: str) -> None:
+        """Record that the page of a book was created with its first batch."""
+        self._write(
+            {
+                "event": "page_created",
+                "book": book_title,
+                "page_id": page_id,
+                "plan": plan,
+            }
+        )
+        self.books[book_title] = BookProgress(page_id, plan, batches_done=1)
+
+    def record_batch_appended(self, book_title: str, batch: int) -> None:
+        """Record that a batch was appended to the page of a book."""
+        self._write({"event": "batch_appended", "book": book_title, "batch": batch})
+        self.books[book_title].batches_done = batch + 1
+
+    def record_book_completed(self, book_title: str) -> None:
+        """Record that every batch of a book was sent."""
+        self._write({"event": "book_completed", "book": book_title})
+        self.books[book_title].completed = True
+
+    def complete(self) -> None:
+        """Close and remove the journal, the import needs no resuming."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+        self.parent_page_id = None
+        self.books = {}
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Append a record and make sure it reached the disk."""
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _replay(self) -> None:
+        """Rebuild the progress of each book from the records."""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A record torn by a crash, its request is sent again
+                    continue
+
+                event = record.get("event")
+                if event == "started":
+                    self.parent_page_id = record["parent_page_id"]
+                elif event == "page_created":
+                    self.books[record["book"]] = BookProgress(
+                        record["page_id"], record["plan"], batches_done=1
+                    )
+                elif event == "batch_appended":
+                    self.books[record["book"]].batches_done = record["batch"] + 1
+                elif event == "book_completed":
+                    self.books[record["book"]].completed = True
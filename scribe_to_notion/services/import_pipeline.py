@@ -0,0 +1,265 @@
+"""Pipelined import: publishing starts while the source is still being parsed."""
+
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from ..core.models import Clipping
+from .publish_scheduler import ScheduleReport
+
+if TYPE_CHECKING:
+    from .import_service import ImportService
+
+# Marks the end of a queue
+_DONE = object()
+
+
+class _PublishLane(threading.Thread):
+    """
+    Worker publishing the batches of the books assigned to it, in order.
+
+    Each book is published by a single lane, so its page is created before
+    its batches are appended, in the order they were queued. A failing book
+    stops the whole import only when the service fails fast.
+    """
+
+    def __init__(self, service: "ImportService", parent_page_id: str, size: int):
+        """Initialize the lane with a bounded queue of batches."""
+        super().__init__(daemon=True)
+        self.service = service
+        self.parent_page_id = parent_page_id
+        self.batches: "queue.Queue[Any]" = queue.Queue(maxsize=size)
+        self.pages: Dict[str, str] = {}
+        self.requests: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self.failures: Dict[str, BaseException] = {}
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        """Publish queued batches until the end marker."""
+        while True:
+            item = self.batches.get()
+            if item is _DONE:
+                return
+
+            # After a failure, keep draining so producers never block
+            if self.error is not None:
+                continue
+
+            # The next batches of a failed book are dropped, other books go on
+            book_title, content = item
+            if book_title in self.failures:
+                continue
+
+            batch = self.requests.get(book_title, 0)
+            started = time.monotonic()
+            try:
+                self.service._wait_for_rate_limit()
+                sent = time.monotonic()
+                page_id = self.pages.get(book_title)
+                if page_id is None:
+                    self.pages[book_title] = self.service.page_publisher.create_page(
+                        parent_id=self.parent_page_id, title=book_title, content=content
+                    )
+                    self.service._emit_request(book_title, "create", batch, sent)
+                else:
+                    self.service.page_publisher.append_content(page_id, content)
+                    self.service._emit_request(book_title, "append", batch, sent)
+            except BaseException as e:
+                self.failures[book_title] = e
+                if self.service.fail_fast:
+                    self.error = e
+            self.requests[book_title] = batch + 1
+            self.seconds[book_title] = (
+                self.seconds.get(book_title, 0.0) + time.monotonic() - started
+            )
+
+            # Like page_created, timed over every batch sent for the book
+            if book_title in self.failures:
+                self.service._emit(
+                    "page_failed",
+                    book=book_title,
+                    error=str(self.failures[book_title]),
+                    seconds=self.seconds[book_title],
+                )
+
+
+class ImportPipeline:
+    """
+    Producer/consumer import connecting a streaming parser to publishers.
+
+    A parser thread feeds clippings through a bounded queue. Each book has an
+    append-only buffer; once it holds a full batch of highlights, the batch
+    is sent to the publishing lane of the book while parsing goes on. Full
+    queues block the stage feeding them, so memory stays bounded whatever
+    the source size.
+
+    Pages are built batch by batch: highlights are sorted by page within a
+    batch, and batches follow the order of the source. Notes are attached to
+    highlights of the same batch. Without fail_fast, a failing book does not
+    stop the others; failures are listed in the last_schedule of the service.
+    """
+
+    def __init__(self, service: "ImportService", queue_size: int = 1000):
+        """Initialize the pipeline on top of an import service."""
+        self.service = service
+        self.queue_size = queue_size
+
+    def run(
+        self, clippings_source: Union[str, Sequence[str]], parent_page_id: str
+    ) -> Dict[str, List[str]]:
+        """Import the source, returning page IDs by book title in source order."""
+        started = time.monotonic()
+        sources = (
+            [clippings_source]
+            if isinstance(clippings_source, str)
+            else list(clippings_source)
+        )
+        clippings: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        parser = threading.Thread(
+            target=self._parse, args=(sources, clippings, stop), daemon=True
+        )
+
+        workers = max(1, self.service.scheduler.max_workers)
+        lanes = [_PublishLane(self.service, parent_page_id, 4) for _ in range(workers)]
+        for lane in lanes:
+            lane.start()
+        parser.start()
+
+        book_lanes: Dict[str, _PublishLane] = {}
+        buffers: Dict[str, List[Clipping]] = {}
+        highlight_counts: Dict[str, int] = {}
+        error: Optional[BaseException] = None
+
+        try:
+            while True:
+                item = clippings.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                if any(lane.error for lane in lanes):
+                    break
+
+                book_title = item.book_title
+                if book_title not in book_lanes:
+                    book_lanes[book_title] = lanes[len(book_lanes) % len(lanes)]
+                    buffers[book_title] = []
+                    highlight_counts[book_title] = 0
+
+                # Flush on the next highlight, so notes following the last
+                # highlight of a batch stay with it
+                if item.clipping_type == "surlignement":
+                    if highlight_counts[book_title] >= self.service.batch_size:
+                        self._flush(book_title, buffers, book_lanes)
+                        highlight_counts[book_title] = 0
+                    highlight_counts[book_title] += 1
+                buffers[book_title].append(item)
+
+            for book_title in list(buffers):
+                self._flush(book_title, buffers, book_lanes)
+        except BaseException as e:
+            error = e
+        finally:
+            stop.set()
+            for lane in lanes:
+                lane.batches.put(_DONE)
+            for lane in lanes:
+                lane.join()
+
+        error = error or next((lane.error for lane in lanes if lane.error), None)
+        if error is not None:
+            raise error
+        self.service.page_publisher.flush()
+
+        # Pipelined imports are not planned, nothing was estimated
+        failures: Dict[str, BaseException] = {}
+        for lane in lanes:
+            failures.update(lane.failures)
+        self.service.last_schedule = ScheduleReport(
+            workers=workers,
+            requests=sum(sum(lane.requests.values()) for lane in lanes),
+            estimated_seconds=0.0,
+            actual_seconds=time.monotonic() - started,
+            order=list(book_lanes),
+            failures=failures,
+        )
+
+        results = {}
+        for book_title, lane in book_lanes.items():
+            if book_title in lane.pages and book_title not in failures:
+                results[book_title] = [lane.pages[book_title]]
+                self.service._emit(
+                    "page_created",
+                    book=book_title,
+                    page_id=lane.pages[book_title],
+                    requests=lane.requests[book_title],
+                    seconds=lane.seconds[book_title],
+                )
+        return results
+
+    def _parse(
+        self,
+        sources: List[str],
+        clippings: "queue.Queue[Any]",
+        stop: threading.Event,
+    ) -> None:
+        """
+        Parse the sources into the queue, dropping cross-device duplicates.
+
+        Like ImportService._merge_clippings, only clippings already found in
+        an earlier source are dropped.
+        """
+        seen: Set[Tuple[str, str]] = set()
+        try:
+            for source in sources:
+                source_keys: Set[Tuple[str, str]] = set()
+                for clipping in self.service._track_parsing(
+                    source, self.service.clipping_repo.iter_clippings(source)
+                ):
+                    if clipping.clipping_type not in ("surlignement", "note"):
+                        continue
+                    key = (clipping.book_title, clipping.fingerprint)
+                    if key in seen:
+                        continue
+                    source_keys.add(key)
+                    if not self._put(clippings, clipping, stop):
+                        return
+                seen |= source_keys
+            self._put(clippings, _DONE, stop)
+        except BaseException as e:
+            self._put(clippings, e, stop)
+
+    def _put(self, items: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+        """Put an item, waiting for room unless the pipeline stopped."""
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _flush(
+        self,
+        book_title: str,
+        buffers: Dict[str, List[Clipping]],
+        book_lanes: Dict[str, _PublishLane],
+    ) -> None:
+        """Send the buffered clippings of a book as one batch."""
+        buffer = buffers[book_title]
+        if not buffer:
+            return
+        buffers[book_title] = []
+        self.service._index_clippings(buffer)
+
+        highlights = [c for c in buffer if c.clipping_type == "surlignement"]
+        notes = [c for c in buffer if c.clipping_type == "note"]
+        orphan_notes = self.service._attach_notes(highlights, notes)
+        batch = self.service._sort_by_page(highlights + orphan_notes)
+
+        book_lanes[book_title].batches.put(
+            (book_title, self.service._format_content(batch))
+        )
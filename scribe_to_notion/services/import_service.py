@@ -1,48 +1,388 @@
 """Service for importing clippings to any page publishing system."""
 
-from typing import List, Dict
+import hashlib
+import math
+import re
+import time
+from bisect import bisect_right
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Dict,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-from ..core.interfaces import PagePublisherRepository, ClippingRepository
-from ..core.models import Clipping
+from ..core.interfaces import (
+    PagePublisherRepository,
+    ClippingRepository,
+    RowPublisherRepository,
+)
+from ..core.models import Book, Clipping
+from .import_journal import ImportJournal
+from .publish_scheduler import PublishJob, PublishScheduler, ScheduleReport
+from .rate_limiter import RateLimiter
+from .search_index import SearchIndex
+
+# Sorted (starts, window maxima of ends, highlights) columns for one book and
+# position field, see _window_maxima
+_PositionIndex = Tuple[List[int], List[List[int]], List[Clipping]]
+
+# Clippings parsed between two parse_progress events
+PARSE_PROGRESS_INTERVAL = 10_000
 
 
 class ImportService:
     """Service for importing clippings to any page publishing system."""
 
     def __init__(
-        self, page_publisher: PagePublisherRepository, clipping_repo: ClippingRepository
+        self,
+        page_publisher: Union[PagePublisherRepository, RowPublisherRepository],
+        clipping_repo: ClippingRepository,
+        columnar_threshold: int = 10_000,
+        batch_size: int = 100,
+        journal: Optional[ImportJournal] = None,
+        max_workers: int = 1,
+        rate_limiter: Optional[RateLimiter] = None,
+        search_index: Optional[SearchIndex] = None,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        fail_fast: bool = True,
     ):
-        """Initialize the import service with dependencies."""
+        """
+        Initialize the import service with dependencies.
+
+        From columnar_threshold clippings on, books are planned with a NumPy
+        ClippingTable when NumPy is installed. Pages are sent batch_size
+        clippings per request; with a journal, each completed request is
+        recorded so an interrupted import can be resumed. Books are published
+        by max_workers workers, largest first, and every request waits for
+        the rate limiter, if any. Parsed highlights and notes are added to
+        the search index, if any.
+
+        on_event, if any, is called with the name and fields of each step of
+        an import (source parsed, book planned, request sent, page created or
+        failed), possibly from worker threads. Without fail_fast, a failing
+        book does not stop the others; failures are listed in last_schedule.
+        """
         self.page_publisher = page_publisher
         self.clipping_repo = clipping_repo
+        self.columnar_threshold = columnar_threshold
+        self.batch_size = batch_size
+        self.journal = journal
+        self.rate_limiter = rate_limiter
+        self.scheduler = PublishScheduler(max_workers, rate_limiter)
+        self.last_schedule: Optional[ScheduleReport] = None
+        self.search_index = search_index
+        self.on_event = on_event
+        self.fail_fast = fail_fast
 
     def import_clippings(
-        self, clippings_source: str, parent_page_id: str
+        self, clippings_source: Union[str, Sequence[str]], parent_page_id: str
     ) -> Dict[str, List[str]]:
         """
         Import clippings from a source to any page publishing system.
 
+        Several sources, e.g. the clippings of several devices, are merged into a
+        single publish per book. With a row publisher, parent_page_id is the ID
+        of the database receiving one row per book.
+
         Returns a dictionary with book titles as keys and lists of created page IDs as values.
         """
-        # Get clippings from source
-        clippings = self.clipping_repo.get_clippings(clippings_source)
+        clippings = self.load_clippings(clippings_source)
+        return self.publish_clippings(clippings, parent_page_id)
 
-        # Filter only highlights
-        highlights = [c for c in clippings if c.clipping_type == "surlignement"]
+    def load_clippings(
+        self, clippings_source: Union[str, Sequence[str]]
+    ) -> List[Clipping]:
+        """
+        Get clippings from one or several sources.
 
-        # Group by book
-        books = self._group_by_book(highlights)
+        Sources are parsed in turn, then merged: a clipping found on several
+        devices (same book and content fingerprint) is kept once. Identical
+        clippings of the same source are all kept.
+        """
+        if isinstance(clippings_source, str):
+            clippings = self._parse_source(clippings_source)
+        else:
+            clippings = self._merge_clippings(
+                [self._parse_source(source) for source in clippings_source]
+            )
 
-        # Create pages for each book
-        results = {}
-        for book_title, book_highlights in books.items():
-            page_id = self._create_book_page(
-                book_title, book_highlights, parent_page_id
+        self._index_clippings(clippings)
+        return clippings
+
+    def publish_clippings(
+        self, clippings: List[Clipping], parent_page_id: str
+    ) -> Dict[str, List[str]]:
+        """Publish already loaded clippings, one page (or row) per book."""
+        books = self._plan_books(clippings)
+        if isinstance(self.page_publisher, RowPublisherRepository):
+            return self._upsert_books(books, parent_page_id)
+
+        for book_title, book_clippings in books.items():
+            self._emit(
+                "book_planned",
+                book=book_title,
+                clippings=len(book_clippings),
+                requests=self._count_batches(book_clippings),
             )
+
+        if self.journal is not None:
+            self.journal.start(parent_page_id)
+
+        # Create pages for each book, largest first
+        jobs = [
+            PublishJob(
+                key=book_title,
+                requests=self._count_batches(book_highlights),
+                run=lambda title=book_title, items=book_highlights: (
+                    self._publish_book(title, items, parent_page_id)
+                ),
+            )
+            for book_title, book_highlights in books.items()
+        ]
+        page_ids, self.last_schedule = self.scheduler.run(jobs, self.fail_fast)
+        self.page_publisher.flush()
+
+        # Failed books stay in the journal, the next run resumes them
+        if self.journal is not None and not self.last_schedule.failures:
+            self.journal.complete()
+
+        return {
+            book_title: [page_ids[book_title]]
+            for book_title in books
+            if book_title in page_ids
+        }
+
+    def import_clippings_pipelined(
+        self,
+        clippings_source: Union[str, Sequence[str]],
+        parent_page_id: str,
+        queue_size: int = 1000,
+    ) -> Dict[str, List[str]]:
+        """
+        Import clippings while they are parsed, with bounded memory.
+
+        Publishing starts with the first full batch instead of after the whole
+        source was parsed. Batches are sorted by page but follow the source
+        order, and pipelined imports are not journaled.
+        """
+        if isinstance(self.page_publisher, RowPublisherRepository):
+            raise ValueError("Pipelined imports are only supported for pages")
+        if self.journal is not None:
+            raise ValueError("Pipelined imports cannot be journaled")
+
+        from .import_pipeline import ImportPipeline
+
+        return ImportPipeline(self, queue_size).run(clippings_source, parent_page_id)
+
+    def append_clippings(
+        self,
+        clippings: List[Clipping],
+        parent_page_id: str,
+        book_pages: Dict[str, str],
+        on_book: Optional[Callable[[str], None]] = None,
+        sent_batches: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Publish new clippings at the end of the pages already created for their book.
+
+        book_pages maps book titles to page IDs; books without a page, or whose
+        page was deleted, get one, and it is recorded in book_pages as soon as
+        it is created. on_book, if any, is called with the title of each book
+        once it is published.
+
+        sent_batches, if any, maps the title of a book whose new page was
+        interrupted to the number of its batches already sent, and is updated
+        as batches are sent: called again with the same clippings, the page is
+        resumed after them.
+        """
+        if isinstance(self.page_publisher, RowPublisherRepository):
+            raise ValueError("Appending clippings is only supported for pages")
+        if sent_batches is None:
+            sent_batches = {}
+
+        self._index_clippings(clippings)
+        books = self._plan_books(clippings)
+
+        # Pages deleted since they were created are created again
+        known_pages = [book_pages[title] for title in books if title in book_pages]
+        existing = self.page_publisher.pages_exist(known_pages) if known_pages else {}
+
+        def on_batch(book_title: str, page_id: str, batch: int) -> None:
+            book_pages[book_title] = page_id
+            sent_batches[book_title] = batch + 1
+
+        results = {}
+        for book_title, book_clippings in books.items():
+            page_id = book_pages.get(book_title)
+            if page_id is not None and not existing.get(page_id, True):
+                page_id = None
+            if page_id is None or book_title in sent_batches:
+                resume_from = None
+                if page_id is not None:
+                    resume_from = (page_id, sent_batches[book_title])
+                page_id = self._create_book_page(
+                    book_title,
+                    book_clippings,
+                    parent_page_id,
+                    resume_from=resume_from,
+                    on_batch=on_batch,
+                )
+                sent_batches.pop(book_title, None)
+            else:
+                self._wait_for_rate_limit()
+                self.page_publisher.append_content(
+                    page_id, self._format_content(book_clippings)
+                )
             results[book_title] = [page_id]
+            if on_book is not None:
+                on_book(book_title)
 
+        self.page_publisher.flush()
         return results
 
+    def _upsert_books(
+        self, books: Dict[str, List[Clipping]], database_id: str
+    ) -> Dict[str, List[str]]:
+        """Upsert one row per book into a database."""
+        rows = [self._build_book(title, items) for title, items in books.items()]
+        requests = {}
+        for book in rows:
+            requests[book.title] = self.page_publisher.count_requests(book)
+            self._emit(
+                "book_planned",
+                book=book.title,
+                clippings=len(book.clippings),
+                requests=requests[book.title],
+            )
+
+        started = time.monotonic()
+        row_ids = self.page_publisher.upsert_books(database_id, rows)
+        seconds = time.monotonic() - started
+        for book_title, row_id in row_ids.items():
+            self._emit(
+                "page_created",
+                book=book_title,
+                page_id=row_id,
+                requests=requests[book_title],
+                seconds=seconds,
+            )
+        return {book_title: [row_id] for book_title, row_id in row_ids.items()}
+
+    def _emit(self, event: str, **fields: Any) -> None:
+        """Report a step of the import to the event callback, if any."""
+        if self.on_event is not None:
+            self.on_event(event, fields)
+
+    def _parse_source(self, clippings_source: str) -> List[Clipping]:
+        """Get the clippings of a source, reporting how long it took."""
+        # Streamed when followed, to report progress through large sources
+        if self.on_event is None:
+            return self.clipping_repo.get_clippings(clippings_source)
+        return list(
+            self._track_parsing(
+                clippings_source, self.clipping_repo.iter_clippings(clippings_source)
+            )
+        )
+
+    def _track_parsing(
+        self, clippings_source: str, clippings: Iterable[Clipping]
+    ) -> Iterator[Clipping]:
+        """
+        Yield the clippings of a source as they are parsed, reporting progress.
+
+        A parse_progress event follows every PARSE_PROGRESS_INTERVAL clippings,
+        and a source_parsed event the last one.
+        """
+        started = time.monotonic()
+        count = 0
+        for clipping in clippings:
+            yield clipping
+            count += 1
+            if count % PARSE_PROGRESS_INTERVAL == 0:
+                self._emit(
+                    "parse_progress",
+                    source=clippings_source,
+                    clippings=count,
+                    seconds=time.monotonic() - started,
+                )
+        self._emit(
+            "source_parsed",
+            source=clippings_source,
+            clippings=count,
+            seconds=time.monotonic() - started,
+        )
+
+    def _index_clippings(self, clippings: List[Clipping]) -> None:
+        """Add highlights and notes to the search index, if any."""
+        if self.search_index is not None:
+            self.search_index.add(
+                c for c in clippings if c.clipping_type in ("surlignement", "note")
+            )
+
+    def _plan_books(self, clippings: List[Clipping]) -> Dict[str, List[Clipping]]:
+        """
+        Keep highlights and notes, attach notes to highlights and group by book.
+
+        Each book gets its clippings sorted by page number.
+        """
+        if len(clippings) >= self.columnar_threshold:
+            # Only large archives pay for loading NumPy
+            from .clipping_table import ClippingTable
+
+            if ClippingTable.is_available():
+                return self._plan_books_columnar(clippings)
+
+        # Keep highlights and notes, bookmarks carry no content
+        highlights = [c for c in clippings if c.clipping_type == "surlignement"]
+        notes = [c for c in clippings if c.clipping_type == "note"]
+
+        # Attach notes to the highlight they annotate
+        orphan_notes = self._attach_notes(highlights, notes)
+
+        # Group by book
+        books = self._group_by_book(highlights + orphan_notes)
+        return {title: self._sort_by_page(items) for title, items in books.items()}
+
+    def _plan_books_columnar(
+        self, clippings: List[Clipping]
+    ) -> Dict[str, List[Clipping]]:
+        """Same as _plan_books, filtering, grouping and sorting NumPy columns."""
+        from .clipping_table import ClippingTable
+
+        table = ClippingTable(
+            clippings,
+            page_key=self._extract_page_number,
+            range_key=self._extract_range,
+        )
+        highlight_indices = table.indices_of_type("surlignement")
+        orphan_indices = table.attach_notes(
+            highlight_indices, table.indices_of_type("note")
+        )
+        return table.group_by_book(highlight_indices, orphan_indices)
+
+    def _merge_clippings(self, sources: List[List[Clipping]]) -> List[Clipping]:
+        """
+        Merge clippings of several sources, dropping cross-device duplicates.
+
+        A clipping is dropped when an earlier source has the same one; the
+        same highlight made twice on one device is not a duplicate.
+        """
+        seen: Set[Tuple[str, str]] = set()
+        merged = []
+        for clippings in sources:
+            keys = [(c.book_title, c.fingerprint) for c in clippings]
+            merged.extend(c for c, key in zip(clippings, keys) if key not in seen)
+            seen.update(keys)
+        return merged
+
     def _group_by_book(self, clippings: List[Clipping]) -> Dict[str, List[Clipping]]:
         """Group clippings by book title."""
         books: Dict[str, List[Clipping]] = {}
@@ -52,28 +392,222 @@ class ImportService:
             books[clipping.book_title].append(clipping)
         return books
 
-    def _create_book_page(
+    def _attach_notes(
+        self, highlights: List[Clipping], notes: List[Clipping]
+    ) -> List[Clipping]:
+        """
+        Attach each note to the highlight it annotates.
+
+        A note matches the highlight of the same book covering its location,
+        or its page when the note has no location; among overlapping
+        highlights, the one starting last. Highlights are indexed per book and
+        sorted once, so each note is resolved with a binary search. Returns
+        the notes that matched no highlight.
+        """
+        indexes: Dict[Tuple[str, str], _PositionIndex] = {}
+        for highlight in highlights:
+            for field_name in ("location", "page"):
+                position = self._extract_range(getattr(highlight, field_name))
+                if position is None:
+                    continue
+                key = (highlight.book_title, field_name)
+                index = indexes.setdefault(key, ([], [], []))
+                index[0].append(position[0])
+                index[1].append(position[1])
+                index[2].append(highlight)
+
+        for key, (starts, ends, items) in indexes.items():
+            order = sorted(range(len(starts)), key=starts.__getitem__)
+            indexes[key] = (
+                [starts[i] for i in order],
+                _window_maxima([ends[i] for i in order]),
+                [items[i] for i in order],
+            )
+
+        orphans = []
+        for note in notes:
+            highlight = self._find_annotated_highlight(note, indexes)
+            if highlight is None:
+                orphans.append(note)
+            else:
+                highlight.notes.append(note)
+        return orphans
+
+    def _find_annotated_highlight(
+        self,
+        note: Clipping,
+        indexes: Dict[Tuple[str, str], _PositionIndex],
+    ) -> Optional[Clipping]:
+        """Find the highlight covering the note position, if any."""
+        for field_name in ("location", "page"):
+            position = self._extract_range(getattr(note, field_name))
+            if position is None:
+                continue
+            index = indexes.get((note.book_title, field_name))
+            if index is None:
+                return None
+
+            # Highlights starting earlier may still cover the note, the
+            # running max of their ends tells whether one does
+            starts, maxima, items = index
+            candidate = bisect_right(starts, position[0]) - 1
+            if candidate < 0 or maxima[-1][candidate] < position[0]:
+                return None
+
+            # Skip back over the highlights ending before the note, in
+            # windows of halving widths
+            for level in range(len(maxima) - 1, -1, -1):
+                if maxima[level][candidate] < position[0]:
+                    candidate -= 1 << level
+            return items[candidate]
+        return None
+
+    def _build_book(self, book_title: str, clippings: List[Clipping]) -> Book:
+        """Build a book from its clippings, already sorted in reading order."""
+        author = next((c.author for c in clippings if c.author), None)
+        return Book(title=book_title, author=author, clippings=clippings)
+
+    def _sort_by_page(self, clippings: List[Clipping]) -> List[Clipping]:
+        """Sort clippings by page number."""
+        return sorted(clippings, key=lambda h: self._extract_page_number(h.page or ""))
+
+    def _publish_book(
         self, book_title: str, highlights: List[Clipping], parent_page_id: str
     ) -> str:
-        """Create a page for a book with its highlights."""
-        # Sort highlights by page number
-        sorted_highlights = sorted(
-            highlights, key=lambda h: self._extract_page_number(h.page or "")
+        """Create the page of a book, reporting whether it succeeded."""
+        started = time.monotonic()
+        try:
+            page_id = self._create_book_page(book_title, highlights, parent_page_id)
+        except Exception as e:
+            self._emit(
+                "page_failed",
+                book=book_title,
+                error=str(e),
+                seconds=time.monotonic() - started,
+            )
+            raise
+        self._emit(
+            "page_created",
+            book=book_title,
+            page_id=page_id,
+            requests=self._count_batches(highlights),
+            seconds=time.monotonic() - started,
         )
+        return page_id
+
+    def _create_book_page(
+        self,
+        book_title: str,
+        highlights: List[Clipping],
+        parent_page_id: str,
+        resume_from: Optional[Tuple[str, int]] = None,
+        on_batch: Optional[Callable[[str, str, int], None]] = None,
+    ) -> str:
+        """
+        Create a page for a book with its highlights, one request per batch.
+
+        The page is created with the first batch and the others are appended.
+        With a journal, requests already sent by an interrupted import are
+        skipped; resume_from, if any, is the (page ID, next batch) to resume
+        without one. on_batch, if any, is called with the book title, page ID
+        and index of each batch once it is sent.
+        """
+        batches = self._plan_batches(highlights)
+        plan = hashlib.sha1("\x1e".join(batches).encode("utf-8")).hexdigest()
+        progress = self.journal.progress(book_title, plan) if self.journal else None
+
+        if resume_from is not None:
+            page_id, next_batch = resume_from
+        elif progress is None:
+            self._wait_for_rate_limit()
+            started = time.monotonic()
+            page_id = self.page_publisher.create_page(
+                parent_id=parent_page_id, title=book_title, content=batches[0]
+            )
+            self._emit_request(book_title, "create", 0, started)
+            if self.journal is not None:
+                self.journal.record_page_created(book_title, page_id, plan)
+            if on_batch is not None:
+                on_batch(book_title, page_id, 0)
+            next_batch = 1
+        elif progress.completed:
+            return progress.page_id
+        else:
+            page_id = progress.page_id
+            next_batch = progress.batches_done
 
-        # Format content
-        content_lines = []
-        for highlight in sorted_highlights:
-            page_info = f" (p.{highlight.page})" if highlight.page else ""
-            content_lines.append(f'"{highlight.content}"{page_info}')
+        for index in range(next_batch, len(batches)):
+            self._wait_for_rate_limit()
+            started = time.monotonic()
+            self.page_publisher.append_content(page_id, batches[index])
+            self._emit_request(book_title, "append", index, started)
+            if self.journal is not None:
+                self.journal.record_batch_appended(book_title, index)
+            if on_batch is not None:
+                on_batch(book_title, page_id, index)
 
-        content = "\n\n".join(content_lines)
+        if self.journal is not None:
+            self.journal.record_book_completed(book_title)
+        return page_id
 
-        # Create the page
-        return self.page_publisher.create_page(
-            parent_id=parent_page_id, title=book_title, content=content
+    def _emit_request(
+        self, book_title: str, request: str, batch: int, started: float
+    ) -> None:
+        """Report a request sent for a book, started at a monotonic time."""
+        self._emit(
+            "request_sent",
+            book=book_title,
+            request=request,
+            batch=batch,
+            seconds=time.monotonic() - started,
         )
 
+    def _wait_for_rate_limit(self) -> None:
+        """Wait until the next request is allowed by the rate limiter."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+    def _count_batches(self, clippings: List[Clipping]) -> int:
+        """Number of requests needed to publish clippings."""
+        return math.ceil(len(clippings) / self.batch_size)
+
+    def _plan_batches(self, clippings: List[Clipping]) -> List[str]:
+        """Format clippings into the content of successive requests."""
+        return [
+            self._format_content(clippings[i : i + self.batch_size])
+            for i in range(0, len(clippings), self.batch_size)
+        ]
+
+    def _format_content(self, clippings: List[Clipping]) -> str:
+        """Format clippings, already sorted by page number, one paragraph each."""
+        return "\n\n".join(self._format_clipping(clipping) for clipping in clippings)
+
+    def _format_clipping(self, clipping: Clipping) -> str:
+        """Format a highlight, or an orphan note, with its attached notes."""
+        page_info = f" (p.{clipping.page})" if clipping.page else ""
+        if clipping.clipping_type == "note":
+            lines = [f"Note: {clipping.content}{page_info}"]
+        else:
+            lines = [f'"{clipping.content}"{page_info}']
+
+        # Single newlines keep notes in the same block as their highlight
+        lines.extend(f"Note: {note.content}" for note in clipping.notes)
+        return "\n".join(lines)
+
+    def _extract_range(self, value: Optional[str]) -> Optional[Tuple[int, int]]:
+        """Extract a numeric (start, end) range from a page or location string."""
+        if not value:
+            return None
+
+        # Handles "12", "12-12" and "emplacement 58-59"
+        match = re.search(r"(\d+)(?:-(\d+))?", value)
+        if not match:
+            return None
+
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else start
+        return start, max(start, end)
+
     def _extract_page_number(self, page_str: str) -> int:
         """Extract page number for sorting."""
         if not page_str:
@@ -84,3 +618,21 @@ class ImportService:
             return int(page_str.split("-")[0])
         except (ValueError, IndexError):
             return 0
+
+
+def _window_maxima(values: List[int]) -> List[List[int]]:
+    """
+    Sparse table of the maxima of values.
+
+    Level k holds, at each index, the max of the 2**k values ending there
+    (fewer at the start), so the last level is the running max.
+    """
+    levels = [values]
+    width = 1
+    while width < len(values):
+        previous = levels[-1]
+        levels.append(
+            previous[:width] + [max(a, b) for a, b in zip(previous[width:], previous)]
+        )
+        width *= 2
+    return levels
@@ -0,0 +1,118 @@
+"""Scheduler publishing books concurrently, largest first."""
+
+import heapq
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .rate_limiter import RateLimiter
+
+
+@dataclass
+class PublishJob:
+    """A book to publish, with the number of requests it needs."""
+
+    key: str
+    requests: int
+    run: Callable[[], str]
+
+
+@dataclass
+class ScheduleReport:
+    """Estimated and actual completion time of a publish."""
+
+    workers: int
+    requests: int
+    estimated_seconds: float
+    actual_seconds: float = 0.0
+    order: List[str] = field(default_factory=list)
+    failures: Dict[str, BaseException] = field(default_factory=dict)
+
+
+class PublishScheduler:
+    """
+    Longest-processing-time-first scheduler.
+
+    Jobs are dispatched to a pool of workers in decreasing request count, so
+    a large book never starts last and dominates the total time; small books
+    fill the other workers meanwhile. Requests of all workers share the same
+    rate limiter, if any.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        rate_limiter: Optional[RateLimiter] = None,
+        request_seconds: float = 0.5,
+    ):
+        """
+        Initialize the scheduler.
+
+        request_seconds is the expected latency of one request, used for the
+        completion time estimate.
+        """
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.request_seconds = request_seconds
+
+    def order(self, jobs: List[PublishJob]) -> List[PublishJob]:
+        """Jobs sorted by decreasing request count, stable for equal counts."""
+        return sorted(jobs, key=lambda job: -job.requests)
+
+    def estimate(self, jobs: List[PublishJob]) -> float:
+        """
+        Estimate the completion time of the jobs, in seconds.
+
+        Simulates the LPT assignment of jobs to workers, each request taking
+        request_seconds; the rate limit bounds the total throughput.
+        """
+        loads = [0.0] * max(1, min(self.max_workers, len(jobs)))
+        for job in self.order(jobs):
+            heapq.heapreplace(loads, loads[0] + job.requests * self.request_seconds)
+
+        makespan = max(loads)
+        if self.rate_limiter is not None:
+            total_requests = sum(job.requests for job in jobs)
+            makespan = max(makespan, total_requests / self.rate_limiter.rate)
+        return makespan
+
+    def run(
+        self, jobs: List[PublishJob], fail_fast: bool = True
+    ) -> Tuple[Dict[str, str], ScheduleReport]:
+        """
+        Run the jobs, largest first, and return their results by key.
+
+        On the first failure, jobs not started yet are cancelled, running ones
+        are awaited, and the failure is raised. Without fail_fast, every job
+        is run: the results of the successful ones are returned, and failures
+        are reported by key in the schedule report.
+        """
+        ordered = self.order(jobs)
+        report = ScheduleReport(
+            workers=self.max_workers,
+            requests=sum(job.requests for job in jobs),
+            estimated_seconds=self.estimate(jobs),
+            order=[job.key for job in ordered],
+        )
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(job.run): job.key for job in ordered}
+            _, pending = wait(
+                futures, return_when=FIRST_EXCEPTION if fail_fast else ALL_COMPLETED
+            )
+            for future in pending:
+                future.cancel()
+
+        report.actual_seconds = time.monotonic() - started
+
+        for future in futures:
+            if future.done() and not future.cancelled() and future.exception():
+                if fail_fast:
+                    raise future.exception()
+                report.failures[futures[future]] = future.exception()
+        results = {
+            futures[f]: f.result() for f in futures if futures[f] not in report.failures
+        }
+        return results, report
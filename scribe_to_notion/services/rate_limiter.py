@@ -0,0 +1,41 @@
+"""Token bucket rate limiter shared by publishing workers."""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Tokens are refilled at `rate` per second, up to `burst`; each request takes
+    one token, waiting for it if the bucket is empty.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """Initialize a full bucket."""
+        if rate <= 0:
+            raise ValueError("Rate limit must be positive")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, waiting until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
@@ -0,0 +1,165 @@
+"""Local full-text index of the imported clippings, backed by SQLite FTS5."""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from ..core.models import Clipping
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clippings (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    book TEXT NOT NULL,
+    author TEXT NOT NULL,  -- Empty when the title names no author
+    clipping_type TEXT NOT NULL,
+    page TEXT,
+    location TEXT,
+    date TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS clippings_fts USING fts5(
+    book, author, content,
+    content='clippings', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+# bm25 weights of the book, author and content columns
+RANK = "bm25(clippings_fts, 2.0, 2.0, 1.0)"
+
+
+@dataclass
+class SearchResult:
+    """A clipping matching a search, with the matched text highlighted."""
+
+    clipping: Clipping
+    snippet: str
+    score: float  # Lower is better, as returned by bm25()
+
+
+class SearchIndex:
+    """
+    SQLite database indexing every parsed clipping for offline search.
+
+    Clippings are keyed by book and content fingerprint, so indexing the same
+    clippings again (a re-import, another device) only adds the new ones.
+    The index may be fed by concurrent threads.
+    """
+
+    def __init__(self, path: str):
+        """Open the index, creating it if needed."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+
+    def add(self, clippings: Iterable[Clipping]) -> int:
+        """Index the clippings not indexed yet; return how many were added."""
+        rows = (
+            (
+                f"{c.book_title}\x1f{c.fingerprint}",
+                c.book_title,
+                c.author or "",
+                c.clipping_type,
+                c.page,
+                c.location,
+                c.date,
+                c.content,
+            )
+            for c in clippings
+        )
+        with self._lock, self._connection:
+            # Take the write lock before reading the last ID, so another
+            # process feeding the same index cannot insert rows meanwhile
+            self._connection.execute("BEGIN IMMEDIATE")
+            last_id = self._connection.execute(
+                "SELECT coalesce(max(id), 0) FROM clippings"
+            ).fetchone()[0]
+            cursor = self._connection.executemany(
+                "INSERT OR IGNORE INTO clippings (key, book, author, clipping_type, "
+                "page, location, date, content) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            # Index the new rows in one statement, much faster than per row
+            self._connection.execute(
+                "INSERT INTO clippings_fts (rowid, book, author, content) "
+                "SELECT id, book, author, content FROM clippings WHERE id > ?",
+                (last_id,),
+            )
+            return cursor.rowcount
+
+    def search(
+        self, query: str, limit: int = 20, book: Optional[str] = None
+    ) -> List[SearchResult]:
+        """
+        Clippings matching the query, best matches first.
+
+        The query uses the FTS5 syntax (AND, OR, NOT, "phrases", prefix*,
+        content:word); when it is not valid FTS5, it is searched as plain words.
+        """
+        try:
+            return self._search(query, limit, book)
+        except sqlite3.OperationalError:
+            return self._search(self._plain_query(query), limit, book)
+
+    def __len__(self) -> int:
+        """Number of indexed clippings."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT count(*) FROM clippings"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        """Close the index."""
+        with self._lock:
+            self._connection.close()
+
+    def _search(
+        self, query: str, limit: int, book: Optional[str]
+    ) -> List[SearchResult]:
+        """Run an FTS5 query."""
+        sql = (
+            "SELECT c.book, c.author, c.clipping_type, c.page, c.location, c.date, "
+            "c.content, snippet(clippings_fts, 2, '[', ']', '…', 16), "
+            f"{RANK} AS score "
+            "FROM clippings_fts JOIN clippings c ON c.id = clippings_fts.rowid "
+            "WHERE clippings_fts MATCH ?"
+        )
+        params: list = [query]
+        if book is not None:
+            sql += " AND c.book = ?"
+            params.append(book)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+
+        return [
+            SearchResult(
+                clipping=Clipping(
+                    book_title=row[0],
+                    author=row[1] or None,
+                    clipping_type=row[2],
+                    page=row[3],
+                    location=row[4],
+                    date=row[5],
+                    content=row[6],
+                ),
+                snippet=row[7],
+                score=row[8],
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _plain_query(query: str) -> str:
+        """FTS5 query matching all the words of a plain text query."""
+        words = query.split()
+        return " ".join('"%s"' % word.replace('"', '""') for word in words) or '""'
@@ -0,0 +1,231 @@
+"""Service for watching a clippings source and publishing new clippings."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..core.interfaces import IncrementalClippingRepository
+from ..core.models import Clipping
+from .import_service import ImportService
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # inotify is optional, and Linux only
+    INotify = None
+
+
+class PollingWatcher:
+    """Detect changes of a file by polling its size and modification time."""
+
+    def __init__(self, path: str, interval: float = 1.0):
+        """Remember the current state of the file."""
+        self.path = path
+        self.interval = interval
+        self._last = self._stat()
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for a change; return whether one happened."""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._stat()
+            if current != self._last:
+                self._last = current
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        """Release the watcher resources."""
+
+    def _stat(self) -> Optional[tuple]:
+        """Size and modification time of the file, or None if it is missing."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+
+class InotifyWatcher:
+    """
+    Detect changes of a file with inotify.
+
+    The parent directory is watched, so the file can be replaced (e.g. by a
+    device sync) without losing the watch.
+    """
+
+    def __init__(self, path: str):
+        """Start watching the directory of the file."""
+        self.name = os.path.basename(path)
+        self._inotify = INotify()
+        self._inotify.add_watch(
+            os.path.dirname(os.path.abspath(path)),
+            flags.MODIFY | flags.CLOSE_WRITE | flags.CREATE | flags.MOVED_TO,
+        )
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for a change; return whether one happened."""
+        events = self._inotify.read(timeout=int(timeout * 1000))
+        return any(event.name == self.name for event in events)
+
+    def close(self) -> None:
+        """Release the watcher resources."""
+        self._inotify.close()
+
+
+class WatchService:
+    """
+    Service publishing the clippings appended to a source as they arrive.
+
+    The byte offset reached in the source and the page created for each book
+    are kept in a state file, so new clippings are appended to existing book
+    pages, including across restarts. When a sync fails, the state also keeps
+    how many clippings of each book were already published from the offset,
+    and how many batches of a new book page were sent, so the retry only
+    publishes the others.
+    """
+
+    def __init__(
+        self,
+        import_service: ImportService,
+        clipping_repo: IncrementalClippingRepository,
+        state_path: str,
+        debounce: float = 2.0,
+        poll_interval: float = 1.0,
+    ):
+        """Initialize the watch service with dependencies."""
+        self.import_service = import_service
+        self.clipping_repo = clipping_repo
+        self.state_path = Path(state_path)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+
+    def sync(
+        self, source: str, parent_page_id: str, from_end: bool = False
+    ) -> Dict[str, List[str]]:
+        """
+        Publish the clippings added since the last sync.
+
+        The first sync of a source publishes it entirely, unless from_end is set,
+        in which case only clippings added from now on are published.
+        """
+        states = self._load_states()
+        key = f"{os.path.abspath(source)}\x1f{parent_page_id}"
+        state = states.get(key)
+        if state is None:
+            offset = os.path.getsize(source) if from_end else 0
+            state = states[key] = {"offset": offset, "pages": {}}
+
+        clippings, offset = self.clipping_repo.get_new_clippings(
+            source, state["offset"]
+        )
+
+        # Skip the clippings a failed sync already published; the source is
+        # only appended to, so they come first in each book
+        published: Dict[str, int] = state.setdefault("published", {})
+        sent_batches: Dict[str, int] = state.setdefault("batches", {})
+        skipped: Dict[str, int] = {}
+        pending: List[Clipping] = []
+        for clipping in clippings:
+            book_title = clipping.book_title
+            if skipped.get(book_title, 0) < published.get(book_title, 0):
+                skipped[book_title] = skipped.get(book_title, 0) + 1
+            else:
+                pending.append(clipping)
+
+        def on_book(book_title: str) -> None:
+            published[book_title] = published.get(book_title, 0) + sum(
+                1 for c in pending if c.book_title == book_title
+            )
+
+        try:
+            results = {}
+            if pending:
+                results = self.import_service.append_clippings(
+                    pending,
+                    parent_page_id,
+                    state["pages"],
+                    on_book=on_book,
+                    sent_batches=sent_batches,
+                )
+            state["offset"] = offset
+            del state["published"]
+            del state["batches"]
+        finally:
+            # Pages and books published before a failure are kept, the offset
+            # is not
+            self._save_states(states)
+
+        return results
+
+    def run(
+        self,
+        source: str,
+        parent_page_id: str,
+        from_end: bool = False,
+        on_sync: Optional[Callable[[Dict[str, List[str]]], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
+        """
+        Watch the source and sync it after each burst of changes.
+
+        Changes are debounced: a sync starts once the source has been quiet for
+        the debounce delay, or after ten debounce delays of continuous writes.
+        """
+        stop_event = stop_event or threading.Event()
+        watcher = self._create_watcher(source)
+
+        def sync() -> None:
+            try:
+                results = self.sync(source, parent_page_id, from_end)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(e)
+                return
+            if on_sync is not None:
+                on_sync(results)
+
+        try:
+            sync()
+            while not stop_event.is_set():
+                if not watcher.wait(self.poll_interval):
+                    continue
+
+                deadline = time.monotonic() + 10 * self.debounce
+                while time.monotonic() < deadline and watcher.wait(self.debounce):
+                    pass
+                sync()
+        finally:
+            watcher.close()
+
+    def _create_watcher(self, source: str) -> Any:
+        """Use inotify where available, polling otherwise."""
+        if INotify is not None:
+            try:
+                return InotifyWatcher(source)
+            except OSError:
+                pass
+        return PollingWatcher(source, self.poll_interval)
+
+    def _load_states(self) -> Dict[str, Dict[str, Any]]:
+        """Load the state of every watched source."""
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_states(self, states: Dict[str, Dict[str, Any]]) -> None:
+        """Write the state of every watched source atomically."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(states, f)
+        os.replace(tmp_path, self.state_path)
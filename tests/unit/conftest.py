@@ -0,0 +1,32 @@
+"""Shared factories for the unit tests."""
+
+from scribe_to_notion.core.models import Clipping
+
+
+def make_clipping(
+    book_title="Book",
+    content="Highlight",
+    clipping_type="surlignement",
+    page="1",
+    location=None,
+    author="Author",
+    date="dimanche 18 mai 2025 12:34:30",
+):
+    """Build a clipping, with placeholder metadata by default."""
+    return Clipping(
+        book_title=book_title,
+        author=author,
+        clipping_type=clipping_type,
+        page=page,
+        location=location,
+        date=date,
+        content=content,
+    )
+
+
+def api_error(code, status):
+    """Build the error raised by notion_client for an API error response."""
+    import httpx
+    from notion_client import APIResponseError
+
+    return APIResponseError(httpx.Response(status), code.value, code)
@@ -0,0 +1,210 @@
+"""Tests for the concurrent imports of several accounts."""
+
+import json
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from conftest import make_clipping
+from scribe_to_notion.services.batch_import import (
+    BatchImportRunner,
+    BatchJob,
+    load_manifest,
+)
+from scribe_to_notion.services.import_service import ImportService
+
+
+def make_job(name, api_token):
+    """Build a job importing one clippings file."""
+    return BatchJob(name, [f"{name}.txt"], api_token, f"{name}_page")
+
+
+class TestLoadManifest:
+    """Test loading the jobs of a manifest."""
+
+    def write_manifest(self, tmp_path, jobs):
+        """Write a manifest of jobs and return its path."""
+        path = tmp_path / "accounts.json"
+        path.write_text(json.dumps({"jobs": jobs}), encoding="utf-8")
+        return str(path)
+
+    def test_manifest_resolves_paths_and_tokens(self, tmp_path, monkeypatch):
+        """Test that clippings are relative to the manifest and tokens are resolved."""
+        # Arrange
+        monkeypatch.setenv("BOB_TOKEN", "bob_token")
+        manifest = self.write_manifest(
+            tmp_path,
+            [
+                {"name": "alice", "clippings": "alice.txt", "parent_page_id": "a"},
+                {
+                    "name": "bob",
+                    "clippings": ["bob/"],
+                    "parent_page_id": "b",
+                    "token_env": "BOB_TOKEN",
+                },
+                {
+                    "clippings": "carol.txt",
+                    "parent_page_id": "c",
+                    "token": "carol_token",
+                },
+            ],
+        )
+
+        # Act
+        jobs = load_manifest(manifest, default_token="default_token")
+
+        # Assert
+        assert [job.name for job in jobs] == ["alice", "bob", "c"]
+        assert jobs[0].sources == [str(tmp_path / "alice.txt")]
+        assert [job.api_token for job in jobs] == [
+            "default_token",
+            "bob_token",
+            "carol_token",
+        ]
+
+    @pytest.mark.parametrize(
+        "jobs, message",
+        [
+            (
+                [{"clippings": "a.txt", "parent_page_id": "a"}],
+                "has no Notion API token",
+            ),
+            ([{"clippings": "a.txt", "token": "t"}], "needs a parent_page_id"),
+            (
+                [
+                    {
+                        "clippings": "a.txt",
+                        "parent_page_id": "a",
+                        "token": "t",
+                        "name": "x",
+                    },
+                    {
+                        "clippings": "b.txt",
+                        "parent_page_id": "a",
+                        "token": "t",
+                        "name": "y",
+                    },
+                ],
+                "Duplicate parent_page_id",
+            ),
+            ([], "has no jobs"),
+            (["a.txt"], "Job 1 must be an object"),
+        ],
+    )
+    def test_invalid_manifest_is_rejected(self, tmp_path, jobs, message):
+        """Test that manifest errors are reported before any job runs."""
+        # Arrange
+        manifest = self.write_manifest(tmp_path, jobs)
+
+        # Act & Assert
+        with pytest.raises(ValueError, match=message):
+            load_manifest(manifest)
+
+    def test_job_repr_hides_the_token(self):
+        """Test that printing a job does not leak its token."""
+        # Act
+        text = repr(make_job("alice", "secret"))
+
+        # Assert
+        assert "secret" not in text
+
+
+class TestBatchImportRunner:
+    """Test the BatchImportRunner."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        # One highlight per source
+        self.mock_clipping_repo = Mock()
+        self.mock_clipping_repo.get_clippings.side_effect = lambda source: [
+            make_clipping(f"Book of {source}")
+        ]
+
+    def make_service(self, publisher):
+        """Build an import service publishing to the given publisher."""
+        return ImportService(publisher, self.mock_clipping_repo)
+
+    def test_each_token_gets_its_own_rate_limiter(self):
+        """Test that jobs sharing a token share its bucket, and only them."""
+        # Arrange
+        limiters = {}
+
+        def create_service(job, rate_limiter):
+            limiters[job.name] = rate_limiter
+            return self.make_service(Mock())
+
+        jobs = [
+            make_job("alice", "t1"),
+            make_job("bob", "t2"),
+            make_job("alice2", "t1"),
+        ]
+
+        # Act
+        BatchImportRunner(create_service, max_jobs=1).run(jobs)
+
+        # Assert
+        assert limiters["alice"] is limiters["alice2"]
+        assert limiters["alice"] is not limiters["bob"]
+        assert limiters["alice"].rate == 3.0
+
+    def test_jobs_run_concurrently_and_failures_are_isolated(self):
+        """Test that jobs overlap and a failing job does not stop the others."""
+        # Arrange
+        # Only passes if both working jobs publish at the same time
+        barrier = threading.Barrier(2, timeout=5)
+
+        def create_service(job, rate_limiter):
+            publisher = Mock()
+            if job.name == "broken":
+                publisher.create_page.side_effect = Exception("Failed to create page")
+            else:
+
+                def create_page(**kwargs):
+                    barrier.wait()
+                    return f"{job.name}_book_page"
+
+                publisher.create_page.side_effect = create_page
+            return self.make_service(publisher)
+
+        jobs = [
+            make_job("alice", "t1"),
+            make_job("broken", "t2"),
+            make_job("bob", "t3"),
+        ]
+        finished = []
+
+        # Act
+        results = BatchImportRunner(create_service, max_jobs=3).run(
+            jobs, on_result=lambda result: finished.append(result.job.name)
+        )
+
+        # Assert
+        assert [result.job.name for result in results] == ["alice", "broken", "bob"]
+        assert sorted(finished) == ["alice", "bob", "broken"]
+        assert results[0].pages == {"Book of alice.txt": ["alice_book_page"]}
+        assert results[0].requests == 1
+        assert not results[1].succeeded
+        assert str(results[1].error) == "Failed to create page"
+        assert results[2].succeeded
+
+    def test_missing_sources_only_fail_their_job(self):
+        """Test that a job whose clippings are missing fails on its own."""
+
+        # Arrange
+        def expand_sources(sources):
+            if sources == ["missing.txt"]:
+                raise FileNotFoundError("File not found: missing.txt")
+            return sources
+
+        runner = BatchImportRunner(
+            lambda job, rate_limiter: self.make_service(Mock()),
+            expand_sources=expand_sources,
+        )
+
+        # Act
+        results = runner.run([make_job("missing", "t1"), make_job("alice", "t2")])
+
+        # Assert
+        assert isinstance(results[0].error, FileNotFoundError)
+        assert results[1].succeeded
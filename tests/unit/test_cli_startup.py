@@ -0,0 +1,88 @@
+"""Startup-time tests for the command-line interface."""
+
+import subprocess
+import sys
+
+# Modules only needed once a network operation actually runs
+HEAVY_MODULES = ("notion_client", "httpx", "httpcore", "ssl", "numpy")
+
+# Generous budget for importing the CLI module, measured with -X importtime
+IMPORT_BUDGET_US = 150_000
+
+
+def run_python(code, *options):
+    """Run Python code in a fresh interpreter and return the completed process."""
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into a {module: cumulative microseconds} dict."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+class TestCliStartup:
+    """Test what importing and starting the CLI loads."""
+
+    def test_cli_import_does_not_load_heavy_dependencies(self):
+        """Test that importing the CLI stays within budget and skips the HTTP stack."""
+        # Act
+        result = run_python("import scribe_to_notion.cli.main", "-X", "importtime")
+
+        # Assert
+        assert result.returncode == 0, result.stderr
+        timings = parse_importtime(result.stderr)
+        loaded_heavy = [m for m in timings if m.split(".")[0] in HEAVY_MODULES]
+        assert loaded_heavy == []
+        assert timings["scribe_to_notion.cli.main"] < IMPORT_BUDGET_US
+
+    def test_missing_file_fails_without_loading_heavy_dependencies(self):
+        """Test that a missing file is reported before any adapter is loaded."""
+        # Arrange
+        code = (
+            "import sys\n"
+            "from scribe_to_notion.cli.main import main\n"
+            "try:\n"
+            "    main(['missing.txt', '--parent-page-id', 'parent_id'])\n"
+            "except SystemExit as e:\n"
+            "    loaded = [m for m in sys.modules if m.split('.')[0] in %r]\n"
+            "    print(e.code, loaded)\n" % (HEAVY_MODULES,)
+        )
+
+        # Act
+        result = run_python(code)
+
+        # Assert
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().endswith("1 []")
+
+    def test_help_does_not_load_adapters(self):
+        """Test that --help exits without importing adapters or services."""
+        # Arrange
+        code = (
+            "import sys\n"
+            "from scribe_to_notion.cli.main import main\n"
+            "try:\n"
+            "    main(['--help'])\n"
+            "except SystemExit as e:\n"
+            "    loaded = [m for m in sys.modules if m.startswith('scribe_to_notion.')\n"
+            "              and not m.startswith('scribe_to_notion.cli')]\n"
+            "    print(e.code, loaded)\n"
+        )
+
+        # Act
+        result = run_python(code)
+
+        # Assert
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().endswith("0 []")
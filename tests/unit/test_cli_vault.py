@@ -0,0 +1,22 @@
+"""Tests for the Markdown vault export from the command line."""
+
+from scribe_to_notion.cli.main import main
+
+
+class TestCliVault:
+    """Test the --vault option of the CLI."""
+
+    def test_vault_export_needs_no_token(self, tmp_path, monkeypatch, capsys):
+        """Test that exporting to a vault works offline, without a Notion token."""
+        # Arrange
+        monkeypatch.delenv("NOTION_API_TOKEN", raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+        vault = tmp_path / "vault"
+
+        # Act
+        main(["tests/unit/My Clippings.txt", "--vault", str(vault), "--no-index"])
+
+        # Assert
+        assert "All done" in capsys.readouterr().out
+        assert list(vault.glob("*.md"))
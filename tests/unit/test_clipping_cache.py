@@ -0,0 +1,141 @@
+"""Tests for the parsed clippings cache."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from scribe_to_notion.adapters.file_clipping_adapter import FileClippingAdapter
+
+NEW_CLIPPING = (
+    "New Book\n"
+    "- Votre surlignement sur la page 1 | Ajouté le lundi 2 juin 2025 10:00:00\n"
+    "\n"
+    "A new highlight\n"
+    "==========\n"
+)
+
+
+class TestClippingCache:
+    """Test the clippings cache of the FileClippingAdapter."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.clippings_file = self.root / "My Clippings.txt"
+        shutil.copy("tests/unit/My Clippings.txt", self.clippings_file)
+        self.cache_dir = self.root / "cache"
+        self.adapter = FileClippingAdapter(cache_dir=str(self.cache_dir))
+
+    def teardown_method(self):
+        """Tear down test fixtures."""
+        self.directory.cleanup()
+
+    def append_clipping(self, path):
+        """Append a new highlight to a clippings file."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(NEW_CLIPPING)
+
+    def test_cached_clippings_match_parsed_clippings(self):
+        """Test that the cache returns the clippings the parser produced."""
+        # Arrange
+        parsed = FileClippingAdapter().get_clippings(str(self.clippings_file))
+
+        # Act
+        first = self.adapter.get_clippings(str(self.clippings_file))
+        with patch.object(FileClippingAdapter, "_parse_content") as parse:
+            second = self.adapter.get_clippings(str(self.clippings_file))
+
+        # Assert
+        parse.assert_not_called()
+        assert first == parsed
+        assert second == parsed
+
+    def test_cache_skips_parsing_when_only_mtime_changes(self):
+        """Test that a touched file with the same content is not parsed again."""
+        # Arrange
+        self.adapter.get_clippings(str(self.clippings_file))
+        stat = self.clippings_file.stat()
+        os.utime(self.clippings_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        # Act
+        with patch.object(FileClippingAdapter, "_parse_content") as parse:
+            self.adapter.get_clippings(str(self.clippings_file))
+
+        # Assert
+        parse.assert_not_called()
+
+    def test_cache_is_invalidated_when_file_changes(self):
+        """Test that appended clippings are parsed."""
+        # Arrange
+        before = self.adapter.get_clippings(str(self.clippings_file))
+        self.append_clipping(self.clippings_file)
+
+        # Act
+        after = self.adapter.get_clippings(str(self.clippings_file))
+
+        # Assert
+        assert len(after) == len(before) + 1
+        assert after[-1].content == "A new highlight"
+
+    def test_clippings_appended_while_parsing_are_not_cached_as_fresh(self):
+        """Test that the snapshot never pairs the new file size with old content."""
+        # Arrange
+        read_bytes = type(self.clippings_file).read_bytes
+
+        def read_then_append(path):
+            data = read_bytes(path)
+            # The device syncs right after the file was read
+            self.append_clipping(path)
+            return data
+
+        # Act
+        with patch.object(type(self.clippings_file), "read_bytes", read_then_append):
+            before = self.adapter.get_clippings(str(self.clippings_file))
+        after = self.adapter.get_clippings(str(self.clippings_file))
+
+        # Assert
+        assert len(after) == len(before) + 1
+        assert after[-1].content == "A new highlight"
+
+    def test_corrupted_cache_is_a_cache_miss(self):
+        """Test that an unreadable snapshot falls back to parsing."""
+        # Arrange
+        expected = self.adapter.get_clippings(str(self.clippings_file))
+        for snapshot in self.cache_dir.iterdir():
+            snapshot.write_bytes(b"not a pickle")
+
+        # Act
+        result = self.adapter.get_clippings(str(self.clippings_file))
+
+        # Assert
+        assert result == expected
+
+    def test_unwritable_cache_directory_is_skipped(self):
+        """Test that a cache directory that cannot be created does not fail the parse."""
+        # Arrange
+        parsed = FileClippingAdapter().get_clippings(str(self.clippings_file))
+        blocker = self.root / "not a directory"
+        blocker.write_text("")
+        adapter = FileClippingAdapter(cache_dir=str(blocker / "cache"))
+
+        # Act
+        result = adapter.get_clippings(str(self.clippings_file))
+
+        # Assert
+        assert result == parsed
+
+    def test_full_disk_leaves_no_temporary_snapshot(self):
+        """Test that a snapshot failing to be written does not fail the parse."""
+        # Arrange
+        parsed = FileClippingAdapter().get_clippings(str(self.clippings_file))
+
+        # Act
+        with patch("pickle.dump", side_effect=OSError(28, "No space left on device")):
+            result = self.adapter.get_clippings(str(self.clippings_file))
+
+        # Assert
+        assert result == parsed
+        assert list(self.cache_dir.iterdir()) == []
@@ -55,6 +55,47 @@ def test_clipping_model_extracts_author():
     assert clipping.author == "Horowitz, Ben"
 
 
+def test_clipping_model_parses_french_date():
+    """Test that the French date string is parsed."""
+    clipping = Clipping(
+        book_title="Book",
+        author=None,
+        clipping_type="surlignement",
+        page="12",
+        location=None,
+        date="mercredi 21 août 2025 22:14:57",
+        content="content",
+    )
+
+    assert clipping.added_at.isoformat() == "2025-08-21T22:14:57"
+    clipping.date = "Unknown date"
+    assert clipping.added_at is None
+
+
+def test_clipping_fingerprint_ignores_date_and_whitespace():
+    """Test that the same highlight from two devices has the same fingerprint."""
+    first = Clipping(
+        book_title="Book",
+        author=None,
+        clipping_type="surlignement",
+        page="12",
+        location=None,
+        date="dimanche 18 mai 2025 12:48:14",
+        content="was also on  the highest\ntrack",
+    )
+    second = Clipping(
+        book_title="Book",
+        author=None,
+        clipping_type="surlignement",
+        page="12-12",
+        location="emplacement 58-59",
+        date="lundi 19 mai 2025 08:00:00",
+        content="was also on the highest track",
+    )
+
+    assert first.fingerprint == second.fingerprint
+
+
 def test_file_clipping_adapter_parses_file():
     """Test that FileClippingAdapter can parse the clippings file."""
     adapter = FileClippingAdapter()
@@ -102,3 +143,42 @@ def test_file_clipping_adapter_parses_bookmarks():
     # Check that we have the expected bookmark
     bookmark_titles = [b.book_title for b in bookmarks]
     assert "The Hard Thing About Hard Things" in bookmark_titles
+
+
+def test_file_clipping_adapter_expands_directories_and_globs(tmp_path):
+    """Test that directories and glob patterns are expanded to files."""
+    (tmp_path / "kindle").mkdir()
+    (tmp_path / "kindle" / "My Clippings.txt").write_text("", encoding="utf-8")
+    (tmp_path / "scribe.txt").write_text("", encoding="utf-8")
+    (tmp_path / "notes.md").write_text("", encoding="utf-8")
+
+    adapter = FileClippingAdapter()
+    sources = adapter.expand_sources(
+        [
+            str(tmp_path / "kindle"),
+            str(tmp_path / "*.txt"),
+            str(tmp_path / "scribe.txt"),
+        ]
+    )
+
+    assert sources == [
+        str(tmp_path / "kindle" / "My Clippings.txt"),
+        str(tmp_path / "scribe.txt"),
+    ]
+
+
+def test_file_clipping_adapter_expand_sources_rejects_missing_file():
+    """Test that a missing file is reported."""
+    adapter = FileClippingAdapter()
+
+    with pytest.raises(FileNotFoundError):
+        adapter.expand_sources(["tests/unit/Missing Clippings.txt"])
+
+
+def test_iter_clippings_streams_the_parsed_clippings():
+    """Test that streaming a file yields the clippings of a full parse."""
+    adapter = FileClippingAdapter()
+
+    streamed = list(adapter.iter_clippings("tests/unit/My Clippings.txt"))
+
+    assert streamed == adapter.get_clippings("tests/unit/My Clippings.txt")
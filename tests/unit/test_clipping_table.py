@@ -0,0 +1,198 @@
+"""Tests for the columnar clipping table."""
+
+import random
+import time
+
+import pytest
+from unittest.mock import Mock
+
+from conftest import make_clipping
+from scribe_to_notion.adapters.file_clipping_adapter import FileClippingAdapter
+from scribe_to_notion.services.import_service import ImportService
+
+np = pytest.importorskip("numpy")
+
+from scribe_to_notion.services.clipping_table import ClippingTable  # noqa: E402
+
+# Thresholds selecting the list planner and the columnar planner
+LISTS = 10**9
+COLUMNS = 0
+
+
+def random_clippings(seed):
+    """Build a reproducible mix of highlights, notes and bookmarks."""
+    rng = random.Random(seed)
+    clippings = []
+    for i in range(2000):
+        start = rng.randint(1, 60)
+        clippings.append(
+            make_clipping(
+                book_title=f"Book {rng.randint(1, 5)}",
+                content=f"Clipping {i}",
+                clipping_type=rng.choice(
+                    ["surlignement", "surlignement", "note", "signet"]
+                ),
+                page=rng.choice(
+                    [f"{start}", f"{start}-{start + rng.randint(0, 2)}", None]
+                ),
+                location=rng.choice(
+                    [
+                        None,
+                        f"emplacement {start * 10}-{start * 10 + 5}",
+                        f"emplacement {start * 10}-{start * 10 + rng.randint(0, 200)}",
+                    ]
+                ),
+            )
+        )
+    return clippings
+
+
+class TestClippingTable:
+    """Test the ClippingTable, against the list planner of the ImportService."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.services = {
+            threshold: ImportService(Mock(), Mock(), columnar_threshold=threshold)
+            for threshold in (LISTS, COLUMNS)
+        }
+
+    def plan(self, clippings, columnar_threshold):
+        """Plan books with the import service using the given threshold."""
+        return self.services[columnar_threshold]._plan_books(clippings)
+
+    def test_columnar_plan_matches_list_plan_on_sample_file(self):
+        """Test that both planners produce the same books, in the same order."""
+        # Arrange
+        adapter = FileClippingAdapter()
+        source = "tests/unit/My Clippings.txt"
+
+        # Act
+        by_lists = self.plan(adapter.get_clippings(source), LISTS)
+        by_columns = self.plan(adapter.get_clippings(source), COLUMNS)
+
+        # Assert
+        assert list(by_columns) == list(by_lists)
+        for title in by_lists:
+            assert by_columns[title] == by_lists[title]
+            assert [len(c.notes) for c in by_columns[title]] == [
+                len(c.notes) for c in by_lists[title]
+            ]
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_columnar_plan_matches_list_plan_on_random_clippings(self, seed):
+        """Test that notes are joined and books sorted the same way by both planners."""
+
+        # Arrange
+        def summary(books):
+            return [
+                (title, [(c.content, [n.content for n in c.notes]) for c in items])
+                for title, items in books.items()
+            ]
+
+        # Act
+        by_lists = self.plan(random_clippings(seed), LISTS)
+        by_columns = self.plan(random_clippings(seed), COLUMNS)
+
+        # Assert
+        assert summary(by_columns) == summary(by_lists)
+
+    @pytest.mark.parametrize("columnar_threshold", [LISTS, COLUMNS])
+    def test_notes_are_attached_to_the_overlapping_highlight_covering_them(
+        self, columnar_threshold
+    ):
+        """Test nested and overlapping highlights with both planners."""
+        # Arrange
+        clippings = [
+            make_clipping(
+                book_title=book,
+                content=content,
+                clipping_type=clipping_type,
+                location=f"emplacement {location}",
+            )
+            for book, clipping_type, location, content in [
+                ("Book A", "surlignement", "10-50", "A outer"),
+                ("Book A", "surlignement", "20-25", "A inner"),
+                ("Book A", "note", "30", "A note on outer"),
+                ("Book A", "note", "22", "A note on inner"),
+                ("Book B", "surlignement", "5-8", "B short"),
+                ("Book B", "note", "30", "B note on no highlight"),
+            ]
+        ]
+
+        # Act
+        books = self.plan(clippings, columnar_threshold)
+
+        # Assert
+        notes = {
+            c.content: [n.content for n in c.notes]
+            for items in books.values()
+            for c in items
+        }
+        assert notes == {
+            "A outer": ["A note on outer"],
+            "A inner": ["A note on inner"],
+            "B short": [],
+            # Same page as B short, but its location is covered by no highlight
+            "B note on no highlight": [],
+        }
+
+    def test_group_by_book_is_stable_and_ordered_by_first_selected_clipping(self):
+        """Test grouping order, stable page sort and unparseable pages."""
+        # Arrange
+        clippings = [
+            make_clipping("Book B", "", clipping_type="signet"),
+            make_clipping("Book A", "A12 first", page="12-12"),
+            make_clipping("Book B", "B3", page="3"),
+            make_clipping("Book A", "A roman", page="xii"),
+            make_clipping("Book A", "A12 second", page="12"),
+            make_clipping("Book A", "A5", page="5"),
+        ]
+        page_key = self.services[LISTS]._extract_page_number
+        table = ClippingTable(clippings, page_key=page_key)
+
+        # Act
+        groups = table.group_by_book(table.indices_of_type("surlignement"))
+
+        # Assert
+        assert list(groups) == ["Book A", "Book B"]
+        assert [c.content for c in groups["Book A"]] == [
+            "A roman",
+            "A5",
+            "A12 first",
+            "A12 second",
+        ]
+        assert [c.content for c in groups["Book B"]] == ["B3"]
+
+    @pytest.mark.parametrize("columnar_threshold", [LISTS, COLUMNS])
+    def test_notes_after_many_short_highlights_are_joined_quickly(
+        self, columnar_threshold
+    ):
+        """Test that a long highlight followed by many short ones is no worst case."""
+        # Arrange
+        count = 20_000
+        clippings = [make_clipping(content="Long", location="emplacement 1-1000000")]
+        clippings += [
+            make_clipping(content=f"Short {i}", location=f"emplacement {i}-{i}")
+            for i in range(2, count + 2)
+        ]
+        clippings += [
+            make_clipping(
+                content=f"Note {i}",
+                clipping_type="note",
+                location=f"emplacement {count + 10 + i}",
+            )
+            for i in range(count)
+        ]
+
+        # Act
+        started = time.perf_counter()
+        books = self.plan(clippings, columnar_threshold)
+        elapsed = time.perf_counter() - started
+
+        # Assert
+        # Stepping back over the short highlights one by one takes several seconds
+        assert elapsed < 5.0
+        long_highlight = next(c for c in books["Book"] if c.content == "Long")
+        assert len(long_highlight.notes) == count
+        assert sum(len(c.notes) for c in books["Book"]) == count
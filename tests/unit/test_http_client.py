@@ -0,0 +1,82 @@
+"""Tests for the shared HTTP client of the Notion adapters."""
+
+import gzip
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("notion_client")
+
+from scribe_to_notion.adapters.http_client import (  # noqa: E402
+    GzipRequestTransport,
+    HttpClientConfig,
+    create_http_client,
+    create_notion_client,
+    shared_transport,
+)
+
+
+class TestHttpClient:
+    """Test the shared HTTP client."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.requests = []
+        self.transport = httpx.MockTransport(self.handle)
+
+    def handle(self, request):
+        """Record a request and answer it with a page."""
+        self.requests.append(request)
+        return httpx.Response(200, json={"object": "page", "id": "page_id"})
+
+    def test_transport_is_shared_per_configuration(self):
+        """Test that clients of the same configuration share one connection pool."""
+        # Arrange
+        config = HttpClientConfig(max_connections=4, http2=False)
+
+        # Act
+        first, second = create_http_client(config), create_http_client(config)
+
+        # Assert
+        assert first._transport is second._transport is shared_transport(config)
+        assert shared_transport(HttpClientConfig(max_connections=5)) is not (
+            shared_transport(config)
+        )
+
+    def test_large_request_bodies_are_gzipped(self):
+        """Test that bodies above the threshold are sent compressed."""
+        # Arrange
+        client = httpx.Client(
+            transport=GzipRequestTransport(self.transport, min_bytes=100)
+        )
+
+        # Act
+        client.post("https://api.notion.com/v1/pages", json={"text": "x" * 500})
+        client.post("https://api.notion.com/v1/pages", json={"text": "small"})
+
+        # Assert
+        large, small = self.requests
+        assert large.headers["Content-Encoding"] == "gzip"
+        assert int(large.headers["Content-Length"]) == len(large.content)
+        assert json.loads(gzip.decompress(large.content)) == {"text": "x" * 500}
+        assert "Content-Encoding" not in small.headers
+
+    def test_notion_clients_keep_their_own_token_and_timeout(self):
+        """Test that Notion clients on a shared pool keep separate settings."""
+        # Arrange
+        first = httpx.Client(
+            transport=self.transport, timeout=httpx.Timeout(5, connect=1)
+        )
+        second = httpx.Client(transport=self.transport)
+
+        # Act
+        create_notion_client("token_a", first).pages.retrieve("page_id")
+        create_notion_client("token_b", second).pages.retrieve("page_id")
+
+        # Assert
+        assert [r.headers["Authorization"] for r in self.requests] == [
+            "Bearer token_a",
+            "Bearer token_b",
+        ]
+        assert first.timeout == httpx.Timeout(5, connect=1)
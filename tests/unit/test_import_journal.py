@@ -0,0 +1,168 @@
+"""Tests for resumable imports with the import journal."""
+
+import pytest
+from unittest.mock import Mock
+
+from conftest import make_clipping
+from scribe_to_notion.services.import_journal import ImportJournal
+from scribe_to_notion.services.import_service import ImportService
+
+
+def make_highlights(book_title, count):
+    """Build highlights on successive pages."""
+    return [
+        make_clipping(book_title, f"Highlight {page}", page=str(page))
+        for page in range(1, count + 1)
+    ]
+
+
+class TestImportJournal:
+    """Test resuming an interrupted import."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_page_publisher = Mock()
+        self.mock_page_publisher.create_page.side_effect = ["page_id_1", "page_id_2"]
+        self.mock_clipping_repo = Mock()
+        self.mock_clipping_repo.get_clippings.return_value = make_highlights(
+            "Book 1", 5
+        ) + make_highlights("Book 2", 1)
+
+    def make_service(self, journal_path):
+        """Create a service sending 2 highlights per request."""
+        return ImportService(
+            self.mock_page_publisher,
+            self.mock_clipping_repo,
+            batch_size=2,
+            journal=ImportJournal(str(journal_path)),
+        )
+
+    def test_pages_are_sent_in_batches(self, tmp_path):
+        """Test that a page is created with its first batch, then appended to."""
+        # Arrange
+        journal_path = tmp_path / "journal.jsonl"
+
+        # Act
+        result = self.make_service(journal_path).import_clippings(
+            "test_file.txt", "parent_id"
+        )
+
+        # Assert
+        assert result == {"Book 1": ["page_id_1"], "Book 2": ["page_id_2"]}
+        first = self.mock_page_publisher.create_page.call_args_list[0][1]
+        assert first["content"] == '"Highlight 1" (p.1)\n\n"Highlight 2" (p.2)'
+        appended = [
+            c[0] for c in self.mock_page_publisher.append_content.call_args_list
+        ]
+        assert appended == [
+            ("page_id_1", '"Highlight 3" (p.3)\n\n"Highlight 4" (p.4)'),
+            ("page_id_1", '"Highlight 5" (p.5)'),
+        ]
+        assert not journal_path.exists()
+
+    def test_resumed_import_skips_requests_already_sent(self, tmp_path):
+        """Test that a rerun continues after the last completed request."""
+        # Arrange
+        journal_path = tmp_path / "journal.jsonl"
+        created_titles = []
+        self.mock_page_publisher.create_page.side_effect = lambda **kwargs: (
+            created_titles.append(kwargs["title"]) or f"page_id_{len(created_titles)}"
+        )
+        self.mock_page_publisher.append_content.side_effect = [
+            None,
+            Exception("Network error"),
+        ]
+        with pytest.raises(Exception, match="Network error"):
+            self.make_service(journal_path).import_clippings(
+                "test_file.txt", "parent_id"
+            )
+        assert journal_path.exists()
+        self.mock_page_publisher.append_content.reset_mock(side_effect=True)
+
+        # Act
+        result = self.make_service(journal_path).import_clippings(
+            "test_file.txt", "parent_id"
+        )
+
+        # Assert
+        # Each page was created once, and Book 1 only got its last batch
+        assert sorted(created_titles) == ["Book 1", "Book 2"]
+        assert result["Book 1"] == ["page_id_1"]
+        self.mock_page_publisher.append_content.assert_called_once_with(
+            "page_id_1", '"Highlight 5" (p.5)'
+        )
+        assert not journal_path.exists()
+
+    def test_resume_refuses_changed_clippings(self, tmp_path):
+        """Test that batches are not resumed when the book content changed."""
+        # Arrange
+        journal_path = tmp_path / "journal.jsonl"
+        self.mock_page_publisher.append_content.side_effect = Exception("Fatal")
+        with pytest.raises(Exception, match="Fatal"):
+            self.make_service(journal_path).import_clippings(
+                "test_file.txt", "parent_id"
+            )
+
+        self.mock_clipping_repo.get_clippings.return_value = make_highlights(
+            "Book 1", 6
+        )
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="changed"):
+            self.make_service(journal_path).import_clippings(
+                "test_file.txt", "parent_id"
+            )
+
+    def test_resume_refuses_changed_clippings_of_completed_books(self, tmp_path):
+        """Test that a book completed before the interruption is not skipped."""
+        # Arrange
+        journal_path = tmp_path / "journal.jsonl"
+        self.mock_page_publisher.create_page.side_effect = [
+            "page_id_1",
+            Exception("Fatal"),
+        ]
+        with pytest.raises(Exception, match="Fatal"):
+            self.make_service(journal_path).import_clippings(
+                "test_file.txt", "parent_id"
+            )
+
+        # A highlight was added to Book 1, completed by the interrupted import
+        self.mock_clipping_repo.get_clippings.return_value = make_highlights(
+            "Book 1", 6
+        ) + make_highlights("Book 2", 1)
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Book 1"):
+            self.make_service(journal_path).import_clippings(
+                "test_file.txt", "parent_id"
+            )
+        assert journal_path.exists()
+
+    def test_resume_refuses_another_parent_page(self, tmp_path):
+        """Test that a journal only resumes an import to the same parent page."""
+        # Arrange
+        journal = ImportJournal(str(tmp_path / "journal.jsonl"))
+        journal.start("parent_id")
+        journal.close()
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="parent_id"):
+            ImportJournal(str(tmp_path / "journal.jsonl")).start("other_parent_id")
+
+    def test_torn_last_record_is_ignored(self, tmp_path):
+        """Test that a record cut by a crash does not prevent resuming."""
+        # Arrange
+        journal_path = tmp_path / "journal.jsonl"
+        journal = ImportJournal(str(journal_path))
+        journal.start("parent_id")
+        journal.record_page_created("Book 1", "page_id_1", "plan")
+        journal.close()
+        with open(journal_path, "a", encoding="utf-8") as f:
+            f.write('{"event": "batch_app')
+
+        # Act
+        progress = ImportJournal(str(journal_path)).progress("Book 1", "plan")
+
+        # Assert
+        assert progress.page_id == "page_id_1"
+        assert progress.batches_done == 1
@@ -0,0 +1,242 @@
+"""Tests for the pipelined import."""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from conftest import make_clipping
+from scribe_to_notion.services import import_service
+from scribe_to_notion.services.import_journal import ImportJournal
+from scribe_to_notion.services.import_service import ImportService
+
+
+def _raise(error):
+    """Raise an error, from a lambda."""
+    raise error
+
+
+class TestImportPipeline:
+    """Test the pipelined import of the ImportService."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clippings = []
+        self.mock_page_publisher = Mock()
+        self.mock_page_publisher.create_page.side_effect = (
+            lambda parent_id, title, content: f"page-{title}"
+        )
+        self.mock_clipping_repo = Mock()
+        self.mock_clipping_repo.iter_clippings.side_effect = lambda source: iter(
+            self.clippings
+        )
+        self.service = ImportService(self.mock_page_publisher, self.mock_clipping_repo)
+
+    def make_service(self, max_workers=1, batch_size=100):
+        """Build a service with the mock repositories."""
+        return ImportService(
+            self.mock_page_publisher,
+            self.mock_clipping_repo,
+            batch_size=batch_size,
+            max_workers=max_workers,
+        )
+
+    def test_batches_are_published_in_source_order(self):
+        """Test that the first batch creates the page and the next ones are appended."""
+        # Arrange
+        self.clippings = [
+            make_clipping(content="Third", page="3"),
+            make_clipping(content="First", page="1"),
+            make_clipping(content="Second", page="2"),
+            make_clipping(content="Annotation", clipping_type="note", page="2"),
+            make_clipping(content="Ninth", page="9"),
+            make_clipping(content="Bookmark", clipping_type="signet", page="0"),
+        ]
+        service = self.make_service(batch_size=3)
+
+        # Act
+        result = service.import_clippings_pipelined("clippings.txt", "parent")
+
+        # Assert
+        assert result == {"Book": ["page-Book"]}
+        self.mock_page_publisher.create_page.assert_called_once_with(
+            parent_id="parent",
+            title="Book",
+            content='"First" (p.1)\n\n"Second" (p.2)\nNote: Annotation\n\n"Third" (p.3)',
+        )
+        self.mock_page_publisher.append_content.assert_called_once_with(
+            "page-Book", '"Ninth" (p.9)'
+        )
+
+    def test_books_are_published_concurrently(self):
+        """Test that each book gets one page, whatever the lane publishing it."""
+        # Arrange
+        self.clippings = [
+            make_clipping(f"Book {i % 4}", f"Highlight {i}", page=str(i))
+            for i in range(40)
+        ]
+        service = self.make_service(max_workers=3, batch_size=2)
+
+        # Act
+        result = service.import_clippings_pipelined(["clippings.txt"], "parent")
+
+        # Assert
+        assert list(result) == ["Book 0", "Book 1", "Book 2", "Book 3"]
+        assert self.mock_page_publisher.create_page.call_count == 4
+        assert self.mock_page_publisher.append_content.call_count == 16
+
+    def test_only_duplicates_of_earlier_sources_are_dropped(self):
+        """Test that the same highlight made twice on one device is kept."""
+        # Arrange
+        sources = {
+            "device_1.txt": [
+                make_clipping(content="Same", page="3"),
+                make_clipping(content="Same", page="8"),
+            ],
+            "device_2.txt": [
+                make_clipping(content="Same", page="3"),
+                make_clipping(content="New", page="9"),
+            ],
+        }
+        self.mock_clipping_repo.iter_clippings.side_effect = lambda source: iter(
+            sources[source]
+        )
+
+        # Act
+        self.service.import_clippings_pipelined(list(sources), "parent")
+
+        # Assert
+        self.mock_page_publisher.create_page.assert_called_once_with(
+            parent_id="parent",
+            title="Book",
+            content='"Same" (p.3)\n\n"Same" (p.8)\n\n"New" (p.9)',
+        )
+
+    def test_parsing_is_bounded_by_the_queues(self):
+        """Test that the parser waits for the publisher once the queues are full."""
+        # Arrange
+        parsed = []
+        release = threading.Event()
+
+        def stream(source):
+            for i in range(1000):
+                parsed.append(i)
+                yield make_clipping(content=f"Highlight {i}", page=str(i))
+
+        service = self.make_service(batch_size=1)
+        self.mock_clipping_repo.iter_clippings.side_effect = stream
+        self.mock_page_publisher.create_page.side_effect = lambda **kwargs: (
+            release.wait() and "page"
+        )
+        thread = threading.Thread(
+            target=service.import_clippings_pipelined,
+            args=("clippings.txt", "parent"),
+            kwargs={"queue_size": 10},
+        )
+
+        # Act
+        thread.start()
+        try:
+            threading.Event().wait(0.3)
+            parsed_while_blocked = len(parsed)
+        finally:
+            release.set()
+            thread.join()
+
+        # Assert
+        assert parsed_while_blocked < 100
+        assert len(parsed) == 1000
+
+    def test_publish_failure_is_raised(self):
+        """Test that a failing request stops the import with its error."""
+        # Arrange
+        self.clippings = [
+            make_clipping(content=f"Highlight {i}", page=str(i)) for i in range(500)
+        ]
+        service = self.make_service(batch_size=1)
+        self.mock_page_publisher.append_content.side_effect = RuntimeError(
+            "Publish failed"
+        )
+
+        # Act & Assert
+        with pytest.raises(RuntimeError, match="Publish failed"):
+            service.import_clippings_pipelined("clippings.txt", "parent", queue_size=5)
+
+    def test_failing_book_does_not_stop_the_others(self):
+        """Test that without fail_fast, only the batches of the failed book stop."""
+        # Arrange
+        self.clippings = [
+            make_clipping(f"Book {i % 2}", f"Highlight {i}", page=str(i))
+            for i in range(10)
+        ]
+        service = self.make_service(max_workers=2, batch_size=1)
+        events = []
+        service.on_event = lambda event, fields: events.append((event, fields))
+        service.fail_fast = False
+        self.mock_page_publisher.append_content.side_effect = lambda page_id, content: (
+            page_id == "page-Book 0" and _raise(RuntimeError("Publish failed"))
+        )
+
+        # Act
+        result = service.import_clippings_pipelined("clippings.txt", "parent")
+
+        # Assert
+        assert result == {"Book 1": ["page-Book 1"]}
+        assert list(service.last_schedule.failures) == ["Book 0"]
+        failed = [fields for event, fields in events if event == "page_failed"]
+        assert [(f["book"], f["error"]) for f in failed] == [
+            ("Book 0", "Publish failed")
+        ]
+        assert failed[0]["seconds"] >= 0
+        # Book 0 stopped after its first append, Book 1 got all of them
+        assert self.mock_page_publisher.append_content.call_count == 1 + 4
+
+    def test_parsing_progress_is_reported(self, monkeypatch):
+        """Test that large sources report their progress while they are parsed."""
+        # Arrange
+        monkeypatch.setattr(import_service, "PARSE_PROGRESS_INTERVAL", 2)
+        self.clippings = [
+            make_clipping(content=f"Highlight {i}", page=str(i)) for i in range(5)
+        ]
+        events = []
+        self.service.on_event = lambda event, fields: events.append((event, fields))
+
+        # Act
+        self.service.import_clippings_pipelined("clippings.txt", "parent")
+
+        # Assert
+        parsing = [
+            (event, fields["clippings"])
+            for event, fields in events
+            if event in ("parse_progress", "source_parsed")
+        ]
+        assert parsing == [
+            ("parse_progress", 2),
+            ("parse_progress", 4),
+            ("source_parsed", 5),
+        ]
+
+    def test_parse_failure_is_raised(self):
+        """Test that a parsing error stops the import with its error."""
+        # Arrange
+        self.mock_clipping_repo.iter_clippings.side_effect = FileNotFoundError(
+            "missing"
+        )
+
+        # Act & Assert
+        with pytest.raises(FileNotFoundError, match="missing"):
+            self.service.import_clippings_pipelined("clippings.txt", "parent")
+        self.mock_page_publisher.create_page.assert_not_called()
+
+    def test_pipelined_import_cannot_be_journaled(self, tmp_path):
+        """Test that a journaled service refuses pipelined imports."""
+        # Arrange
+        service = ImportService(
+            self.mock_page_publisher,
+            self.mock_clipping_repo,
+            journal=ImportJournal(str(tmp_path / "journal.jsonl")),
+        )
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            service.import_clippings_pipelined("clippings.txt", "parent")
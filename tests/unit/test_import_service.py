@@ -3,6 +3,7 @@
 import pytest
 from unittest.mock import Mock
 
+from scribe_to_notion.core.interfaces import RowPublisherRepository
 from scribe_to_notion.core.models import Clipping
 from scribe_to_notion.services.import_service import ImportService
 
@@ -137,8 +138,8 @@ class TestImportService:
         assert "Highlight 3" in lines[1]
         assert "Highlight 2" in lines[2]
 
-    def test_only_highlights_are_imported(self):
-        """Test that only highlights (surlignement) are imported."""
+    def test_only_highlights_and_notes_are_imported(self):
+        """Test that bookmarks (signet) are not imported."""
         # Arrange
         mock_clippings = [
             Clipping(
@@ -180,9 +181,389 @@ class TestImportService:
         assert len(result) == 1
         assert "Book 1" in result
 
-        # Verify only highlight content is in the page
+        # Verify bookmark content is not in the page
         call_args = self.mock_page_publisher.create_page.call_args
         content = call_args[1]["content"]
         assert "Highlight" in content
-        assert "Note" not in content
+        assert "Note" in content
         assert "Bookmark" not in content
+
+    def test_notes_are_published_inline_with_their_highlight(self):
+        """Test that a note is attached to the highlight covering its position."""
+        # Arrange
+        mock_clippings = [
+            Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="surlignement",
+                page="7",
+                location="emplacement 58-59",
+                date="test date",
+                content="Highlight 1",
+            ),
+            Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="surlignement",
+                page="12-13",
+                location=None,
+                date="test date",
+                content="Highlight 2",
+            ),
+            Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="note",
+                page="13",
+                location=None,
+                date="test date",
+                content="Note on highlight 2",
+            ),
+            Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="note",
+                page="7",
+                location="emplacement 59",
+                date="test date",
+                content="Note on highlight 1",
+            ),
+        ]
+
+        self.mock_clipping_repo.get_clippings.return_value = mock_clippings
+        self.mock_page_publisher.create_page.return_value = "page_id"
+
+        # Act
+        self.service.import_clippings("test_file.txt", "parent_id")
+
+        # Assert - each note shares the block of its highlight
+        content = self.mock_page_publisher.create_page.call_args[1]["content"]
+        lines = content.split("\n\n")
+        assert lines == [
+            '"Highlight 1" (p.7)\nNote: Note on highlight 1',
+            '"Highlight 2" (p.12-13)\nNote: Note on highlight 2',
+        ]
+
+    def test_notes_are_attached_to_the_overlapping_highlight_covering_them(self):
+        """Test that a note after a nested highlight goes to the outer one."""
+        # Arrange
+        mock_clippings = [
+            Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="surlignement",
+                page="1",
+                location=location,
+                date="test date",
+                content=content,
+            )
+            for content, location in (
+                ("Outer", "emplacement 10-50"),
+                ("Inner", "emplacement 20-25"),
+            )
+        ]
+        mock_clippings.append(
+            Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="note",
+                page="1",
+                location="emplacement 30",
+                date="test date",
+                content="Note on outer",
+            )
+        )
+
+        self.mock_clipping_repo.get_clippings.return_value = mock_clippings
+        self.mock_page_publisher.create_page.return_value = "page_id"
+
+        # Act
+        self.service.import_clippings("test_file.txt", "parent_id")
+
+        # Assert
+        content = self.mock_page_publisher.create_page.call_args[1]["content"]
+        assert content.split("\n\n") == [
+            '"Outer" (p.1)\nNote: Note on outer',
+            '"Inner" (p.1)',
+        ]
+
+    def test_notes_are_only_attached_within_the_same_book(self):
+        """Test that unmatched notes are published on their own."""
+        # Arrange
+        mock_clippings = [
+            Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="surlignement",
+                page="10",
+                location=None,
+                date="test date",
+                content="Highlight",
+            ),
+            Clipping(
+                book_title="Book 2",
+                author="Author 2",
+                clipping_type="note",
+                page="10",
+                location=None,
+                date="test date",
+                content="Lonely note",
+            ),
+        ]
+
+        self.mock_clipping_repo.get_clippings.return_value = mock_clippings
+        self.mock_page_publisher.create_page.side_effect = ["page_id_1", "page_id_2"]
+
+        # Act
+        result = self.service.import_clippings("test_file.txt", "parent_id")
+
+        # Assert
+        assert result == {"Book 1": ["page_id_1"], "Book 2": ["page_id_2"]}
+        calls = self.mock_page_publisher.create_page.call_args_list
+        assert calls[0][1]["content"] == '"Highlight" (p.10)'
+        assert calls[1][1]["content"] == "Note: Lonely note (p.10)"
+
+    def test_row_publisher_upserts_one_book_per_row(self):
+        """Test that a row publisher receives books instead of page content."""
+        # Arrange
+        row_publisher = Mock(spec=RowPublisherRepository)
+        service = ImportService(row_publisher, self.mock_clipping_repo)
+        self.mock_clipping_repo.get_clippings.return_value = [
+            Clipping(
+                book_title="Book 1 (Author 1)",
+                author="Author 1",
+                clipping_type="surlignement",
+                page="15",
+                location=None,
+                date="dimanche 18 mai 2025 12:34:30",
+                content="Highlight 2",
+            ),
+            Clipping(
+                book_title="Book 1 (Author 1)",
+                author="Author 1",
+                clipping_type="surlignement",
+                page="5",
+                location=None,
+                date="mercredi 11 juin 2025 13:03:23",
+                content="Highlight 1",
+            ),
+        ]
+        row_publisher.upsert_books.return_value = {"Book 1 (Author 1)": "row_id"}
+
+        # Act
+        result = service.import_clippings("test_file.txt", "database_id")
+
+        # Assert
+        assert result == {"Book 1 (Author 1)": ["row_id"]}
+        database_id, books = row_publisher.upsert_books.call_args[0]
+        assert database_id == "database_id"
+        assert len(books) == 1
+        assert books[0].author == "Author 1"
+        assert books[0].highlight_count == 2
+        assert [c.content for c in books[0].clippings] == [
+            "Highlight 1",
+            "Highlight 2",
+        ]
+        assert books[0].last_highlight_at.isoformat() == "2025-06-11T13:03:23"
+
+    def test_row_events_count_the_requests_of_each_book(self):
+        """Test that book events report the requests of the row publisher."""
+        # Arrange
+        events = []
+        row_publisher = Mock(spec=RowPublisherRepository)
+        row_publisher.count_requests.return_value = 3
+        row_publisher.upsert_books.return_value = {"Book 1": "row_id"}
+        service = ImportService(
+            row_publisher,
+            self.mock_clipping_repo,
+            on_event=lambda event, fields: events.append((event, fields)),
+        )
+        clippings = [
+            Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="surlignement",
+                page=str(page),
+                location=None,
+                date="test date",
+                content=f"Highlight {page}",
+            )
+            for page in (1, 2)
+        ]
+
+        # Act
+        service.publish_clippings(clippings, "database_id")
+
+        # Assert
+        assert [(event, fields["requests"]) for event, fields in events] == [
+            ("book_planned", 3),
+            ("page_created", 3),
+        ]
+        assert row_publisher.count_requests.call_args[0][0].highlight_count == 2
+
+    def test_several_sources_are_merged_into_one_page_per_book(self):
+        """Test that clippings from several devices are deduplicated."""
+        # Arrange
+        device_1 = [
+            Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="surlignement",
+                page="10",
+                location=None,
+                date="dimanche 18 mai 2025 12:34:30",
+                content="Shared highlight",
+            ),
+        ]
+        device_2 = [
+            Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="surlignement",
+                page="10-10",
+                location=None,
+                date="lundi 19 mai 2025 08:00:00",
+                content="Shared  highlight",
+            ),
+            Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="surlignement",
+                page="12",
+                location=None,
+                date="lundi 19 mai 2025 08:01:00",
+                content="Second device highlight",
+            ),
+        ]
+
+        self.mock_clipping_repo.get_clippings.side_effect = lambda source: {
+            "device_1.txt": device_1,
+            "device_2.txt": device_2,
+        }[source]
+        self.mock_page_publisher.create_page.return_value = "page_id"
+
+        # Act
+        result = self.service.import_clippings(
+            ["device_1.txt", "device_2.txt"], "parent_id"
+        )
+
+        # Assert
+        assert result == {"Book 1": ["page_id"]}
+        self.mock_page_publisher.create_page.assert_called_once()
+        content = self.mock_page_publisher.create_page.call_args[1]["content"]
+        assert content.split("\n\n") == [
+            '"Shared highlight" (p.10)',
+            '"Second device highlight" (p.12)',
+        ]
+
+    def test_identical_highlights_of_one_source_are_kept(self):
+        """Test that only clippings found in an earlier source are dropped."""
+
+        # Arrange
+        def highlight(page):
+            return Clipping(
+                book_title="Book 1",
+                author="Author 1",
+                clipping_type="surlignement",
+                page=page,
+                location=None,
+                date="test date",
+                content="Same words",
+            )
+
+        sources = {"device_1.txt": [highlight("3"), highlight("8")]}
+        sources["device_2.txt"] = [highlight("3")]
+        self.mock_clipping_repo.get_clippings.side_effect = sources.get
+        self.mock_page_publisher.create_page.return_value = "page_id"
+
+        # Act
+        one_source = self.service.load_clippings(["device_1.txt"])
+        both_sources = self.service.load_clippings(["device_1.txt", "device_2.txt"])
+
+        # Assert
+        assert [c.page for c in one_source] == ["3", "8"]
+        assert [c.page for c in both_sources] == ["3", "8"]
+
+    def test_deleted_pages_are_recreated_when_appending(self):
+        """Test that appending to a deleted book page creates a new page."""
+        # Arrange
+        clippings = [
+            Clipping(
+                book_title=title,
+                author="Author",
+                clipping_type="surlignement",
+                page="1",
+                location=None,
+                date="test date",
+                content=f"New highlight of {title}",
+            )
+            for title in ("Book 1", "Book 2")
+        ]
+        book_pages = {"Book 1": "deleted_page_id", "Book 2": "page_id_2"}
+        self.mock_page_publisher.pages_exist.return_value = {
+            "deleted_page_id": False,
+            "page_id_2": True,
+        }
+        self.mock_page_publisher.create_page.return_value = "new_page_id"
+
+        # Act
+        result = self.service.append_clippings(clippings, "parent_id", book_pages)
+
+        # Assert
+        self.mock_page_publisher.pages_exist.assert_called_once_with(
+            ["deleted_page_id", "page_id_2"]
+        )
+        assert result == {"Book 1": ["new_page_id"], "Book 2": ["page_id_2"]}
+        assert book_pages["Book 1"] == "new_page_id"
+        self.mock_page_publisher.append_content.assert_called_once_with(
+            "page_id_2", '"New highlight of Book 2" (p.1)'
+        )
+
+    def test_events_report_each_book_and_failures_do_not_stop_others(self):
+        """Test the events of an import that keeps going after a failed book."""
+        # Arrange
+        events = []
+        service = ImportService(
+            self.mock_page_publisher,
+            self.mock_clipping_repo,
+            on_event=lambda event, fields: events.append((event, fields)),
+            fail_fast=False,
+        )
+        clippings = [
+            Clipping(
+                book_title=title,
+                author="Author",
+                clipping_type="surlignement",
+                page="1",
+                location=None,
+                date="test date",
+                content=f"Highlight of {title}",
+            )
+            for title in ("Book 1", "Book 2")
+        ]
+        self.mock_clipping_repo.iter_clippings.return_value = iter(clippings)
+        self.mock_page_publisher.create_page.side_effect = [
+            Exception("Failed to create page: boom"),
+            "page_id_2",
+        ]
+
+        # Act
+        result = service.import_clippings("test_file.txt", "parent_id")
+
+        # Assert
+        assert result == {"Book 2": ["page_id_2"]}
+        assert list(service.last_schedule.failures) == ["Book 1"]
+        names = [event for event, _ in events]
+        assert names == [
+            "source_parsed",
+            "book_planned",
+            "book_planned",
+            "page_failed",
+            "request_sent",
+            "page_created",
+        ]
+        assert events[0][1]["clippings"] == 2
+        assert events[3][1]["book"] == "Book 1"
+        assert events[3][1]["error"] == "Failed to create page: boom"
+        assert events[4][1]["request"] == "create"
+        assert events[5][1]["page_id"] == "page_id_2"
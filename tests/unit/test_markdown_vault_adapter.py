@@ -0,0 +1,132 @@
+"""Tests for the Markdown vault adapter."""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from conftest import make_clipping
+from scribe_to_notion.adapters.markdown_vault_adapter import MarkdownVaultAdapter
+from scribe_to_notion.services.import_service import ImportService
+
+
+class TestMarkdownVaultAdapter:
+    """Test the MarkdownVaultAdapter."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.vault = MarkdownVaultAdapter(str(self.root))
+
+    def teardown_method(self):
+        """Tear down test fixtures."""
+        self.directory.cleanup()
+
+    def test_page_is_written_with_front_matter(self):
+        """Test that a page becomes a Markdown file with a front-matter."""
+        # Act
+        page_id = self.vault.create_page(
+            "Books", "L'Étranger: roman", '"Highlight" (p.1)'
+        )
+        self.vault.append_content(page_id, '"Another" (p.2)')
+        self.vault.flush()
+
+        # Assert
+        assert page_id == "Books/L'Étranger- roman.md"
+        text = (self.root / page_id).read_text(encoding="utf-8")
+        assert text.startswith('---\ntitle: "L\'Étranger: roman"\ncreated: ')
+        assert text.endswith(
+            "source: scribe-to-notion\n---\n\n# L'Étranger: roman\n\n"
+            '"Highlight" (p.1)\n\n"Another" (p.2)\n'
+        )
+
+    def test_vault_is_indexed_on_open(self):
+        """Test that pages written earlier are served from the index."""
+        # Arrange
+        page_id = self.vault.create_page("", "Candide", '"Cultivate" (p.1)')
+        self.vault.close()
+        (self.root / "Personal note.md").write_text("# Not ours\n", encoding="utf-8")
+
+        # Act
+        vault = MarkdownVaultAdapter(str(self.root))
+
+        # Assert
+        assert vault.page_exists(page_id)
+        assert vault.get_page_content(page_id) == '"Cultivate" (p.1)'
+        assert not vault.page_exists("Personal note.md")
+        assert vault.get_page_content("missing.md") is None
+
+    def test_unchanged_pages_are_not_rewritten(self):
+        """Test that publishing the same content again skips the file."""
+        # Arrange
+        self.vault.create_page("", "Candide", "content")
+        self.vault.close()
+        vault = MarkdownVaultAdapter(str(self.root))
+
+        # Act
+        vault.create_page("", "Candide", "content")
+        vault.create_page("", "Zadig", "content")
+        vault.close()
+
+        # Assert
+        assert (vault.files_written, vault.files_skipped) == (1, 1)
+
+    def test_other_files_are_never_overwritten(self):
+        """Test that a title whose file name is taken gets a numbered file."""
+        # Arrange
+        (self.root / "Candide.md").write_text("My own notes\n", encoding="utf-8")
+        vault = MarkdownVaultAdapter(str(self.root))
+
+        # Act
+        page_id = vault.create_page("", "Candide", "content")
+        vault.close()
+
+        # Assert
+        assert page_id == "Candide (2).md"
+        assert (self.root / "Candide.md").read_text(
+            encoding="utf-8"
+        ) == "My own notes\n"
+
+    def test_delete_page_removes_the_file(self):
+        """Test that a deleted page is removed from the vault and the index."""
+        # Arrange
+        page_id = self.vault.create_page("", "Candide", "content")
+        self.vault.flush()
+
+        # Act
+        deleted = self.vault.delete_page(page_id)
+        deleted_again = self.vault.delete_page(page_id)
+        self.vault.close()
+
+        # Assert
+        assert deleted
+        assert not deleted_again
+        assert not self.vault.page_exists(page_id)
+        assert not (self.root / page_id).exists()
+
+    def test_append_to_missing_page_fails(self):
+        """Test that appending to an unknown page is an error."""
+        # Act & Assert
+        with pytest.raises(Exception, match="not found"):
+            self.vault.append_content("missing.md", "content")
+
+    def test_import_service_exports_books_to_vault(self):
+        """Test a full import of several batches into a vault."""
+        # Arrange
+        mock_clipping_repo = Mock()
+        mock_clipping_repo.get_clippings.return_value = [
+            make_clipping("Candide", f"H{page}", page=str(page), author="Voltaire")
+            for page in range(250)
+        ]
+        service = ImportService(self.vault, mock_clipping_repo, max_workers=4)
+
+        # Act
+        result = service.import_clippings("clippings.txt", "")
+
+        # Assert
+        assert result == {"Candide": ["Candide.md"]}
+        content = self.vault.get_page_content("Candide.md")
+        assert content.count("\n\n") == 249
+        assert content in (self.root / "Candide.md").read_text(encoding="utf-8")
@@ -0,0 +1,146 @@
+"""Tests for the NDJSON progress output of imports."""
+
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from scribe_to_notion.adapters.file_clipping_adapter import FileClippingAdapter
+from scribe_to_notion.adapters.markdown_vault_adapter import MarkdownVaultAdapter
+from scribe_to_notion.cli.main import main
+from scribe_to_notion.cli.ndjson_output import (
+    EXIT_FAILURE,
+    EXIT_PARTIAL,
+    EXIT_SUCCESS,
+    NdjsonOutput,
+)
+
+
+def read_events(text):
+    """Parse the JSON events of a stream."""
+    return [json.loads(line) for line in text.splitlines()]
+
+
+class TestNdjsonOutput:
+    """Test the NdjsonOutput."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.stream = io.StringIO()
+        self.output = NdjsonOutput(self.stream)
+
+    @pytest.mark.parametrize(
+        "created, failed, error, status, exit_code",
+        [
+            (["A", "B"], [], None, "succeeded", EXIT_SUCCESS),
+            (["A"], ["B"], None, "partial", EXIT_PARTIAL),
+            ([], ["A", "B"], None, "failed", EXIT_FAILURE),
+            (["A", "B"], [], "Failed to write page", "failed", EXIT_FAILURE),
+        ],
+    )
+    def test_summary_tells_partial_from_total_failure(
+        self, created, failed, error, status, exit_code
+    ):
+        """Test the status and exit code of the summary record."""
+        # Arrange
+        for book in created + failed:
+            self.output("book_planned", {"book": book, "clippings": 1, "requests": 1})
+        for book in created:
+            self.output("request_sent", {"book": book, "request": "create", "batch": 0})
+            self.output("page_created", {"book": book, "page_id": book, "requests": 1})
+        for book in failed:
+            self.output("page_failed", {"book": book, "error": "boom"})
+
+        # Act
+        result = self.output.summary(error)
+
+        # Assert
+        assert result == exit_code
+        summary = read_events(self.stream.getvalue())[-1]
+        assert summary["event"] == "summary"
+        assert summary["status"] == status
+        assert summary["exit_code"] == exit_code
+        assert summary["books"] == 2
+        assert summary["pages_created"] == len(created)
+        assert summary["failed_books"] == failed
+        assert summary["requests"] == len(created)
+
+
+class TestNdjsonImport:
+    """Test imports run from the CLI with --output ndjson."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.source = "tests/unit/My Clippings.txt"
+
+    def test_vault_export_streams_events(self, tmp_path, monkeypatch, capsys):
+        """Test that the ndjson output only writes JSON events, ending with a summary."""
+        # Arrange
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+        args = [self.source, "--vault", str(tmp_path / "vault"), "--no-index"]
+
+        # Act
+        main(args + ["--output", "ndjson"])
+
+        # Assert
+        events = read_events(capsys.readouterr().out)
+        names = [event["event"] for event in events]
+        assert names[:3] == ["import_started", "source_parsed", "parse_completed"]
+        assert names.count("book_planned") == names.count("page_created") == 2
+        assert events[-1]["status"] == "succeeded"
+        assert all(event["elapsed"] >= 0 for event in events)
+
+    def test_pipelined_import_keeps_going_after_a_failed_book(self, tmp_path, capsys):
+        """Test that a failed book of a pipelined import is a partial failure."""
+        # Arrange
+        create_page = MarkdownVaultAdapter.create_page
+
+        def fail_first_book(self, parent_id, title, content=""):
+            if title.startswith("Sauve-moi"):
+                raise OSError("Disk full")
+            return create_page(self, parent_id, title, content)
+
+        args = [self.source, "--vault", str(tmp_path / "vault"), "--no-index"]
+
+        # Act
+        with patch.object(MarkdownVaultAdapter, "create_page", fail_first_book):
+            with pytest.raises(SystemExit) as exit_info:
+                main(args + ["--pipeline", "--output", "ndjson"])
+
+        # Assert
+        assert exit_info.value.code == EXIT_PARTIAL
+        events = read_events(capsys.readouterr().out)
+        names = [event["event"] for event in events]
+        assert names.count("page_failed") == names.count("page_created") == 1
+        assert events[-1]["status"] == "partial"
+        assert events[-1]["failed_books"][0].startswith("Sauve-moi")
+
+    def test_parse_errors_do_not_corrupt_the_event_stream(self, tmp_path, capsys):
+        """Test that clipping blocks failing to parse are reported on stderr."""
+        # Arrange
+        args = [self.source, "--vault", str(tmp_path / "vault"), "--no-index"]
+
+        # Act
+        with patch.object(
+            FileClippingAdapter, "_parse_metadata", side_effect=ValueError("bad line")
+        ):
+            main(args + ["--no-cache", "--pipeline", "--output", "ndjson"])
+
+        # Assert
+        captured = capsys.readouterr()
+        assert read_events(captured.out)[-1]["event"] == "summary"
+        assert "Error parsing clipping block: bad line" in captured.err
+
+    def test_missing_file_exits_with_failure_summary(self, tmp_path, capsys):
+        """Test that an import stopped by an error ends with a failed summary."""
+        # Act
+        with pytest.raises(SystemExit) as exit_info:
+            main(["missing.txt", "--vault", str(tmp_path), "--output", "ndjson"])
+
+        # Assert
+        assert exit_info.value.code == EXIT_FAILURE
+        events = read_events(capsys.readouterr().out)
+        assert [event["event"] for event in events] == ["error", "summary"]
+        assert events[-1]["status"] == "failed"
@@ -0,0 +1,239 @@
+"""Tests for the row upserts of the Notion database adapter."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+notion_client = pytest.importorskip("notion_client")
+
+from conftest import api_error, make_clipping  # noqa: E402
+from scribe_to_notion.adapters.notion_database_adapter import (  # noqa: E402
+    MAX_CHARACTERS,
+    IdMap,
+    NotionDatabaseAdapter,
+)
+from scribe_to_notion.core.models import Book  # noqa: E402
+
+APIErrorCode = notion_client.APIErrorCode
+
+
+class TestIdMap:
+    """Test the IdMap."""
+
+    def test_id_map_is_saved_and_loaded(self, tmp_path):
+        """Test that recorded page IDs survive a reload, per database."""
+        # Arrange
+        path = tmp_path / "state" / "ids.json"
+        id_map = IdMap(str(path))
+        id_map.set("db1", "key", "page_1")
+        id_map.set("db2", "key", "page_2")
+
+        # Act
+        id_map.save()
+        reloaded = IdMap(str(path))
+
+        # Assert
+        assert reloaded.get("db1", "key") == "page_1"
+        assert reloaded.get("db2", "key") == "page_2"
+        assert reloaded.get("db1", "other") is None
+        assert not path.with_suffix(".json.tmp").exists()
+
+    def test_id_map_without_a_path_stays_in_memory(self):
+        """Test that a map without a path is kept in memory only."""
+        # Arrange
+        id_map = IdMap()
+        id_map.set("db1", "key", "page_1")
+
+        # Act
+        id_map.save()
+
+        # Assert
+        assert id_map.get("db1", "key") == "page_1"
+
+
+class TestNotionDatabaseAdapter:
+    """Test the NotionDatabaseAdapter."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.adapter = NotionDatabaseAdapter(
+            api_token="token", highlights_database_id="highlights_db"
+        )
+        self.adapter.client = Mock()
+
+    def test_known_row_is_updated(self):
+        """Test that a row recorded in the ID map is updated in place."""
+        # Arrange
+        self.adapter.id_map.set("db", "key", "page_id")
+
+        # Act
+        result = self.adapter._upsert_row("db", "key", {"Name": {}})
+
+        # Assert
+        assert result == "page_id"
+        self.adapter.client.pages.update.assert_called_once_with(
+            "page_id", properties={"Name": {}}
+        )
+        self.adapter.client.pages.create.assert_not_called()
+
+    def test_deleted_row_is_created_again(self):
+        """Test that a row deleted in Notion is created again and remapped."""
+        # Arrange
+        self.adapter.id_map.set("db", "key", "deleted_id")
+        self.adapter.client.pages.update.side_effect = api_error(
+            APIErrorCode.ObjectNotFound, 404
+        )
+        self.adapter.client.pages.create.return_value = {"id": "new_id"}
+
+        # Act
+        result = self.adapter._upsert_row("db", "key", {"Name": {}})
+
+        # Assert
+        assert result == "new_id"
+        self.adapter.client.pages.create.assert_called_once_with(
+            parent={"database_id": "db"}, properties={"Name": {}}
+        )
+        assert self.adapter.id_map.get("db", "key") == "new_id"
+
+    def test_other_update_errors_are_raised(self):
+        """Test that only a missing row is created again."""
+        # Arrange
+        self.adapter.id_map.set("db", "key", "page_id")
+        self.adapter.client.pages.update.side_effect = api_error(
+            APIErrorCode.Unauthorized, 401
+        )
+
+        # Act & Assert
+        with pytest.raises(notion_client.APIResponseError):
+            self.adapter._upsert_row("db", "key", {"Name": {}})
+        self.adapter.client.pages.create.assert_not_called()
+
+    def test_upsert_books_builds_book_and_highlight_rows(self, tmp_path):
+        """Test the properties of book and highlight rows, and the saved ID map."""
+        # Arrange
+        self.adapter.id_map = IdMap(str(tmp_path / "ids.json"))
+        highlight = make_clipping(page="12", location="emplacement 58-59")
+        highlight.notes.append(make_clipping(content="Note", clipping_type="note"))
+        book = Book(title="Book", author="Author", clippings=[highlight])
+        self.adapter.client.pages.create.side_effect = [
+            {"id": "book_row"},
+            {"id": "row"},
+        ]
+
+        # Act
+        result = self.adapter.upsert_books("books_db", [book])
+
+        # Assert
+        assert result == {"Book": "book_row"}
+        book_call, highlight_call = self.adapter.client.pages.create.call_args_list
+        book_properties = book_call.kwargs["properties"]
+        assert book_call.kwargs["parent"] == {"database_id": "books_db"}
+        assert book_properties["Name"]["title"][0]["text"]["content"] == "Book"
+        assert book_properties["Author"]["rich_text"][0]["text"]["content"] == "Author"
+        assert book_properties["Highlights"] == {"number": 1}
+        assert book_properties["Last Highlight"]["date"]["start"].startswith(
+            "2025-05-18T12:34:30"
+        )
+
+        highlight_properties = highlight_call.kwargs["properties"]
+        assert highlight_call.kwargs["parent"] == {"database_id": "highlights_db"}
+        assert highlight_properties["Book"] == {"relation": [{"id": "book_row"}]}
+        assert highlight_properties["Page"]["rich_text"][0]["text"]["content"] == "12"
+        assert highlight_properties["Note"]["rich_text"][0]["text"]["content"] == "Note"
+
+        # A rerun updates the same rows
+        assert IdMap(str(tmp_path / "ids.json")).get("books_db", "Book") == "book_row"
+
+    def test_every_request_waits_for_the_rate_limiter(self):
+        """Test that book and highlight rows, created or updated, are throttled."""
+        # Arrange
+        calls = []
+        self.adapter.max_workers = 1
+        self.adapter.rate_limiter = Mock()
+        self.adapter.rate_limiter.acquire.side_effect = lambda: calls.append("acquire")
+        self.adapter.client.pages.create.side_effect = lambda **kwargs: (
+            calls.append("create") or {"id": f"row_{len(calls)}"}
+        )
+        self.adapter.client.pages.update.side_effect = lambda *args, **kwargs: (
+            calls.append("update")
+        )
+        self.adapter.id_map.set("books_db", "Book", "book_row")
+        book = Book(
+            title="Book",
+            author="Author",
+            clippings=[make_clipping(content=f"Highlight {i}") for i in range(3)],
+        )
+
+        # Act
+        self.adapter.upsert_books("books_db", [book])
+
+        # Assert
+        assert calls == ["acquire", "update"] + ["acquire", "create"] * 3
+        assert self.adapter.count_requests(book) == 4
+        self.adapter.highlights_database_id = None
+        assert self.adapter.count_requests(book) == 1
+
+    def test_long_text_is_split_into_rich_text_objects(self):
+        """Test that text longer than Notion's limit is split."""
+        # Act
+        parts = self.adapter._rich_text("x" * (MAX_CHARACTERS + 10))
+
+        # Assert
+        assert [len(p["text"]["content"]) for p in parts] == [MAX_CHARACTERS, 10]
+        assert self.adapter._rich_text("") == []
+
+    def test_run_bounded_limits_queued_tasks(self):
+        """Test that at most twice as many tasks as workers are submitted at once."""
+        # Arrange
+        self.adapter.max_workers = 2
+        release = threading.Event()
+        pulled = []
+
+        def task():
+            release.wait(5)
+            return "done"
+
+        def tasks():
+            for _ in range(20):
+                pulled.append(task)
+                yield task
+
+        results = []
+        runner = threading.Thread(
+            target=lambda: results.extend(self.adapter._run_bounded(tasks()))
+        )
+
+        # Act
+        runner.start()
+        time.sleep(0.1)
+
+        # Assert
+        # Submitted tasks, plus the one waiting for a slot
+        assert len(pulled) == self.adapter.max_workers * 2 + 1
+        release.set()
+        runner.join(5)
+        assert results == ["done"] * 20
+
+    def test_run_bounded_stops_submitting_after_a_failure(self):
+        """Test that the first error stops new tasks and is raised."""
+        # Arrange
+        self.adapter.max_workers = 1
+        calls = []
+
+        def fail():
+            calls.append("fail")
+            raise RuntimeError("Request failed")
+
+        def succeed():
+            calls.append("ok")
+            return "ok"
+
+        # Act & Assert
+        with pytest.raises(RuntimeError, match="Request failed"):
+            self.adapter._run_bounded([fail] + [succeed] * 50)
+
+        # Only the tasks already queued when the failure happened ran
+        assert len(calls) <= 1 + self.adapter.max_workers * 2
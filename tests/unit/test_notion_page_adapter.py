@@ -0,0 +1,143 @@
+"""Tests for the existence checks of the Notion page adapter."""
+
+from unittest.mock import Mock
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+notion_client = pytest.importorskip("notion_client")
+
+from conftest import api_error  # noqa: E402
+from scribe_to_notion.adapters import notion_page_adapter  # noqa: E402
+from scribe_to_notion.adapters.notion_page_adapter import (  # noqa: E402
+    NotionPageAdapter,
+)
+from scribe_to_notion.adapters.page_state_cache import PageStateCache  # noqa: E402
+
+APIErrorCode = notion_client.APIErrorCode
+
+# Page IDs, with and without dashes
+LIVE = "11111111111111111111111111111111"
+ARCHIVED = "22222222-2222-2222-2222-222222222222"
+MISSING = "33333333333333333333333333333333"
+OTHER = "4444444444444444444444444444abcd"
+
+
+class TestNotionPageAdapter:
+    """Test the existence checks of the NotionPageAdapter."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.adapter = NotionPageAdapter(api_token="token")
+        self.adapter.client = Mock()
+
+    def test_missing_page_is_told_apart_from_errors(self):
+        """Test that only a not found response means the page is missing."""
+        # Arrange
+        self.adapter.client.pages.retrieve.side_effect = api_error(
+            APIErrorCode.ObjectNotFound, 404
+        )
+
+        # Act
+        page = self.adapter.get_page(MISSING)
+
+        # Assert
+        assert page is None
+        for code, status in (
+            (APIErrorCode.Unauthorized, 401),
+            (APIErrorCode.ValidationError, 400),
+        ):
+            self.adapter.client.pages.retrieve.side_effect = api_error(code, status)
+            with pytest.raises(Exception, match="Failed to get page"):
+                self.adapter.get_page(LIVE)
+
+    def test_malformed_page_id_does_not_exist(self):
+        """Test that an ID that is not a UUID is missing, without a request."""
+        # Act
+        result = self.adapter.pages_exist(["not-a-page-id"])
+
+        # Assert
+        assert result == {"not-a-page-id": False}
+        self.adapter.client.pages.retrieve.assert_not_called()
+
+    def test_pages_exist_looks_up_unknown_pages_once(self):
+        """Test that pages_exist resolves each page once, then serves the cache."""
+        # Arrange
+        pages = {LIVE: {"archived": False}, ARCHIVED: {"archived": True}}
+
+        def retrieve(page_id):
+            if page_id not in pages:
+                raise api_error(APIErrorCode.ObjectNotFound, 404)
+            return pages[page_id]
+
+        self.adapter.client.pages.retrieve.side_effect = retrieve
+        ids = [LIVE, ARCHIVED, MISSING, LIVE]
+
+        # Act
+        result = self.adapter.pages_exist(ids)
+
+        # Assert
+        assert result == {LIVE: True, ARCHIVED: False, MISSING: False}
+        assert self.adapter.pages_exist(ids) == result
+        assert self.adapter.page_exists(LIVE)
+        assert self.adapter.client.pages.retrieve.call_count == 3
+
+    def test_transient_errors_are_retried_then_raised(self, monkeypatch):
+        """Test that a rate limited lookup is retried, and never reported missing."""
+        # Arrange
+        monkeypatch.setattr(notion_page_adapter.time, "sleep", lambda seconds: None)
+        self.adapter.client.pages.retrieve.side_effect = [
+            api_error(APIErrorCode.RateLimited, 429),
+            {"archived": False},
+        ]
+
+        # Act
+        result = self.adapter.pages_exist([LIVE])
+
+        # Assert
+        assert result == {LIVE: True}
+        self.adapter.client.pages.retrieve.side_effect = api_error(
+            APIErrorCode.ServiceUnavailable, 503
+        )
+        with pytest.raises(Exception, match=f"Failed to check page {OTHER}"):
+            self.adapter.pages_exist([OTHER])
+        assert self.adapter.page_states.get(OTHER) is None
+
+    def test_own_writes_update_the_cache(self):
+        """Test that created and deleted pages need no lookup."""
+        # Arrange
+        self.adapter.client.pages.create.return_value = {"id": LIVE}
+
+        # Act
+        page_id = self.adapter.create_page("parent_id", "Title", "content")
+        created = self.adapter.page_exists(page_id)
+        self.adapter.delete_page(page_id)
+
+        # Assert
+        assert created
+        assert not self.adapter.page_exists(page_id)
+        self.adapter.client.pages.retrieve.assert_not_called()
+
+
+class TestPageStateCache:
+    """Test the PageStateCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.now = 0.0
+        self.cache = PageStateCache(ttl=10.0, clock=lambda: self.now)
+
+    def test_cached_states_expire(self):
+        """Test that a cached state is forgotten after its time to live."""
+        # Arrange
+        self.cache.set("page_id", True)
+
+        # Act
+        self.now = 9.9
+        before_expiry = self.cache.get("page_id")
+        self.now = 10.0
+        after_expiry = self.cache.get("page_id")
+
+        # Assert
+        assert before_expiry is True
+        assert after_expiry is None
@@ -0,0 +1,70 @@
+"""Tests for the CPU and memory profiling of CLI runs."""
+
+import pstats
+import threading
+
+import pytest
+
+from scribe_to_notion.cli import profiling
+
+
+def busy_worker():
+    """Burn some CPU in a worker thread."""
+    return sum(i * i for i in range(20_000))
+
+
+def allocate():
+    """Allocate memory held after the stage."""
+    return [str(i) * 10 for i in range(10_000)]
+
+
+class TestProfiling:
+    """Test the profiling of CLI runs."""
+
+    def test_cpu_profile_includes_worker_threads(self, tmp_path, capsys):
+        """Test that functions run by worker threads are in the pstats dump."""
+        # Act
+        with profiling.profile_run("cpu", str(tmp_path / "profile")):
+            with profiling.stage("work"):
+                thread = threading.Thread(target=busy_worker)
+                thread.start()
+                thread.join()
+
+        # Assert
+        stats = pstats.Stats(str(tmp_path / "profile.prof"))
+        assert any(name == "busy_worker" for _, _, name in stats.stats)
+        output = capsys.readouterr().out
+        assert "🔥 CPU profile" in output
+        assert "work: " in output
+        report = (tmp_path / "profile.txt").read_text(encoding="utf-8")
+        assert "busy_worker" in report
+
+    def test_memory_profile_reports_allocation_sites_per_stage(self, tmp_path, capsys):
+        """Test that each stage reports its peak and where it allocated."""
+        # Act
+        with profiling.profile_run("mem", str(tmp_path / "profile"), top=3):
+            with profiling.stage("allocate"):
+                held = allocate()
+
+        # Assert
+        report = (tmp_path / "profile.txt").read_text(encoding="utf-8")
+        assert report.startswith("🧠 Memory profile: peak ")
+        assert "allocate: " in report
+        assert "test_profiling.py" in report
+        assert len(held) == 10_000
+        assert "📊 Profile written to" in capsys.readouterr().out
+
+    def test_stage_without_profiler_does_nothing(self):
+        """Test that stages are free when not profiling."""
+        # Act
+        with profiling.stage("parse"):
+            pass
+
+        # Assert
+        assert profiling._active is None
+
+    def test_profilers_must_report(self):
+        """Test that a profiler without a report cannot be created."""
+        # Act & Assert
+        with pytest.raises(TypeError):
+            profiling.Profiler(10)
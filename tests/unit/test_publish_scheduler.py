@@ -0,0 +1,123 @@
+"""Tests for the publish scheduler and the rate limiter."""
+
+import time
+
+import pytest
+
+from scribe_to_notion.services.publish_scheduler import PublishJob, PublishScheduler
+from scribe_to_notion.services.rate_limiter import RateLimiter
+
+
+def fail():
+    """Fail like a publish request."""
+    raise RuntimeError("Publish failed")
+
+
+class TestPublishScheduler:
+    """Test the PublishScheduler."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.calls = []
+
+    def make_job(self, key, requests):
+        """Build a job recording its start in calls."""
+        return PublishJob(
+            key=key, requests=requests, run=lambda: self.calls.append(key) or key
+        )
+
+    def test_jobs_run_largest_first(self):
+        """Test that jobs are dispatched by decreasing request count."""
+        # Arrange
+        jobs = [
+            self.make_job("small", 1),
+            self.make_job("large", 30),
+            self.make_job("medium", 5),
+            self.make_job("small too", 1),
+        ]
+
+        # Act
+        results, report = PublishScheduler(max_workers=1).run(jobs)
+
+        # Assert
+        assert self.calls == ["large", "medium", "small", "small too"]
+        assert report.order == self.calls
+        assert results == {key: key for key in self.calls}
+        assert report.requests == 37
+
+    def test_estimate_uses_lpt_assignment_and_rate_limit(self):
+        """Test the completion time estimate."""
+        # Arrange
+        jobs = [
+            self.make_job("a", 6),
+            self.make_job("b", 4),
+            self.make_job("c", 3),
+            self.make_job("d", 3),
+        ]
+        rate_limited = PublishScheduler(
+            max_workers=2, rate_limiter=RateLimiter(rate=1.0), request_seconds=0.1
+        )
+
+        # Act
+        estimate = PublishScheduler(max_workers=2, request_seconds=1.0).estimate(jobs)
+        rate_limited_estimate = rate_limited.estimate(jobs)
+
+        # Assert
+        # LPT on 2 workers: [6, 3] and [4, 3], makespan 9 requests
+        assert estimate == 9.0
+        # 16 requests at 1 request per second
+        assert rate_limited_estimate == 16.0
+
+    def test_failure_is_raised(self):
+        """Test that a failing job makes the schedule fail."""
+        # Arrange
+        jobs = [
+            self.make_job("first", 1),
+            PublishJob(key="failing", requests=10, run=fail),
+        ]
+
+        # Act & Assert
+        with pytest.raises(RuntimeError, match="Publish failed"):
+            PublishScheduler(max_workers=2).run(jobs)
+
+    def test_failures_are_reported_without_fail_fast(self):
+        """Test that every job runs and failures are reported by key."""
+        # Arrange
+        jobs = [
+            self.make_job("first", 1),
+            PublishJob(key="failing", requests=10, run=fail),
+            self.make_job("last", 1),
+        ]
+
+        # Act
+        results, report = PublishScheduler(max_workers=1).run(jobs, fail_fast=False)
+
+        # Assert
+        assert results == {"first": "first", "last": "last"}
+        assert list(report.failures) == ["failing"]
+        assert str(report.failures["failing"]) == "Publish failed"
+
+
+class TestRateLimiter:
+    """Test the RateLimiter."""
+
+    def test_rate_limiter_spaces_requests(self):
+        """Test that the rate limiter lets through at most `rate` requests a second."""
+        # Arrange
+        limiter = RateLimiter(rate=50.0)
+
+        # Act
+        started = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        elapsed = time.monotonic() - started
+
+        # Assert
+        # The first token is available at once, the 5 next ones take 20ms each
+        assert elapsed >= 0.09
+
+    def test_rate_limiter_rejects_non_positive_rate(self):
+        """Test that a rate limit must be positive."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0)
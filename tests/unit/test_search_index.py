@@ -0,0 +1,160 @@
+"""Tests for the local search index."""
+
+import os
+import tempfile
+from unittest.mock import Mock
+
+from conftest import make_clipping
+from scribe_to_notion.cli.main import main
+from scribe_to_notion.services.import_service import ImportService
+from scribe_to_notion.services.search_index import SearchIndex
+
+
+class TestSearchIndex:
+    """Test the SearchIndex."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "search.sqlite3")
+        self.index = SearchIndex(self.path)
+
+    def teardown_method(self):
+        """Tear down test fixtures."""
+        self.index.close()
+        self.directory.cleanup()
+
+    def test_search_ranks_matching_clippings(self):
+        """Test that search returns the best matches first, with a snippet."""
+        # Arrange
+        self.index.add(
+            [
+                make_clipping("Essais", "La mémoire est le ventre de l'âme"),
+                make_clipping(
+                    "Essais", "Mémoire, mémoire, que me veux-tu ? La mémoire"
+                ),
+                make_clipping("Candide", "Il faut cultiver notre jardin"),
+            ]
+        )
+
+        # Act
+        results = self.index.search("memoire")
+
+        # Assert
+        assert [r.clipping.content[:7] for r in results] == ["Mémoire", "La mémo"]
+        assert "[mémoire]" in results[1].snippet
+        assert results[0].score <= results[1].score
+
+    def test_search_filters_by_book(self):
+        """Test that search can be limited to one book."""
+        # Arrange
+        self.index.add(
+            [make_clipping("Essais", "jardin"), make_clipping("Candide", "jardin")]
+        )
+
+        # Act
+        results = self.index.search("jardin", book="Candide")
+
+        # Assert
+        assert [r.clipping.book_title for r in results] == ["Candide"]
+
+    def test_invalid_fts_query_is_searched_as_words(self):
+        """Test that a query that is not valid FTS5 still finds its words."""
+        # Arrange
+        self.index.add([make_clipping("Candide", "Il faut cultiver notre jardin")])
+
+        # Act
+        results = self.index.search('cultiver "jardin')
+
+        # Assert
+        assert len(results) == 1
+
+    def test_index_is_updated_incrementally(self):
+        """Test that indexing the same clippings again only adds the new ones."""
+        # Arrange
+        first = [make_clipping("Candide", "jardin"), make_clipping("Candide", "monde")]
+
+        # Act
+        added_first = self.index.add(first)
+        added_again = self.index.add(first + [make_clipping("Candide", "Pangloss")])
+
+        # Assert
+        assert added_first == 2
+        assert added_again == 1
+        assert len(self.index) == 3
+
+    def test_clippings_without_author_are_indexed(self):
+        """Test that a book whose title names no author is searchable."""
+        # Arrange
+        clipping = make_clipping("Notebook", "hello world", author=None)
+
+        # Act
+        added = self.index.add([clipping])
+        results = self.index.search("hello")
+
+        # Assert
+        assert added == 1
+        assert [r.clipping for r in results] == [clipping]
+        assert results[0].clipping.author is None
+
+    def test_new_rows_are_read_and_indexed_in_one_write_transaction(self):
+        """Test that the last indexed ID is read under the write lock."""
+        # Arrange
+        statements = []
+        self.index._connection.set_trace_callback(statements.append)
+
+        # Act
+        self.index.add([make_clipping("Candide", "jardin")])
+
+        # Assert
+        assert statements[0] == "BEGIN IMMEDIATE"
+        assert statements[1].startswith("SELECT coalesce(max(id), 0)")
+        assert statements[-1] == "COMMIT"
+
+    def test_import_service_indexes_parsed_clippings(self):
+        """Test that loading clippings adds highlights and notes to the index."""
+        # Arrange
+        mock_clipping_repo = Mock()
+        mock_clipping_repo.get_clippings.return_value = [
+            make_clipping("Candide", "jardin"),
+            make_clipping("Candide", "to reread", clipping_type="note"),
+            make_clipping("Candide", "", clipping_type="signet"),
+        ]
+        service = ImportService(Mock(), mock_clipping_repo, search_index=self.index)
+
+        # Act
+        service.load_clippings("clippings.txt")
+
+        # Assert
+        assert len(self.index) == 2
+        assert self.index.search("reread")[0].clipping.clipping_type == "note"
+
+    def test_search_command_prints_results(self, capsys):
+        """Test the search subcommand."""
+        # Arrange
+        self.index.add(
+            [make_clipping("Candide", "Il faut cultiver notre jardin", page="42")]
+        )
+        self.index.close()
+
+        # Act
+        main(["search", "jardin", "--index", self.path])
+
+        # Assert
+        output = capsys.readouterr().out
+        assert "Candide (Author) · Highlight p.42" in output
+        assert "cultiver notre [jardin]" in output
+
+    def test_search_command_omits_missing_authors(self, capsys):
+        """Test that a book naming no author is printed without one."""
+        # Arrange
+        self.index.add(
+            [make_clipping("Notebook", "hello world", page="3", author=None)]
+        )
+        self.index.close()
+
+        # Act
+        main(["search", "hello", "--index", self.path])
+
+        # Assert
+        assert "📖 Notebook · Highlight p.3" in capsys.readouterr().out
@@ -0,0 +1,203 @@
+"""Tests for the watch service."""
+
+from unittest.mock import Mock, call
+
+import pytest
+
+from scribe_to_notion.adapters.file_clipping_adapter import FileClippingAdapter
+from scribe_to_notion.services.import_service import ImportService
+from scribe_to_notion.services.watch_service import PollingWatcher, WatchService
+
+
+def clipping_block(title, page, content):
+    """Build a clipping block as written by the reader."""
+    return (
+        f"{title}\n"
+        f"- Votre surlignement sur la page {page} | Ajouté le dimanche 18 mai 2025 12:48:14\n"
+        f"\n"
+        f"{content}\n"
+        f"==========\n"
+    )
+
+
+class TestWatchService:
+    """Test the WatchService."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_page_publisher = Mock()
+        self.mock_page_publisher.create_page.side_effect = ["page_id_1", "page_id_2"]
+        self.service = ImportService(self.mock_page_publisher, FileClippingAdapter())
+
+    def test_sync_appends_new_clippings_to_existing_pages(self, tmp_path):
+        """Test that only appended clippings are published, to the book page."""
+        # Arrange
+        clippings_file = tmp_path / "My Clippings.txt"
+        clippings_file.write_text(clipping_block("Book 1", "10", "First"))
+        watch_service = WatchService(
+            self.service, FileClippingAdapter(), str(tmp_path / "state.json")
+        )
+
+        # Act - first sync publishes the whole file
+        first = watch_service.sync(str(clippings_file), "parent_id")
+
+        # Append a complete clipping of a known book, one of a new book,
+        # and a clipping still being written
+        with open(clippings_file, "a", encoding="utf-8") as f:
+            f.write(clipping_block("Book 1", "12", "Second"))
+            f.write(clipping_block("Book 2", "3", "Third"))
+            f.write("Book 2\n- Votre surlignement sur la page 4 | Ajouté")
+        second = watch_service.sync(str(clippings_file), "parent_id")
+
+        # Assert
+        assert first == {"Book 1": ["page_id_1"]}
+        assert second == {"Book 1": ["page_id_1"], "Book 2": ["page_id_2"]}
+        self.mock_page_publisher.append_content.assert_called_once_with(
+            "page_id_1", '"Second" (p.12)'
+        )
+        assert self.mock_page_publisher.create_page.call_count == 2
+
+    def test_sync_resumes_from_state_file(self, tmp_path):
+        """Test that a new watch service resumes from the saved offset."""
+        # Arrange
+        clippings_file = tmp_path / "My Clippings.txt"
+        clippings_file.write_text(clipping_block("Book 1", "10", "First"))
+        state_path = str(tmp_path / "state.json")
+        WatchService(self.service, FileClippingAdapter(), state_path).sync(
+            str(clippings_file), "parent_id"
+        )
+
+        # Act
+        result = WatchService(self.service, FileClippingAdapter(), state_path).sync(
+            str(clippings_file), "parent_id"
+        )
+
+        # Assert
+        assert result == {}
+        assert self.mock_page_publisher.create_page.call_count == 1
+
+    def test_retry_after_a_failure_skips_books_already_published(self, tmp_path):
+        """Test that a failed sync does not publish the same clippings twice."""
+        # Arrange
+        clippings_file = tmp_path / "My Clippings.txt"
+        clippings_file.write_text(
+            clipping_block("Book 1", "1", "old1")
+            + clipping_block("Book 2", "1", "old2")
+        )
+        watch_service = WatchService(
+            self.service, FileClippingAdapter(), str(tmp_path / "state.json")
+        )
+        watch_service.sync(str(clippings_file), "parent_id")
+        with open(clippings_file, "a", encoding="utf-8") as f:
+            f.write(clipping_block("Book 1", "2", "new1"))
+            f.write(clipping_block("Book 2", "2", "new2"))
+
+        # Act - the append to the second book fails
+        append = self.mock_page_publisher.append_content
+        append.side_effect = [None, Exception("Failed to append content")]
+        with pytest.raises(Exception, match="Failed to append content"):
+            watch_service.sync(str(clippings_file), "parent_id")
+
+        # The file grows before the retry
+        with open(clippings_file, "a", encoding="utf-8") as f:
+            f.write(clipping_block("Book 1", "3", "newer1"))
+        append.side_effect = None
+        append.reset_mock()
+        watch_service.sync(str(clippings_file), "parent_id")
+        again = watch_service.sync(str(clippings_file), "parent_id")
+
+        # Assert
+        assert append.call_args_list == [
+            call("page_id_2", '"new2" (p.2)'),
+            call("page_id_1", '"newer1" (p.3)'),
+        ]
+        assert again == {}
+
+    def test_retry_resumes_a_page_interrupted_after_its_creation(self, tmp_path):
+        """Test that a page created by a failed sync is resumed, not created again."""
+        # Arrange
+        clippings_file = tmp_path / "My Clippings.txt"
+        clippings_file.write_text(
+            "".join(
+                clipping_block("Book 1", str(page), f"h{page}") for page in range(5)
+            )
+        )
+        service = ImportService(
+            self.mock_page_publisher, FileClippingAdapter(), batch_size=2
+        )
+        watch_service = WatchService(
+            service, FileClippingAdapter(), str(tmp_path / "state.json")
+        )
+
+        # Act - the second batch of the new page fails
+        append = self.mock_page_publisher.append_content
+        append.side_effect = [None, Exception("Failed to append content")]
+        with pytest.raises(Exception, match="Failed to append content"):
+            watch_service.sync(str(clippings_file), "parent_id")
+        append.side_effect = None
+        append.reset_mock()
+        result = watch_service.sync(str(clippings_file), "parent_id")
+
+        # Assert
+        assert result == {"Book 1": ["page_id_1"]}
+        self.mock_page_publisher.create_page.assert_called_once()
+        assert append.call_args_list == [call("page_id_1", '"h4" (p.4)')]
+
+    def test_sync_from_end_skips_existing_clippings(self, tmp_path):
+        """Test that from_end only publishes clippings added afterwards."""
+        # Arrange
+        clippings_file = tmp_path / "My Clippings.txt"
+        clippings_file.write_text(clipping_block("Book 1", "10", "First"))
+        watch_service = WatchService(
+            self.service, FileClippingAdapter(), str(tmp_path / "state.json")
+        )
+
+        # Act
+        result = watch_service.sync(str(clippings_file), "parent_id", from_end=True)
+
+        # Assert
+        assert result == {}
+        self.mock_page_publisher.create_page.assert_not_called()
+
+    def test_appends_wait_for_the_rate_limiter(self, tmp_path):
+        """Test that every request of a sync waits for the rate limiter."""
+        # Arrange
+        clippings_file = tmp_path / "My Clippings.txt"
+        clippings_file.write_text(clipping_block("Book 1", "10", "First"))
+        rate_limiter = Mock()
+        service = ImportService(
+            self.mock_page_publisher, FileClippingAdapter(), rate_limiter=rate_limiter
+        )
+        watch_service = WatchService(
+            service, FileClippingAdapter(), str(tmp_path / "state.json")
+        )
+
+        # Act
+        watch_service.sync(str(clippings_file), "parent_id")
+        with open(clippings_file, "a", encoding="utf-8") as f:
+            f.write(clipping_block("Book 1", "12", "Second"))
+        watch_service.sync(str(clippings_file), "parent_id")
+
+        # Assert
+        # One page created, then one append
+        assert rate_limiter.acquire.call_count == 2
+
+
+class TestPollingWatcher:
+    """Test the PollingWatcher."""
+
+    def test_polling_watcher_detects_appends(self, tmp_path):
+        """Test that the polling watcher notices a file change."""
+        # Arrange
+        clippings_file = tmp_path / "My Clippings.txt"
+        clippings_file.write_text("")
+        watcher = PollingWatcher(str(clippings_file), interval=0.01)
+
+        # Act
+        unchanged = watcher.wait(0.05)
+        clippings_file.write_text(clipping_block("Book 1", "10", "First"))
+        changed = watcher.wait(1.0)
+
+        # Assert
+        assert not unchanged
+        assert changed